@@ -0,0 +1,254 @@
+"""
+Synthetic statement corpus for the parser benchmarks
+
+Every generator writes a realistic file of roughly `target_bytes` and is
+deterministic for a given seed, so the corpus can be regenerated anywhere
+and benchmark numbers stay comparable with the stored baseline.
+"""
+from typing import Callable, Dict, List, Tuple
+from datetime import date, timedelta
+import io
+import random
+import openpyxl
+
+SIZES: Dict[str, int] = {
+    '1KB': 1_000,
+    '10KB': 10_000,
+    '100KB': 100_000,
+    '1MB': 1_000_000,
+    '10MB': 10_000_000,
+}
+
+STATEMENT_HEADERS = [
+    'Revenue', 'Cost of Goods Sold', 'Operating Expenses', 'Net Profit (after tax)',
+    'Total Assets', 'Current Assets', 'Total Liabilities', 'Current Liabilities',
+    'Inventory', 'Accounts Receivable', 'Accounts Payable', 'Cash & Cash Equivalents'
+]
+
+EXTRA_HEADERS = ['Branch', 'Region', 'Prepared By', 'Remarks']
+
+LINE_ITEMS = [
+    'Depreciation', 'Finance Costs', 'Employee Benefit Expense', 'Other Expenses',
+    'Deferred Tax', 'Capital Work in Progress', 'Trade Deposits', 'Provisions',
+    'Share Capital', 'Reserves and Surplus', 'Other Comprehensive Income'
+]
+
+LEDGER_ACCOUNTS = [
+    ('1000', 'Cash in Hand'), ('1010', 'HDFC Bank Current A/c'), ('1100', 'Sundry Debtors'),
+    ('1200', 'Stock in Trade'), ('1500', 'Plant & Machinery'), ('2000', 'Sundry Creditors'),
+    ('2100', 'GST Output'), ('2500', 'Term Loan - SBI'), ('3000', 'Capital Account'),
+    ('4000', 'Sales - Domestic'), ('4010', 'Sales - Export'), ('5000', 'Purchases'),
+    ('6000', 'Salaries & Wages'), ('6100', 'Rent'), ('6200', 'Electricity'),
+    ('8000', 'Interest Income'), ('9000', 'Interest on Term Loan')
+]
+
+# Leading code digits of accounts that normally carry a debit balance
+# (assets and expenses); the rest are liabilities, equity and income
+DEBIT_NORMAL = frozenset('1569')
+
+def _statement(rng: random.Random) -> List[float]:
+    """One internally consistent set of statement figures"""
+    revenue = rng.uniform(1e5, 5e7)
+    cogs = revenue * rng.uniform(0.4, 0.7)
+    opex = revenue * rng.uniform(0.1, 0.3)
+    net_income = revenue - cogs - opex
+    total_assets = revenue * rng.uniform(0.6, 1.5)
+    current_assets = total_assets * rng.uniform(0.3, 0.6)
+    total_liabilities = total_assets * rng.uniform(0.3, 0.8)
+    current_liabilities = total_liabilities * rng.uniform(0.3, 0.6)
+    inventory = current_assets * rng.uniform(0.1, 0.4)
+    receivables = current_assets * rng.uniform(0.1, 0.4)
+    payables = current_liabilities * rng.uniform(0.2, 0.6)
+    cash = current_assets - inventory - receivables
+    return [round(v, 2) for v in (
+        revenue, cogs, opex, net_income, total_assets, current_assets, total_liabilities,
+        current_liabilities, inventory, receivables, payables, cash
+    )]
+
+def _fiscal_labels(count: int) -> List[str]:
+    start = 2024 - count
+    return [f"FY {year}-{(year + 1) % 100:02d}" for year in range(start, start + count)]
+
+def csv_wide(target_bytes: int, seed: int = 0) -> bytes:
+    """Wide layout: one row per period, statement fields as columns"""
+    rng = random.Random(seed)
+    out = io.StringIO()
+    out.write(','.join(['Date'] + STATEMENT_HEADERS + EXTRA_HEADERS) + '\n')
+    day = date(1950, 1, 31)
+    while out.tell() < target_bytes:
+        values = ','.join(f"{v:.2f}" for v in _statement(rng))
+        extra = f"BR{rng.randint(1, 99):02d},{rng.choice(['North', 'South', 'East', 'West'])},Accounts,Audited"
+        out.write(f"{day.isoformat()},{values},{extra}\n")
+        day += timedelta(days=1)
+    return out.getvalue().encode()
+
+def csv_long(target_bytes: int, seed: int = 0) -> bytes:
+    """Key-value layout: line items as rows, fiscal years as columns, padded with notes"""
+    rng = random.Random(seed)
+    periods = _fiscal_labels(5)
+    statements = [_statement(rng) for _ in periods]
+    out = io.StringIO()
+    out.write(','.join(['Particulars'] + periods) + '\n')
+    for index, header in enumerate(STATEMENT_HEADERS):
+        out.write(f"\"{header}\"," + ','.join(f"{s[index]:.2f}" for s in statements) + '\n')
+    note = 0
+    while out.tell() < target_bytes:
+        note += 1
+        item = f"{rng.choice(LINE_ITEMS)} (Note {note})"
+        out.write(f"\"{item}\"," + ','.join(f"{rng.uniform(1e3, 1e6):.2f}" for _ in periods) + '\n')
+    return out.getvalue().encode()
+
+def csv_ledger(target_bytes: int, seed: int = 0) -> bytes:
+    """General-ledger export with a title block and debit/credit columns"""
+    rng = random.Random(seed)
+    out = io.StringIO()
+    out.write("Acme Traders Pvt Ltd\nGeneral Ledger 01-04-2023 to 31-03-2024\n\n")
+    out.write("Date,Account Code,Account Name,Narration,Debit,Credit\n")
+    day = date(2023, 4, 1)
+    entry = 0
+    while out.tell() < target_bytes:
+        entry += 1
+        code, name = rng.choice(LEDGER_ACCOUNTS)
+        amount = f"{rng.uniform(100, 1e5):.2f}"
+        on_normal_side = rng.random() < 0.85
+        debit, credit = (amount, '') if (code[0] in DEBIT_NORMAL) == on_normal_side else ('', amount)
+        posted = day + timedelta(days=entry % 365)
+        out.write(f"{posted.isoformat()},{code},{name},Voucher {entry},{debit},{credit}\n")
+    return out.getvalue().encode()
+
+def _fill_workbook(build: Callable[[openpyxl.Workbook, int], None], target_bytes: int) -> bytes:
+    """Write a workbook, rescaling the row count once to land near the target size"""
+    rows = max(1, target_bytes // 60)
+    for attempt in range(2):
+        workbook = openpyxl.Workbook(write_only=True)
+        build(workbook, rows)
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        size = buffer.tell()
+        if attempt == 0 and size < target_bytes * 0.8 or size > target_bytes * 1.25:
+            rows = max(1, int(rows * target_bytes / size))
+            continue
+        break
+    return buffer.getvalue()
+
+def xlsx_wide(target_bytes: int, seed: int = 0) -> bytes:
+    """Wide layout on a data sheet behind a cover sheet"""
+    def build(workbook: openpyxl.Workbook, rows: int):
+        rng = random.Random(seed)
+        cover = workbook.create_sheet('Cover')
+        cover.append(['Acme Traders Pvt Ltd'])
+        cover.append(['Monthly management accounts'])
+        sheet = workbook.create_sheet('Data')
+        sheet.append(['Date'] + STATEMENT_HEADERS + EXTRA_HEADERS)
+        day = date(1950, 1, 31)
+        for _ in range(rows):
+            sheet.append([day] + _statement(rng) + [f"BR{rng.randint(1, 99):02d}", 'North', 'Accounts', 'Audited'])
+            day += timedelta(days=1)
+    return _fill_workbook(build, target_bytes)
+
+def xlsx_multisheet(target_bytes: int, seed: int = 0) -> bytes:
+    """P&L and balance sheet on separate tabs (key-value layout) plus a large notes tab"""
+    def build(workbook: openpyxl.Workbook, rows: int):
+        rng = random.Random(seed)
+        periods = _fiscal_labels(3)
+        statements = [_statement(rng) for _ in periods]
+        notes = workbook.create_sheet('Notes')
+        notes.append(['Schedule', 'Description'] + periods)
+        for note in range(rows):
+            notes.append([f"Note {note}", rng.choice(LINE_ITEMS)] + [rng.uniform(1e3, 1e6) for _ in periods])
+        for title, fields in (('Profit & Loss', range(0, 4)), ('Balance Sheet', range(4, 12))):
+            sheet = workbook.create_sheet(title)
+            sheet.append([f"Acme Traders Pvt Ltd - {title}"])
+            sheet.append([])
+            sheet.append(['Particulars'] + periods)
+            for index in fields:
+                sheet.append([STATEMENT_HEADERS[index]] + [s[index] for s in statements])
+    return _fill_workbook(build, target_bytes)
+
+def _pdf(pages: List[List[List[str]]]) -> bytes:
+    """
+    Minimal PDF writer: one page per entry, drawing a ruled table when the
+    entry has rows and filler text otherwise
+    """
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = add(b"")
+    kids = []
+    for table in pages:
+        ops = []
+        if table:
+            x0, y0, width, height = 40, 760, 135, 18
+            for r, row in enumerate(table):
+                for c, cell in enumerate(row):
+                    x, y = x0 + c * width, y0 - (r + 1) * height
+                    ops.append(f"{x} {y} {width} {height} re S")
+                    ops.append(f"BT /F1 8 Tf {x + 3} {y + 5} Td ({cell}) Tj ET")
+        else:
+            for line in range(48):
+                ops.append(f"BT /F1 9 Tf 40 {760 - line * 15} Td (Directors report narrative, paragraph {line}.) Tj ET")
+        stream = "\n".join(ops).encode()
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font, content)
+        ))
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)
+    )
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(out)
+
+def _statement_table(seed: int) -> List[List[str]]:
+    rng = random.Random(seed)
+    periods = _fiscal_labels(3)
+    statements = [_statement(rng) for _ in periods]
+    table = [['Particulars'] + periods]
+    for index, header in enumerate(STATEMENT_HEADERS):
+        table.append([header] + [f"{s[index]:.2f}" for s in statements])
+    return table
+
+# Last page the parser scans with the default PDF_MAX_PAGES
+LATE_TABLE_PAGE = 50
+
+def _pdf_pages(target_bytes: int) -> int:
+    # A filler page is about 3.7 KB with this writer
+    return max(2, target_bytes // 3700)
+
+def pdf_early(target_bytes: int, seed: int = 0) -> bytes:
+    """Annual-report style PDF with the statement table on page 2"""
+    pages = [[] for _ in range(_pdf_pages(target_bytes))]
+    pages[1] = _statement_table(seed)
+    return _pdf(pages)
+
+def pdf_late(target_bytes: int, seed: int = 0) -> bytes:
+    """Annual-report style PDF with the statement table on the last page scanned"""
+    pages = [[] for _ in range(_pdf_pages(target_bytes))]
+    pages[min(len(pages), LATE_TABLE_PAGE) - 1] = _statement_table(seed)
+    return _pdf(pages)
+
+# (format extension, layout) -> generator
+GENERATORS: Dict[Tuple[str, str], Callable[[int, int], bytes]] = {
+    ('csv', 'wide'): csv_wide,
+    ('csv', 'long'): csv_long,
+    ('csv', 'ledger'): csv_ledger,
+    ('xlsx', 'wide'): xlsx_wide,
+    ('xlsx', 'multisheet'): xlsx_multisheet,
+    ('pdf', 'early'): pdf_early,
+    ('pdf', 'late'): pdf_late,
+}
@@ -0,0 +1,214 @@
+"""
+DocumentParser benchmark and regression check
+
+Usage (from backend/):
+    python benchmarks/parser_benchmark.py --generate
+    python benchmarks/parser_benchmark.py --run [--format csv] [--size 1MB]
+    python benchmarks/parser_benchmark.py --check [--tolerance 0.25]
+    python benchmarks/parser_benchmark.py --update-baseline
+
+Each (format, layout, size) case runs in its own subprocess so peak RSS
+is measured per case. A case parses the same file repeatedly after one
+warm-up call, with the header signature cache cleared before every
+iteration, and reports p50/p99 latency, throughput at p50 and peak RSS.
+--check fails (exit status 1) when any case's p50 exceeds the stored
+baseline by more than the tolerance and the absolute floor.
+"""
+from typing import Dict, Any, List, Optional
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARK_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import numpy as np
+from benchmarks.corpus import GENERATORS, SIZES
+
+CORPUS_DIR = os.path.join(BENCHMARK_DIR, 'corpus')
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'parser_baseline.json')
+RESULTS_PATH = os.path.join(BENCHMARK_DIR, 'results.json')
+
+# Timed iterations per size; large files are slow enough that a few runs are stable
+ITERATIONS = {'1KB': 50, '10KB': 50, '100KB': 20, '1MB': 5, '10MB': 3}
+
+# Slowdowns smaller than this are treated as noise whatever the ratio
+ABSOLUTE_FLOOR_MS = 5.0
+DEFAULT_TOLERANCE = 0.25
+CASE_TIMEOUT = 600
+
+def case_name(extension: str, layout: str, size: str) -> str:
+    return f"{extension}/{layout}/{size}"
+
+def case_path(extension: str, layout: str, size: str) -> str:
+    return os.path.join(CORPUS_DIR, f"{layout}_{size}.{extension}")
+
+def generate(seed: int = 0):
+    """Write every corpus file, skipping ones that already exist"""
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    for (extension, layout), generator in GENERATORS.items():
+        for size, target_bytes in SIZES.items():
+            path = case_path(extension, layout, size)
+            if os.path.exists(path):
+                continue
+            started = time.perf_counter()
+            content = generator(target_bytes, seed)
+            with open(path, 'wb') as f:
+                f.write(content)
+            print(f"generated {case_name(extension, layout, size):<24} {len(content):>10} bytes "
+                  f"in {time.perf_counter() - started:.1f}s")
+
+def _peak_rss_mb(who: int) -> float:
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def run_case(extension: str, layout: str, size: str, iterations: int) -> Dict[str, Any]:
+    """Time one case in this process"""
+    from services.document_parser import DocumentParser
+    from services.header_resolver import header_resolver
+
+    path = case_path(extension, layout, size)
+    with open(path, 'rb') as f:
+        content = f.read()
+    filename = os.path.basename(path)
+    base_rss = _peak_rss_mb(resource.RUSAGE_SELF)
+
+    try:
+        # Warm-up: first-call imports and the PDF worker pool
+        periods = DocumentParser.parse_buffer(filename, io.BytesIO(content))
+
+        timings = []
+        for _ in range(iterations):
+            header_resolver.cache.clear()
+            source = io.BytesIO(content)
+            started = time.perf_counter()
+            DocumentParser.parse_buffer(filename, source)
+            timings.append((time.perf_counter() - started) * 1000)
+    finally:
+        DocumentParser.shutdown()
+
+    p50, p99 = np.percentile(timings, [50, 99])
+    return {
+        'case': case_name(extension, layout, size),
+        'bytes': len(content),
+        'iterations': iterations,
+        'periods': len(periods),
+        'p50_ms': round(float(p50), 3),
+        'p99_ms': round(float(p99), 3),
+        'throughput_mb_s': round(len(content) / (1024 * 1024) / (p50 / 1000), 3),
+        'base_rss_mb': round(base_rss, 1),
+        'peak_rss_mb': round(_peak_rss_mb(resource.RUSAGE_SELF), 1),
+        'worker_peak_rss_mb': round(_peak_rss_mb(resource.RUSAGE_CHILDREN), 1)
+    }
+
+def run(formats: Optional[List[str]], sizes: Optional[List[str]], iterations: Optional[int]) -> List[Dict[str, Any]]:
+    """Run the selected cases, each in a fresh interpreter"""
+    generate()
+    results = []
+    for extension, layout in GENERATORS:
+        if formats and extension not in formats:
+            continue
+        for size in SIZES:
+            if sizes and size not in sizes:
+                continue
+            command = [
+                sys.executable, os.path.abspath(__file__),
+                '--case', case_name(extension, layout, size),
+                '--iterations', str(iterations or ITERATIONS[size])
+            ]
+            completed = subprocess.run(
+                command, cwd=BACKEND_DIR, capture_output=True, text=True, timeout=CASE_TIMEOUT
+            )
+            if completed.returncode != 0:
+                print(completed.stderr, file=sys.stderr)
+                raise SystemExit(f"case {case_name(extension, layout, size)} failed")
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            results.append(result)
+            print(f"{result['case']:<24} p50 {result['p50_ms']:>10.2f} ms  p99 {result['p99_ms']:>10.2f} ms  "
+                  f"{result['throughput_mb_s']:>8.2f} MB/s  peak {result['peak_rss_mb']:>7.1f} MB  "
+                  f"periods {result['periods']}")
+    return results
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Describe every case slower than its baseline p50 beyond tolerance and the absolute floor"""
+    regressions = []
+    for result in results:
+        reference = baseline.get(result['case'])
+        if reference is None:
+            continue
+        allowed = reference['p50_ms'] * (1 + tolerance)
+        slower_by = result['p50_ms'] - reference['p50_ms']
+        if result['p50_ms'] > allowed and slower_by > ABSOLUTE_FLOOR_MS:
+            regressions.append(
+                f"{result['case']}: p50 {result['p50_ms']:.2f} ms vs baseline "
+                f"{reference['p50_ms']:.2f} ms (+{slower_by / reference['p50_ms']:.0%})"
+            )
+    return regressions
+
+def _save(path: str, results: List[Dict[str, Any]]):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({result['case']: result for result in results}, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DocumentParser against a generated corpus")
+    parser.add_argument('--generate', action='store_true', help="Write the corpus files")
+    parser.add_argument('--run', action='store_true', help="Run the benchmark and save results.json")
+    parser.add_argument('--check', action='store_true', help="Run and fail on regressions against the baseline")
+    parser.add_argument('--update-baseline', action='store_true', help="Run and store the results as the baseline")
+    parser.add_argument('--format', action='append', choices=sorted({ext for ext, _ in GENERATORS}))
+    parser.add_argument('--size', action='append', choices=list(SIZES))
+    parser.add_argument('--iterations', type=int, help="Override the per-size iteration count")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative p50 slowdown (default %(default)s)")
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        extension, layout, size = args.case.split('/')
+        result = run_case(extension, layout, size, args.iterations or ITERATIONS[size])
+        print(json.dumps(result))
+        return
+
+    if args.generate:
+        generate()
+    if not (args.run or args.check or args.update_baseline):
+        if not args.generate:
+            parser.print_help()
+        return
+
+    results = run(args.format, args.size, args.iterations)
+    _save(RESULTS_PATH, results)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update({result['case']: result for result in results})
+        _save(BASELINE_PATH, list(baseline.values()))
+        print(f"baseline updated: {BASELINE_PATH}")
+
+    if args.check:
+        if not os.path.exists(BASELINE_PATH):
+            raise SystemExit(f"no baseline at {BASELINE_PATH}; run --update-baseline first")
+        with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("parser regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"no regressions ({len(results)} cases, tolerance {args.tolerance:.0%})")
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,8 @@
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
-from typing import List, Any
+from typing import List, Any, Optional
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,6 +17,13 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./  _finhealth.db")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    
+    # Write-behind persistence of analysis results
+    PERSIST_QUEUE_SIZE: int = int(os.getenv("PERSIST_QUEUE_SIZE", "10000"))
+    PERSIST_BATCH_SIZE: int = int(os.getenv("PERSIST_BATCH_SIZE", "500"))
+    PERSIST_FLUSH_INTERVAL: float = float(os.getenv("PERSIST_FLUSH_INTERVAL", "1.0"))  # Seconds
     
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
@@ -27,6 +35,16 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL: str = "gpt-5.2"
     OPENAI_ENABLED: bool = bool(os.getenv("OPENAI_API_KEY"))
+    OPENAI_BASE_URL: Optional[str] = os.getenv("OPENAI_BASE_URL") or None  # Any OpenAI-compatible server
+    OPENAI_TIMEOUT: float = float(os.getenv("OPENAI_TIMEOUT", "30"))  # Seconds per completion
+    OPENAI_MAX_RETRIES: int = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+    OPENAI_MAX_CONCURRENCY: int = int(os.getenv("OPENAI_MAX_CONCURRENCY", "32"))  # In-flight calls per worker
+    
+    # LLM Response Cache
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_SIZE: int = int(os.getenv("LLM_CACHE_SIZE", "2048"))
+    LLM_CACHE_TTL: int = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))  # Seconds
+    LLM_CACHE_PERSISTENT: bool = os.getenv("LLM_CACHE_PERSISTENT", "false").lower() == "true"  # Database second tier
     
     # CORS
     ALLOWED_ORIGINS: List[str] = [
@@ -47,7 +65,65 @@ class Settings(BaseSettings):
     
     # File Upload
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
+    UPLOAD_SPOOL_THRESHOLD: int = int(os.getenv("UPLOAD_SPOOL_THRESHOLD", str(1024 * 1024)))  # Spill to disk above this
     ALLOWED_EXTENSIONS: List[str] = [".csv", ".xlsx", ".xls", ".pdf"]
+    HEADER_CACHE_SIZE: int = int(os.getenv("HEADER_CACHE_SIZE", "1024"))  # Resolved header layouts
+    
+    # Upload Dedupe Cache (keyed on the SHA-256 of the upload)
+    UPLOAD_CACHE_ENABLED: bool = os.getenv("UPLOAD_CACHE_ENABLED", "true").lower() == "true"
+    UPLOAD_CACHE_SIZE: int = int(os.getenv("UPLOAD_CACHE_SIZE", "256"))
+    UPLOAD_CACHE_TTL: int = int(os.getenv("UPLOAD_CACHE_TTL", str(24 * 3600)))  # Seconds
+    UPLOAD_CACHE_DIR: Optional[str] = os.getenv("UPLOAD_CACHE_DIR") or None  # Disk tier for parsed uploads
+    UPLOAD_CACHE_DISK_MAX_FILES: int = int(os.getenv("UPLOAD_CACHE_DISK_MAX_FILES", "10000"))
+    
+    # Asynchronous Upload Jobs
+    UPLOAD_JOB_WORKERS: int = int(os.getenv("UPLOAD_JOB_WORKERS", "2"))
+    UPLOAD_JOB_DIR: str = os.getenv("UPLOAD_JOB_DIR", os.path.join(tempfile.gettempdir(), "finhealth_upload_jobs"))  # Must be shared storage when workers run on several hosts
+    UPLOAD_JOB_LEASE: int = int(os.getenv("UPLOAD_JOB_LEASE", "300"))  # Seconds without a heartbeat before a running job is recovered
+    
+    # PDF Parsing
+    PDF_MAX_PAGES: int = int(os.getenv("PDF_MAX_PAGES", "50"))
+    PDF_SEQUENTIAL_PAGES: int = int(os.getenv("PDF_SEQUENTIAL_PAGES", "4"))  # Scanned in-process before fanning out
+    PDF_PAGES_PER_TASK: int = int(os.getenv("PDF_PAGES_PER_TASK", "4"))
+    PDF_WORKERS: int = int(os.getenv("PDF_WORKERS", "2"))
+    
+    # Monte Carlo Cash Flow Forecasts
+    MONTE_CARLO_PATHS: int = int(os.getenv("MONTE_CARLO_PATHS", "10000"))
+    MONTE_CARLO_MAX_PATHS: int = int(os.getenv("MONTE_CARLO_MAX_PATHS", "50000"))
+    
+    # Industry Profiles (growth, seasonality, GST rate, benchmarks)
+    INDUSTRY_PROFILES_PATH: str = os.getenv(
+        "INDUSTRY_PROFILES_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "industry_profiles.json")
+    )
+    
+    # History-based Forecasts
+    HISTORY_MIN_PERIODS: int = int(os.getenv("HISTORY_MIN_PERIODS", "2"))
+    HISTORY_SEASONAL_RIDGE: float = float(os.getenv("HISTORY_SEASONAL_RIDGE", "1.0"))  # Pseudo-observations pulling month effects to 0
+    
+    # Peer Benchmarks (quantile sketches of stored analysis metrics)
+    BENCHMARK_MIN_SAMPLES: int = int(os.getenv("BENCHMARK_MIN_SAMPLES", "30"))  # Fewer peers fall back to static thresholds
+    BENCHMARK_SKETCH_ACCURACY: float = float(os.getenv("BENCHMARK_SKETCH_ACCURACY", "0.01"))  # Relative bucket error; changing it invalidates stored sketches
+    BENCHMARK_SKETCH_RELOAD_INTERVAL: int = int(os.getenv("BENCHMARK_SKETCH_RELOAD_INTERVAL", "300"))  # Seconds between reloads picking up other workers' analyses; 0 disables
+    
+    # Portfolio Forecast Rollups
+    PORTFOLIO_FORECAST_CHUNK: int = int(os.getenv("PORTFOLIO_FORECAST_CHUNK", "20000"))  # Businesses projected per kernel call
+    PORTFOLIO_FORECAST_CACHE_SIZE: int = int(os.getenv("PORTFOLIO_FORECAST_CACHE_SIZE", "64"))
+    
+    # What-if Scenarios
+    SCENARIO_MAX_COMBINATIONS: int = int(os.getenv("SCENARIO_MAX_COMBINATIONS", "10000"))
+    
+    # Ledger / Trial Balance Ingest
+    LEDGER_CHUNK_SIZE: int = int(os.getenv("LEDGER_CHUNK_SIZE", "50000"))
+    
+    # Batch Analysis
+    BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", "10000"))
+    BATCH_CHUNK_SIZE: int = int(os.getenv("BATCH_CHUNK_SIZE", "500"))
+    BATCH_WORKERS: int = int(os.getenv("BATCH_WORKERS", str(os.cpu_count() or 1)))
+    
+    # Analysis Pipeline
+    PIPELINE_THREAD_WORKERS: int = int(os.getenv("PIPELINE_THREAD_WORKERS", "8"))
+    PIPELINE_PROCESS_WORKERS: int = int(os.getenv("PIPELINE_PROCESS_WORKERS", "2"))
     
     class Config:
         env_file = ".env"
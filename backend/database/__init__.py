@@ -1,27 +1,42 @@
 # Database module initialization
-from .connection import Base, engine, get_db, init_db
+from .connection import Base, engine, async_engine, AsyncSessionLocal, get_db, get_async_db, init_db
 from .models import (
     BusinessProfile,
     FinancialStatement,
     AnalysisResult,
+    ForecastModelState,
+    BenchmarkSketch,
     UserSession,
     AuditLog,
+    LLMCacheEntry,
+    UploadJob,
     BusinessType,
     Industry,
-    RiskLevel
+    RiskLevel,
+    JobStatus
 )
+from .write_behind import analysis_writer
 
 __all__ = [
     "Base",
     "engine",
+    "async_engine",
+    "AsyncSessionLocal",
     "get_db",
+    "get_async_db",
     "init_db",
     "BusinessProfile",
     "FinancialStatement",
     "AnalysisResult",
+    "ForecastModelState",
+    "BenchmarkSketch",
     "UserSession",
     "AuditLog",
+    "LLMCacheEntry",
+    "UploadJob",
     "BusinessType",
     "Industry",
-    "RiskLevel"
+    "RiskLevel",
+    "JobStatus",
+    "analysis_writer"
 ]
@@ -23,6 +23,12 @@ class Industry(str, enum.Enum):
     HOSPITALITY = "hospitality"
     CONSTRUCTION = "construction"
 
+class JobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
 class RiskLevel(str, enum.Enum):
     LOW = "Low"
     MODERATE = "Moderate"
@@ -106,6 +112,33 @@ class AnalysisResult(Base):
     business = relationship("BusinessProfile", back_populates="analysis_results")
     statement = relationship("FinancialStatement", back_populates="analysis_results")
 
+class ForecastModelState(Base):
+    __tablename__ = "forecast_model_states"
+    
+    # Running least-squares sums of the per-business trend + seasonality model
+    business_id = Column(Integer, ForeignKey("business_profiles.id"), primary_key=True)
+    anchor = Column(Integer, nullable=False)  # Month ordinal (year * 12 + month) of t = 0
+    last_period_end = Column(Integer, nullable=False)  # Latest month ordinal observed
+    periods = Column(JSON, nullable=False)  # [first, closing] month ordinals already folded in
+    observations = Column(Integer, nullable=False, default=0)  # Monthly rows
+    xtx = Column(JSON, nullable=False)  # X'X
+    xty = Column(JSON, nullable=False)  # X'y for revenue and net income
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    business = relationship("BusinessProfile")
+
+class BenchmarkSketch(Base):
+    __tablename__ = "benchmark_sketches"
+    
+    # Log-bucket quantile sketch of one metric across stored analyses
+    industry = Column(String(50), primary_key=True)
+    size = Column(String(50), primary_key=True)  # Lowercase business size, or '*' for all sizes
+    metric = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    buckets = Column(JSON, nullable=False)  # Bucket key -> count
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class UserSession(Base):
     __tablename__ = "user_sessions"
     
@@ -126,3 +159,28 @@ class AuditLog(Base):
     details = Column(JSON, nullable=True)
     ip_address = Column(String(45), nullable=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache_entries"
+    
+    cache_key = Column(String(64), primary_key=True)  # SHA-256 of canonical inputs
+    kind = Column(String(50), nullable=False)  # insights, recommendations
+    value = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=True, index=True)
+
+class UploadJob(Base):
+    __tablename__ = "upload_jobs"
+    
+    id = Column(String(36), primary_key=True)  # UUID4
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.PENDING, index=True)
+    progress = Column(Integer, default=0)  # 0-100
+    stage = Column(String(50))  # queued, parsing, analyzing, done
+    filename = Column(String(255), nullable=False)
+    file_path = Column(String(1024), nullable=True)  # Removed once the job finishes
+    params = Column(JSON, nullable=False)  # business_name, business_type, industry, language
+    result = Column(JSON, nullable=True)  # HealthAssessment
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
@@ -0,0 +1,181 @@
+from typing import Dict, Any, List, Optional
+import asyncio
+import logging
+import time
+from config.settings import settings
+from database.connection import AsyncSessionLocal
+from database.models import BusinessProfile, FinancialStatement, AnalysisResult, ForecastModelState
+from services.history_forecaster import HistoryForecaster
+from services.benchmark_sketches import benchmark_sketches
+
+logger = logging.getLogger(__name__)
+
+class WriteBehindQueue:
+    """
+    Bounded write-behind queue for analysis results
+
+    Requests enqueue a record and return immediately. A background task
+    drains the queue every PERSIST_FLUSH_INTERVAL seconds (or as soon as
+    PERSIST_BATCH_SIZE records are waiting) and writes the business
+    profile, statement and analysis rows for the whole batch in a single
+    transaction, together with the business's history forecast state
+    fitted from its periods. The batch is then merged into the peer
+    benchmark sketches in a transaction of its own, so a failed sketch
+    update only costs those peer samples, never the analyses.
+
+    Record layout:
+        {
+            'business': BusinessProfile column values,
+            'statement': FinancialStatement column values,
+            'history': optional list of FinancialStatement column values for
+                earlier periods of the same business,
+            'analysis': AnalysisResult column values (without foreign keys)
+        }
+    """
+
+    def __init__(self):
+        self.max_size = settings.PERSIST_QUEUE_SIZE
+        self.batch_size = settings.PERSIST_BATCH_SIZE
+        self.flush_interval = settings.PERSIST_FLUSH_INTERVAL
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        # Metrics
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the background flush task on the running event loop"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Write-behind persistence started (queue={self.max_size}, "
+            f"batch={self.batch_size}, interval={self.flush_interval}s)"
+        )
+
+    async def stop(self):
+        """Flush everything still queued and stop the background task"""
+        if not self.running:
+            return
+        self._stopping = True
+        await self._task
+        self._task = None
+        logger.info("Write-behind persistence stopped")
+
+    def enqueue(self, record: Dict[str, Any]) -> bool:
+        """
+        Queue one analysis for persistence without waiting for the database
+
+        Returns:
+            True if queued, False if dropped (queue full or not running)
+        """
+        if not self.running or self._stopping:
+            self.dropped += 1
+            logger.warning("Write-behind queue not running; analysis dropped")
+            return False
+
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Write-behind queue full; analysis dropped")
+            return False
+
+        self.enqueued += 1
+        return True
+
+    async def _run(self):
+        """Collect batches and flush them until stopped, then drain"""
+        while not self._stopping:
+            batch = await self._collect_batch()
+            if batch:
+                await self._flush(batch)
+
+        # Flush on shutdown
+        while not self._queue.empty():
+            await self._flush(self._drain(self.batch_size))
+
+    async def _collect_batch(self) -> List[Dict[str, Any]]:
+        """Wait up to one flush interval for records, returning early when a batch is full"""
+        deadline = time.monotonic() + self.flush_interval
+        while self._queue.qsize() < self.batch_size and not self._stopping:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(remaining, 0.05))
+        return self._drain(self.batch_size)
+
+    def _drain(self, limit: int) -> List[Dict[str, Any]]:
+        """Take up to `limit` records that are already queued"""
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _flush(self, batch: List[Dict[str, Any]]):
+        """Write one batch through the async engine"""
+        start = time.perf_counter()
+        try:
+            await self._write_batch(batch)
+            self.written += len(batch)
+            logger.info(f"Persisted {len(batch)} analyses")
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"Write-behind flush of {len(batch)} analyses failed: {e}")
+        finally:
+            self.flushes += 1
+            self.last_flush_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    @staticmethod
+    async def _write_batch(batch: List[Dict[str, Any]]):
+        """Insert all rows of a batch and commit once, then update the benchmark sketches"""
+        async with AsyncSessionLocal() as db:
+            for record in batch:
+                business = BusinessProfile(**record['business'])
+                statement = FinancialStatement(business=business, **record['statement'])
+                state = None
+                for period in record.get('history', ()):
+                    db.add(FinancialStatement(business=business, **period))
+                    state = HistoryForecaster.update(state, period)
+                state = HistoryForecaster.update(state, record['statement'])
+                if state is not None:
+                    db.add(ForecastModelState(business=business, **state))
+                # Relationships cascade, so the profile and statement are inserted too
+                db.add(AnalysisResult(business=business, statement=statement, **record['analysis']))
+            await db.commit()
+
+        try:
+            async with AsyncSessionLocal() as db:
+                merged = await benchmark_sketches.persist(db, benchmark_sketches.batch_sketches(batch))
+                await db.commit()
+            benchmark_sketches.apply(merged)
+        except Exception as e:
+            logger.warning(f"Benchmark sketch update for {len(batch)} analyses failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and write counters"""
+        return {
+            'running': self.running,
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'queue_capacity': self.max_size,
+            'enqueued': self.enqueued,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'flushes': self.flushes,
+            'last_flush_ms': self.last_flush_ms
+        }
+
+analysis_writer = WriteBehindQueue()
@@ -1,22 +1,33 @@
-from fastapi import FastAPI, HTTPException, File, UploadFile, Depends, Request
+from fastapi import FastAPI, HTTPException, File, UploadFile, Depends, Request, Response, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from starlette.formparsers import MultiPartParser
+from sqlalchemy.ext.asyncio import AsyncSession
 import uvicorn
+import asyncio
+import json
 import logging
-from typing import Optional
+import os
+from typing import Optional, Dict, Any, List, BinaryIO, Callable, Awaitable
 
 # Import configuration
 from config.settings import settings
 
 # Import database
-from database import get_db, init_db, BusinessProfile as DBBusinessProfile, FinancialStatement as DBFinancialStatement, AnalysisResult as DBAnalysisResult
+from database import init_db, async_engine, get_async_db, analysis_writer, JobStatus
 
 # Import models/schemas
 from models.schemas import (
+    FinancialStatement,
     AnalysisRequest,
+    BatchAnalysisRequest,
+    BatchAnalysisResponse,
     HealthAssessment,
+    UploadJobAccepted,
+    UploadJobStatus,
     ForecastRequest,
+    ScenarioRequest,
     BenchmarkRequest,
     TranslationRequest,
     ErrorResponse
@@ -28,14 +39,25 @@ from services import (
     openai_service,
     document_parser,
     industry_benchmark,
+    benchmark_sketches,
     product_recommender,
     tax_compliance,
     cash_flow_forecaster,
-    translation_service
+    history_forecaster,
+    portfolio_forecaster,
+    translation_service,
+    batch_processor,
+    scenario_engine,
+    pipeline_executor,
+    llm_cache,
+    header_resolver,
+    upload_cache,
+    upload_jobs
 )
+from services.pipeline import Stage, format_server_timing
 
 # Import security
-from security import limiter, validate_input
+from security import limiter, validate_input, UploadSizeLimitMiddleware
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -53,6 +75,11 @@ app = FastAPI(
 # Add rate limiting
 app.state.limiter = limiter
 
+# Enforce the upload limit while the body streams in, and spool larger
+# uploads to a temp file instead of memory
+app.add_middleware(UploadSizeLimitMiddleware, max_size=settings.MAX_UPLOAD_SIZE, paths=["/upload"])
+MultiPartParser.spool_max_size = settings.UPLOAD_SPOOL_THRESHOLD
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -72,6 +99,23 @@ async def startup_event():
         logger.info(f"OpenAI integration: {'Enabled' if settings.OPENAI_ENABLED else 'Disabled (using rule-based fallback)'}")
     except Exception as e:
         logger.error(f"Startup error: {e}")
+    
+    await benchmark_sketches.load()
+    benchmark_sketches.start()
+    analysis_writer.start()
+    await upload_jobs.start(_process_upload_job)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush pending writes and release worker pools and pooled connections on shutdown"""
+    await upload_jobs.stop()
+    await analysis_writer.stop()
+    await benchmark_sketches.stop()
+    batch_processor.shutdown()
+    pipeline_executor.shutdown()
+    document_parser.shutdown()
+    await openai_service.aclose()
+    await async_engine.dispose()
 
 @app.get("/")
 async def root():
@@ -89,12 +133,210 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "timestamp": "2026-02-04T12:00:00Z"}
 
+@app.get("/stats")
+async def service_stats():
+    """Runtime counters for caches and background services"""
+    return {
+        "llm_cache": llm_cache.stats(),
+        "header_cache": header_resolver.stats(),
+        "upload_cache": upload_cache.stats(),
+        "upload_jobs": upload_jobs.stats(),
+        "portfolio_forecast_cache": portfolio_forecaster.stats(),
+        "persistence": analysis_writer.stats(),
+        "benchmark_sketches": benchmark_sketches.stats()
+    }
+
+def _prepare_analysis(analysis_request: AnalysisRequest) -> Dict[str, Any]:
+    """Validate the request and compute metrics, health score and risk level"""
+    business_profile = analysis_request.business_profile
+    financial_data = analysis_request.financial_statement.dict()
+    
+    # Validate business name
+    validate_input(business_profile.name, max_length=255)
+    
+    # Calculate comprehensive metrics
+    metrics = financial_analyzer.calculate_all_metrics(financial_data)
+    
+    # Calculate health score
+    health_score = financial_analyzer.calculate_health_score(
+        metrics,
+        business_profile.industry.value
+    )
+    
+    # Determine risk level
+    risk_level = financial_analyzer.determine_risk_level(health_score, metrics)
+    
+    return {
+        'business_profile': business_profile,
+        'financial_data': financial_data,
+        'language': analysis_request.language,
+        'industry': business_profile.industry.value,
+        'business_type': business_profile.business_type.value,
+        'metrics': metrics,
+        'health_score': health_score,
+        'risk_level': risk_level
+    }
+
+def _llm_stages(ctx: Dict[str, Any]) -> List[Stage]:
+    """AI insight stages; recommendations depend on insights"""
+    return [
+        Stage(
+            'insights',
+            lambda: openai_service.generate_insights_async(
+                ctx['financial_data'], ctx['metrics'], ctx['industry'], ctx['business_type'],
+                language=ctx['language']
+            ),
+            kind='io'
+        ),
+        Stage(
+            'recommendations',
+            lambda insights: openai_service.generate_recommendations_async(
+                insights, ctx['metrics'], ctx['risk_level'], ctx['industry'], language=ctx['language']
+            ),
+            depends_on=('insights',),
+            kind='io'
+        )
+    ]
+
+DETERMINISTIC_STAGES = ('products', 'tax', 'forecast')
+
+def _benchmark_stage(ctx: Dict[str, Any]) -> Stage:
+    """Peer benchmark stage; never cached, since peer ranks move as analyses are saved"""
+    return Stage(
+        'benchmark',
+        lambda: industry_benchmark.get_benchmark_comparison(
+            ctx['metrics'], ctx['industry'], language=ctx['language'],
+            size=ctx['business_profile'].size
+        )
+    )
+
+def _deterministic_stages(ctx: Dict[str, Any]) -> List[Stage]:
+    """Product, tax and forecast stages; independent of each other"""
+    return [
+        Stage(
+            'products',
+            lambda: product_recommender.recommend_products(
+                ctx['health_score'], ctx['metrics'], ctx['financial_data'], ctx['industry'],
+                language=ctx['language']
+            )
+        ),
+        Stage(
+            'tax',
+            lambda: tax_compliance.check_compliance(
+                ctx['financial_data'], ctx['industry'], ctx['business_type'], language=ctx['language']
+            )
+        ),
+        Stage(
+            'forecast',
+            lambda: cash_flow_forecaster.forecast_cash_flow(
+                ctx['financial_data'], ctx['metrics'], ctx['industry'], months=12, language=ctx['language']
+            )
+        )
+    ]
+
+def _analysis_record(
+    ctx: Dict[str, Any],
+    results: Dict[str, Any],
+    history: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """Rows to persist for one analysis (see WriteBehindQueue)"""
+    business_profile = ctx['business_profile']
+    return {
+        'business': {
+            'name': business_profile.name,
+            'business_type': business_profile.business_type,
+            'industry': business_profile.industry,
+            'size': business_profile.size,
+            'location': business_profile.location,
+            'years_in_operation': business_profile.years_in_operation
+        },
+        'statement': ctx['financial_data'],
+        'history': history or [],
+        'analysis': {
+            'health_score': ctx['health_score'],
+            'creditworthiness_score': ctx['health_score'],  # Same for now
+            'risk_level': ctx['risk_level'],
+            'insights': results['insights'],
+            'recommendations': results['recommendations'],
+            'metrics': ctx['metrics'],
+            'forecast_data': results['forecast'],
+            'benchmark_data': results['benchmark'],
+            'product_recommendations': results['products']
+        }
+    }
+
+def _build_assessment(ctx: Dict[str, Any], results: Dict[str, Any]):
+    """Assemble the HealthAssessment response, translated if needed"""
+    assessment = HealthAssessment(
+        health_score=ctx['health_score'],
+        creditworthiness_score=ctx['health_score'],
+        risk_level=ctx['risk_level'],
+        insights=results['insights'],
+        recommendations=results['recommendations'],
+        metrics=ctx['metrics'],
+        benchmark_comparison=results['benchmark'],
+        product_recommendations=results['products'],
+        tax_compliance=results['tax'],
+        cash_flow_forecast=results['forecast']
+    )
+    
+    # Translate if needed
+    if ctx['language'] != 'en':
+        response_dict = assessment.dict()
+        response_dict['risk_level'] = translation_service.translate(ctx['risk_level'], ctx['language'])
+        # Note: Full translation of insights/recommendations would require AI translation
+        return response_dict
+    
+    return assessment
+
+def _sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data), ensure_ascii=False)}\n\n"
+
+async def _run_analysis(
+    analysis_request: AnalysisRequest,
+    response: Response,
+    history: Optional[List[Dict[str, Any]]] = None,
+    upload_digest: Optional[str] = None
+) -> HealthAssessment:
+    """
+    Run the full analysis pipeline and queue the results for persistence
+    
+    With an upload digest, the product, tax and forecast outputs are
+    served from (and stored in) the upload cache.
+    """
+    ctx = _prepare_analysis(analysis_request)
+    
+    stage_key = None
+    cached = None
+    if upload_digest is not None:
+        stage_key = upload_cache.stage_key(upload_digest, ctx['industry'], ctx['business_type'], ctx['language'])
+        cached = upload_cache.get_stages(stage_key)
+    
+    # Run the remaining stages as a dependency graph: only recommendations
+    # waits on insights, everything else overlaps with the LLM calls
+    stages = _llm_stages(ctx) + [_benchmark_stage(ctx)]
+    if cached is None:
+        stages += _deterministic_stages(ctx)
+    results, timings = await pipeline_executor.run(stages)
+    response.headers["Server-Timing"] = format_server_timing(timings)
+    
+    if cached is not None:
+        results.update(cached)
+    elif stage_key is not None:
+        upload_cache.set_stages(stage_key, {name: results[name] for name in DETERMINISTIC_STAGES})
+    
+    # Save to database in the background (write-behind)
+    analysis_writer.enqueue(_analysis_record(ctx, results, history))
+    
+    return _build_assessment(ctx, results)
+
 @app.post("/analyze", response_model=HealthAssessment)
 @limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
 async def analyze_finances(
     request: Request,
-    analysis_request: AnalysisRequest,
-    db: Session = Depends(get_db)
+    response: Response,
+    analysis_request: AnalysisRequest
 ):
     """
     Comprehensive financial analysis endpoint
@@ -108,191 +350,204 @@ async def analyze_finances(
     - Cash flow forecast
     """
     try:
-        # Extract data
-        business_profile = analysis_request.business_profile
-        financial_data = analysis_request.financial_statement.dict()
-        language = analysis_request.language
+        return await _run_analysis(analysis_request, response)
         
-        # Validate business name
-        validate_input(business_profile.name, max_length=255)
-        
-        # Calculate comprehensive metrics
-        metrics = financial_analyzer.calculate_all_metrics(financial_data)
-        
-        # Calculate health score
-        health_score = financial_analyzer.calculate_health_score(
-            metrics,
-            business_profile.industry.value
-        )
-        
-        # Determine risk level
-        risk_level = financial_analyzer.determine_risk_level(health_score, metrics)
-        
-        # Generate AI insights
-        insights = openai_service.generate_insights(
-            financial_data,
-            metrics,
-            business_profile.industry.value,
-            business_profile.business_type.value,
-            language=language
-        )
-        
-        # Generate recommendations
-        recommendations = openai_service.generate_recommendations(
-            insights,
-            metrics,
-            risk_level,
-            business_profile.industry.value,
-            language=language
-        )
-        
-        # Industry benchmark comparison
-        benchmark_comparison = industry_benchmark.get_benchmark_comparison(
-            metrics,
-            business_profile.industry.value,
-            language=language
-        )
-        
-        # Product recommendations
-        product_recs = product_recommender.recommend_products(
-            health_score,
-            metrics,
-            financial_data,
-            business_profile.industry.value,
-            language=language
-        )
-        
-        # Tax compliance check
-        tax_status = tax_compliance.check_compliance(
-            financial_data,
-            business_profile.industry.value,
-            business_profile.business_type.value,
-            language=language
-        )
-        
-        # Cash flow forecast
-        forecast = cash_flow_forecaster.forecast_cash_flow(
-            financial_data,
-            metrics,
-            business_profile.industry.value,
-            months=12,
-            language=language
-        )
-        
-        # Save to database
+    except Exception as e:
+        logger.error(f"Analysis error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+@app.post("/analyze/stream")
+@limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
+async def analyze_finances_stream(request: Request, analysis_request: AnalysisRequest):
+    """
+    Streaming variant of /analyze (Server-Sent Events)
+    
+    Events:
+    - assessment: full HealthAssessment with rule-based insights, sent immediately
+    - insights: AI insights once the completion arrives
+    - recommendations: AI recommendations once the completion arrives
+    - complete: final HealthAssessment
+    - error: analysis failed after the stream started
+    """
+    try:
+        ctx = _prepare_analysis(analysis_request)
+        results, _ = await pipeline_executor.run([_benchmark_stage(ctx)] + _deterministic_stages(ctx))
+    except Exception as e:
+        logger.error(f"Analysis error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+    
+    async def event_stream():
         try:
-            # Create or get business profile
-            db_business = DBBusinessProfile(
-                name=business_profile.name,
-                business_type=business_profile.business_type,
-                industry=business_profile.industry,
-                size=business_profile.size,
-                location=business_profile.location,
-                years_in_operation=business_profile.years_in_operation
+            results['insights'] = openai_service.generate_rule_based_insights(
+                ctx['financial_data'], ctx['metrics'], ctx['industry'], language=ctx['language']
             )
-            db.add(db_business)
-            db.commit()
-            db.refresh(db_business)
-            
-            # Save financial statement
-            db_statement = DBFinancialStatement(
-                business_id=db_business.id,
-                **financial_data
+            results['recommendations'] = openai_service.generate_rule_based_recommendations(
+                ctx['metrics'], ctx['risk_level'], language=ctx['language']
             )
-            db.add(db_statement)
-            db.commit()
-            db.refresh(db_statement)
+            yield _sse_event('assessment', _build_assessment(ctx, results))
             
-            # Save analysis result
-            db_analysis = DBAnalysisResult(
-                business_id=db_business.id,
-                statement_id=db_statement.id,
-                health_score=health_score,
-                creditworthiness_score=health_score,  # Same for now
-                risk_level=risk_level,
-                insights=insights,
-                recommendations=recommendations,
-                metrics=metrics,
-                forecast_data=forecast,
-                benchmark_data=benchmark_comparison,
-                product_recommendations=product_recs
-            )
-            db.add(db_analysis)
-            db.commit()
+            if openai_service.enabled:
+                results['insights'] = await openai_service.generate_insights_async(
+                    ctx['financial_data'], ctx['metrics'], ctx['industry'], ctx['business_type'],
+                    language=ctx['language']
+                )
+                yield _sse_event('insights', {'insights': results['insights']})
+                
+                results['recommendations'] = await openai_service.generate_recommendations_async(
+                    results['insights'], ctx['metrics'], ctx['risk_level'], ctx['industry'],
+                    language=ctx['language']
+                )
+                yield _sse_event('recommendations', {'recommendations': results['recommendations']})
             
-            logger.info(f"Analysis saved for business: {business_profile.name}")
-        except Exception as db_error:
-            logger.error(f"Database error: {db_error}")
-            # Continue even if database save fails
+            yield _sse_event('complete', _build_assessment(ctx, results))
+        except Exception as e:
+            logger.error(f"Streaming analysis error: {str(e)}")
+            yield _sse_event('error', {'detail': f"Analysis failed: {str(e)}"})
+            return
         
-        # Prepare response
-        response = HealthAssessment(
-            health_score=health_score,
-            creditworthiness_score=health_score,
-            risk_level=risk_level,
-            insights=insights,
-            recommendations=recommendations,
-            metrics=metrics,
-            benchmark_comparison=benchmark_comparison,
-            product_recommendations=product_recs,
-            tax_compliance=tax_status,
-            cash_flow_forecast=forecast
+        analysis_writer.enqueue(_analysis_record(ctx, results))
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/analyze/batch", response_model=BatchAnalysisResponse)
+@limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
+async def analyze_batch(request: Request, batch_request: BatchAnalysisRequest):
+    """
+    Portfolio analysis endpoint
+    
+    Runs the deterministic stages (metrics, health score, risk level,
+    benchmark, products, tax, forecast) for many businesses across a
+    process pool. AI insights and persistence are skipped; each item
+    reports its own result or error.
+    """
+    try:
+        results = await batch_processor.analyze(
+            [item.dict() for item in batch_request.items],
+            chunk_size=batch_request.chunk_size
         )
+        failed = sum(1 for r in results if r['status'] != 'ok')
         
-        # Translate if needed
-        if language != 'en':
-            response_dict = response.dict()
-            response_dict['risk_level'] = translation_service.translate(risk_level, language)
-            # Note: Full translation of insights/recommendations would require AI translation
-            return response_dict
-        
-        return response
+        logger.info(f"Batch analysis completed: {len(results)} items, {failed} failed")
         
+        return BatchAnalysisResponse(
+            total=len(results),
+            succeeded=len(results) - failed,
+            failed=failed,
+            results=results
+        )
     except Exception as e:
-        logger.error(f"Analysis error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        logger.error(f"Batch analysis error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch analysis failed: {str(e)}")
+
+async def _analyze_upload(
+    source: BinaryIO,
+    filename: str,
+    params: Dict[str, Any],
+    response: Response,
+    report: Optional[Callable[[str, int], Awaitable[None]]] = None
+):
+    """
+    Parse an uploaded document (or reuse its cached parse) and analyze its latest period
+    
+    Args:
+        source: Seekable binary file object with the upload content
+        filename: Original file name, used to pick the parser
+        params: business_name, business_type, industry and language
+        response: Response to attach the Server-Timing header to
+        report: Optional progress callback (stage, percent) for upload jobs
+    """
+    # Parse document (one statement per period, oldest first); identical
+    # re-uploads are served from the content-addressed cache
+    upload_digest = upload_cache.digest(source)
+    parsed_key = upload_cache.parsed_key(upload_digest, filename)
+    periods = upload_cache.get_parsed(parsed_key)
+    if periods is None:
+        # Parsing is CPU-bound; keep it off the event loop
+        periods = await asyncio.to_thread(document_parser.parse_buffer, filename, source)
+        upload_cache.set_parsed(parsed_key, periods)
+    
+    if report is not None:
+        await report('analyzing', 50)
+    
+    # Create analysis request
+    from database.models import BusinessType, Industry
+    
+    analysis_request = AnalysisRequest(
+        business_profile={
+            "name": params['business_name'],
+            "business_type": BusinessType(params['business_type']),
+            "industry": Industry(params['industry'])
+        },
+        financial_statement=periods[-1],
+        language=params['language']
+    )
+    
+    # Earlier periods are stored alongside the analyzed (latest) one
+    history = [FinancialStatement(**period).dict() for period in periods[:-1]]
+    
+    # Reuse analyze endpoint logic
+    return await _run_analysis(analysis_request, response, history=history, upload_digest=upload_digest)
+
+async def _process_upload_job(job: Dict[str, Any], report: Callable[[str, int], Awaitable[None]]) -> Dict[str, Any]:
+    """Background handler for asynchronous uploads (see UploadJobQueue)"""
+    with open(job['file_path'], 'rb') as source:
+        assessment = await _analyze_upload(source, job['filename'], job['params'], Response(), report)
+    return jsonable_encoder(assessment)
 
 @app.post("/upload", response_model=HealthAssessment)
 @limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
 async def upload_financial_document(
     request: Request,
+    response: Response,
     file: UploadFile = File(...),
     business_name: str = "Unknown Business",
     business_type: str = "private_limited",
     industry: str = "services",
     language: str = "en",
-    db: Session = Depends(get_db)
+    run_async: bool = Query(False, alias="async", description="Return a job id at once and analyze in the background")
 ):
     """
     Upload and analyze financial document (CSV, XLSX, PDF)
+    
+    With ?async=true the upload is stored and queued, and the response is
+    202 with a job id; poll GET /jobs/{job_id} for progress and the result.
     """
     try:
-        # Validate file size
-        content = await file.read()
-        if len(content) > settings.MAX_UPLOAD_SIZE:
+        # Validate file size (the body limit is already enforced while streaming;
+        # this is the exact check on the file part, without reading it)
+        if document_parser.get_upload_size(file) > settings.MAX_UPLOAD_SIZE:
             raise HTTPException(status_code=413, detail="File too large")
         
-        # Reset file pointer
-        await file.seek(0)
+        params = {
+            "business_name": business_name,
+            "business_type": business_type,
+            "industry": industry,
+            "language": language
+        }
         
-        # Parse document
-        financial_data = await document_parser.parse_file(file)
-        
-        # Create analysis request
-        from database.models import BusinessType, Industry
-        
-        analysis_request = AnalysisRequest(
-            business_profile={
-                "name": business_name,
-                "business_type": BusinessType(business_type),
-                "industry": Industry(industry)
-            },
-            financial_statement=financial_data,
-            language=language
-        )
+        if run_async:
+            # Reject what the worker would reject before accepting the job
+            from database.models import BusinessType, Industry
+            
+            extension = os.path.splitext(file.filename.lower())[1]
+            if extension not in settings.ALLOWED_EXTENSIONS:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Unsupported file format. Please upload CSV, XLSX, or PDF"
+                )
+            BusinessType(business_type)
+            Industry(industry)
+            validate_input(business_name, max_length=255)
+            
+            job_id = await upload_jobs.submit(file.file, file.filename, params)
+            accepted = UploadJobAccepted(job_id=job_id, status=JobStatus.PENDING.value, status_url=f"/jobs/{job_id}")
+            return JSONResponse(status_code=202, content=accepted.dict())
         
-        # Reuse analyze endpoint logic
-        return await analyze_finances(request, analysis_request, db)
+        return await _analyze_upload(file.file, file.filename, params, response)
         
     except HTTPException:
         raise
@@ -300,14 +555,59 @@ async def upload_financial_document(
         logger.error(f"Upload error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
+@app.get("/jobs/{job_id}", response_model=UploadJobStatus)
+async def get_upload_job(job_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Status of an asynchronous upload
+    
+    Args:
+        job_id: Id returned by POST /upload?async=true
+        
+    Returns:
+        Status, progress, current stage and, once completed, the HealthAssessment
+    """
+    job = await upload_jobs.get(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return UploadJobStatus(
+        job_id=job.id,
+        status=job.status.value,
+        progress=job.progress or 0,
+        stage=job.stage,
+        filename=job.filename,
+        result=job.result,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        completed_at=job.completed_at
+    )
+
 @app.post("/forecast")
 @limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
 async def get_cash_flow_forecast(request: Request, forecast_request: ForecastRequest):
-    """Get cash flow forecast"""
+    """
+    Get cash flow forecast
+    
+    mode="monte_carlo" simulates `paths` stochastic paths and returns
+    P5/P50/P95 bands per month, the probability of negative cash and the
+    expected cash runway instead of a single projection.
+    """
     try:
         financial_data = forecast_request.financial_statement.dict()
         metrics = financial_analyzer.calculate_all_metrics(financial_data)
         
+        if forecast_request.mode == "monte_carlo":
+            return await asyncio.to_thread(
+                cash_flow_forecaster.simulate_cash_flow,
+                financial_data,
+                metrics,
+                forecast_request.industry.value,
+                forecast_request.months,
+                paths=forecast_request.paths,
+                seed=forecast_request.seed
+            )
+        
         forecast = cash_flow_forecaster.forecast_cash_flow(
             financial_data,
             metrics,
@@ -320,16 +620,146 @@ async def get_cash_flow_forecast(request: Request, forecast_request: ForecastReq
         logger.error(f"Forecast error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Forecast failed: {str(e)}")
 
+@app.post("/businesses/{business_id}/statements")
+@limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
+async def add_business_statement(
+    request: Request,
+    business_id: int,
+    statement: FinancialStatement,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Store a new period for an existing business
+    
+    The period is folded into the business's history forecast state
+    without refitting earlier periods. A period that overlaps months
+    already in the model (a quarter of a stored year, say) is stored but
+    not counted twice.
+    
+    Returns:
+        Statement id and the number of periods and monthly observations
+        in the model
+    """
+    try:
+        result = await history_forecaster.add_period(db, business_id, statement.dict())
+    except Exception as e:
+        logger.error(f"Statement storage error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Storing statement failed: {str(e)}")
+    
+    if result is None:
+        raise HTTPException(status_code=404, detail="Business not found")
+    return result
+
+@app.get("/businesses/{business_id}/forecast")
+@limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
+async def get_business_forecast(
+    request: Request,
+    business_id: int,
+    months: int = Query(12, ge=1, le=36),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Cash flow forecast fitted to a business's stored periods
+    
+    Revenue and net income follow the trend and month-of-year pattern of
+    the stored history instead of the industry growth rate and
+    seasonality. Needs at least HISTORY_MIN_PERIODS periods.
+    """
+    try:
+        forecast = await history_forecaster.forecast_business(db, business_id, months)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"History forecast error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Forecast failed: {str(e)}")
+    
+    if forecast is None:
+        raise HTTPException(status_code=404, detail="No stored periods for this business")
+    return forecast
+
+@app.get("/portfolio/forecast")
+@limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
+async def get_portfolio_forecast(
+    request: Request,
+    group_by: str = Query("industry"),
+    months: int = Query(12, ge=1, le=36),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Aggregated cash flow forecast across all stored businesses
+    
+    Projects the latest statement of every business in one vectorized
+    pass and rolls the results up for the whole portfolio and per
+    industry or size: monthly totals, P5/P50/P95 of net cash flow and
+    cash balance, and the number of businesses (and amount) in negative
+    cash. Cached until new statements are stored.
+    """
+    try:
+        return await portfolio_forecaster.portfolio_forecast(db, group_by, months)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Portfolio forecast error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Portfolio forecast failed: {str(e)}")
+
+@app.post("/scenarios")
+@limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
+async def evaluate_scenarios(request: Request, scenario_request: ScenarioRequest):
+    """
+    What-if scenario grid
+    
+    Every combination of the requested shocks is evaluated in one
+    vectorized pass through metrics, health score, risk level and the
+    forecast projection.
+    
+    Args:
+        scenario_request: Base statement, industry and shocks
+        
+    Returns:
+        Column names, results for the unshocked statement and one row
+        per combination
+    """
+    try:
+        return await asyncio.to_thread(
+            scenario_engine.evaluate,
+            scenario_request.financial_statement.dict(),
+            [shock.dict() for shock in scenario_request.shocks],
+            scenario_request.industry.value,
+            scenario_request.months,
+            scenario_request.metrics,
+            scenario_request.propagate
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Scenario error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Scenario evaluation failed: {str(e)}")
+
 @app.post("/benchmark")
 @limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
 async def get_industry_benchmark(request: Request, benchmark_request: BenchmarkRequest):
-    """Get industry benchmark comparison"""
+    """
+    Get industry benchmark comparison
+    
+    With a list of metric sets, returns a list of comparisons in the same
+    order, classified in one vectorized pass. industry and size may be
+    single values for the whole batch or one per business.
+    """
+    metrics = benchmark_request.metrics
+    industry = benchmark_request.industry
+    size = benchmark_request.size
     try:
-        comparison = industry_benchmark.get_benchmark_comparison(
-            benchmark_request.metrics,
-            benchmark_request.industry.value
-        )
-        return comparison
+        if not isinstance(metrics, list):
+            if isinstance(industry, list) or isinstance(size, list):
+                raise ValueError("Per-business industry or size lists need a list of metrics")
+            return industry_benchmark.get_benchmark_comparison(metrics, industry.value, size=size)
+        
+        count = len(metrics)
+        industries = [item.value for item in industry] if isinstance(industry, list) else [industry.value] * count
+        sizes = size if isinstance(size, list) else [size] * count
+        return await asyncio.to_thread(industry_benchmark.compare_many, metrics, industries, 'en', sizes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Benchmark error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Benchmark failed: {str(e)}")
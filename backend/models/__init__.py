@@ -3,9 +3,16 @@ from .schemas import (
     FinancialStatement,
     BusinessProfile,
     AnalysisRequest,
+    BatchAnalysisRequest,
+    BatchItemResult,
+    BatchAnalysisResponse,
     MetricsResponse,
     HealthAssessment,
+    UploadJobAccepted,
+    UploadJobStatus,
     ForecastRequest,
+    ScenarioShock,
+    ScenarioRequest,
     BenchmarkRequest,
     TranslationRequest,
     ErrorResponse
@@ -15,9 +22,16 @@ __all__ = [
     "FinancialStatement",
     "BusinessProfile",
     "AnalysisRequest",
+    "BatchAnalysisRequest",
+    "BatchItemResult",
+    "BatchAnalysisResponse",
     "MetricsResponse",
     "HealthAsses  nt",
+    "UploadJobAccepted",
+    "UploadJobStatus",
     "ForecastRequest",
+    "ScenarioShock",
+    "ScenarioRequest",
     "BenchmarkRequest",
     "TranslationRequest",
     "ErrorResponse"
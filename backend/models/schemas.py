@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal, Union, Annotated
+from datetime import datetime
 from database.models import BusinessType, Industry, RiskLevel
+from config.settings import settings
 
 class FinancialStatement(BaseModel):
     """Financial statement data model"""
@@ -16,6 +18,7 @@ class FinancialStatement(BaseModel):
     receivables: float = Field(0, description="Accounts receivable", ge=0)
     payables: float = Field(0, description="Accounts payable", ge=0)
     cash: float = Field(0, description="Cash and equivalents", ge=0)
+    period: Optional[str] = Field(None, description="Reporting period, e.g. 2024-Q1 or 2024", max_length=50)
 
 class BusinessProfile(BaseModel):
     """Business profile information"""
@@ -32,6 +35,11 @@ class AnalysisRequest(BaseModel):
     financial_statement: FinancialStatement
     language: Optional[str] = Field("en", description="Response language: en, hi, ta, te")
 
+class BatchAnalysisRequest(BaseModel):
+    """Portfolio analysis request covering many businesses"""
+    items: List[AnalysisRequest] = Field(..., description="Businesses to analyze", min_length=1, max_length=settings.BATCH_MAX_ITEMS)
+    chunk_size: Optional[int] = Field(None, description="Items per worker task (defaults to server setting)", ge=1, le=5000)
+
 class MetricsResponse(BaseModel):
     """Financial metrics response"""
     liquidity: Dict[str, float]
@@ -54,16 +62,78 @@ class HealthAssessment(BaseModel
     tax_compliance: Optional[Dict[str, Any]] = Field(None, description="Tax compliance status")
     cash_flow_forecast: Optional[Dict[str, Any]] = Field(None, description="Cash flow projections")
 
+class UploadJobAccepted(BaseModel):
+    """Response to an asynchronous upload"""
+    job_id: str = Field(..., description="Upload job id")
+    status: str = Field(..., description="Job status: pending, running, completed, failed")
+    status_url: str = Field(..., description="URL to poll for progress and the result")
+
+class UploadJobStatus(BaseModel):
+    """Progress and result of an asynchronous upload"""
+    job_id: str
+    status: str = Field(..., description="Job status: pending, running, completed, failed")
+    progress: int = Field(..., description="Progress percentage (0-100)")
+    stage: Optional[str] = Field(None, description="Current step: queued, parsing, analyzing, done")
+    filename: str
+    result: Optional[HealthAssessment] = Field(None, description="Assessment once the job has completed")
+    error: Optional[str] = Field(None, description="Error message when the job failed")
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+class BatchItemResult(BaseModel):
+    """Outcome of one item in a batch analysis"""
+    index: int = Field(..., description="Position of the item in the request")
+    status: str = Field(..., description="ok or error")
+    health_score: Optional[int] = None
+    creditworthiness_score: Optional[int] = None
+    risk_level: Optional[str] = None
+    metrics: Optional[MetricsResponse] = None
+    benchmark_comparison: Optional[Dict[str, Any]] = None
+    product_recommendations: Optional[List[Dict[str, Any]]] = None
+    tax_compliance: Optional[Dict[str, Any]] = None
+    cash_flow_forecast: Optional[Dict[str, Any]] = None
+    error: Optional[str] = Field(None, description="Error message when status is error")
+
+class BatchAnalysisResponse(BaseModel):
+    """Batch analysis response"""
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BatchItemResult]
+
 class ForecastRequest(BaseModel):
     """Cash flow forecast request"""
     financial_statement: FinancialStatement
     industry: Industry
     months: int = Field(12, description="Number of months to forecast", ge=1, le=36)
+    mode: Literal["deterministic", "monte_carlo"] = Field("deterministic", description="Single projection or simulated percentile bands")
+    paths: int = Field(settings.MONTE_CARLO_PATHS, description="Simulated paths in monte_carlo mode", ge=100, le=settings.MONTE_CARLO_MAX_PATHS)
+    seed: Optional[int] = Field(None, description="Random seed for reproducible simulations", ge=0)
 
-class BenchmarkRequest(BaseModel):
-    """Industry benchmark request"""
-    metrics: Dict[str, Dict[str, float]]
+class ScenarioShock(BaseModel):
+    """One axis of a what-if grid"""
+    field: str = Field(..., description="FinancialStatement field to shock")
+    mode: Literal["relative", "absolute", "days"] = Field("relative", description="relative: x(1+v), absolute: +v, days: +v days of revenue/COGS (receivables, inventory, payables)")
+    values: List[float] = Field(..., description="Shock values to combine", min_length=1)
+
+class ScenarioRequest(BaseModel):
+    """What-if scenario grid request"""
+    financial_statement: FinancialStatement
     industry: Industry
+    shocks: List[ScenarioShock] = Field(..., description="Shocks combined as a cartesian grid", min_length=1)
+    months: int = Field(12, description="Forecast horizon for the summary columns", ge=1, le=36)
+    metrics: Optional[List[str]] = Field(None, description="Metrics to include (default: all)")
+    propagate: bool = Field(True, description="Carry component changes into net income and balance sheet totals")
+
+class BenchmarkRequest(BaseModel):
+    """Industry benchmark request for one business or a batch"""
+    metrics: Union[
+        Dict[str, Dict[str, float]],
+        Annotated[List[Dict[str, Dict[str, float]]], Field(min_length=1, max_length=settings.BATCH_MAX_ITEMS)]
+    ] = Field(..., description="Calculated metrics of one business, or a list of them")
+    industry: Union[Industry, List[Industry]] = Field(..., description="Industry, or one per business for a batch")
+    size: Optional[Union[str, List[Optional[str]]]] = Field(None, description="Business size (or one per business), to rank against peers of the same size")
 
 class TranslationRequest(BaseModel):
     """Translation request"""
@@ -15,6 +15,7 @@ from .auth import (
     validate_input,
     limiter
 )
+from .upload_guard import UploadSizeLimitMiddleware
 
 __all__ = [
     "encryption_service",
@@ -28,5 +29,6 @@ __all__ = [
     "hash_password",
     "verify_password",
     "validate_input",
-    "limiter"
+    "limiter",
+    "UploadSizeLimitMiddleware"
 ]
@@ -0,0 +1,51 @@
+from typing import Iterable
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Allowance for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+class UploadSizeLimitMiddleware:
+    """
+    ASGI middleware that enforces the upload size limit while the body streams in
+
+    Requests whose Content-Length is already too large are rejected before
+    any of the body is read. Otherwise the received bytes are counted and
+    the request fails with 413 as soon as the limit is crossed, so an
+    oversized upload is never fully buffered or spooled.
+    """
+
+    def __init__(self, app, max_size: int, paths: Iterable[str]):
+        self.app = app
+        self.max_body_size = max_size + MULTIPART_OVERHEAD
+        self.paths = tuple(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body_size:
+            logger.warning(f"Rejected upload of {int(content_length)} bytes on {scope['path']}")
+            response = JSONResponse(status_code=413, content={"detail": "File too large", "error_code": "413"})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # Raised inside body parsing; FastAPI re-raises HTTPExceptions as-is
+                    raise HTTPException(status_code=413, detail="File too large")
+            return message
+
+        await self.app(scope, limited_receive, send)
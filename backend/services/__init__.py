@@ -1,20 +1,44 @@
 # Services module initialization
 from .financial_analyzer import financial_analyzer
+from .portfolio_analyzer import portfolio_analyzer
 from .openai_service import openai_service
 from .document_parser import document_parser
+from .ledger_aggregator import ledger_aggregator
+from .header_resolver import header_resolver
+from .upload_cache import upload_cache
+from .upload_jobs import upload_jobs
 from .industry_benchmark import industry_benchmark
+from .benchmark_sketches import benchmark_sketches
 from .product_recommender import product_recommender
 from .tax_compliance import tax_compliance
 from .cash_flow_forecaster import cash_flow_forecaster
+from .history_forecaster import history_forecaster
+from .portfolio_forecaster import portfolio_forecaster
 from .translation_service import translation_service
+from .batch_processor import batch_processor
+from .scenario_engine import scenario_engine
+from .pipeline import pipeline_executor
+from .llm_cache import llm_cache
 
 __all__ = [
     "financial_analyzer",
+    "portfolio_analyzer",
     "openai_service",
     "document_parser",
+    "ledger_aggregator",
+    "header_resolver",
+    "upload_cache",
+    "upload_jobs",
     "industry_benchmark",
+    "benchmark_sketches",
     "product_recommender",
     "tax_compliance",
     "cash_flow_forecaster",
-    "translation_service"
+    "history_forecaster",
+    "portfolio_forecaster",
+    "translation_service",
+    "batch_processor",
+    "scenario_engine",
+    "pipeline_executor",
+    "llm_cache"
 ]
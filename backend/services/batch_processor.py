@@ -0,0 +1,172 @@
+from typing import Dict, Any, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+import asyncio
+import logging
+from config.settings import settings
+from security.auth import validate_input
+from services.portfolio_analyzer import PortfolioAnalyzer
+from services.industry_benchmark import IndustryBenchmark
+from services.benchmark_sketches import BenchmarkSketches, benchmark_sketches
+from services.product_recommender import ProductRecommender
+from services.tax_compliance import TaxCompliance
+from services.cash_flow_forecaster import CashFlowForecaster
+
+logger = logging.getLogger(__name__)
+
+def analyze_chunk(items: List[Dict[str, Any]], peers: Optional[BenchmarkSketches] = None) -> List[Dict[str, Any]]:
+    """
+    Run the deterministic analysis stages for a chunk of requests
+
+    Executed inside a worker process. Metrics, health score, risk level,
+    benchmark comparisons and the cash flow projections are computed for
+    the whole chunk in one vectorized pass; the remaining stages run per
+    item so one bad item cannot fail its neighbours.
+
+    Args:
+        items: AnalysisRequest dicts, each tagged with its request 'index'
+        peers: Benchmark sketches of the chunk's industries, from the parent process
+
+    Returns:
+        One result dict per item, in input order
+    """
+    columns = PortfolioAnalyzer.from_statements([item['financial_statement'] for item in items])
+    analysis = PortfolioAnalyzer.analyze(columns)
+    start = datetime.now()
+    industries = [item['business_profile']['industry'].value for item in items]
+    projection = CashFlowForecaster.project(
+        columns['revenue'] / 12,
+        columns['net_income'] / 12,
+        industries,
+        12,
+        start.month
+    )
+    month_labels = CashFlowForecaster.month_labels(12, start)
+    metrics_rows = [PortfolioAnalyzer.metrics_row(analysis['metrics'], row) for row in range(len(items))]
+    benchmarks = IndustryBenchmark.compare_many(
+        metrics_rows,
+        industries,
+        [item.get('language') or 'en' for item in items],
+        [item['business_profile'].get('size') for item in items],
+        peers
+    )
+
+    results = []
+    for row, item in enumerate(items):
+        try:
+            profile = item['business_profile']
+            financial_data = item['financial_statement']
+            industry = profile['industry'].value
+            business_type = profile['business_type'].value
+            language = item.get('language') or 'en'
+
+            validate_input(profile['name'], max_length=255)
+
+            metrics = metrics_rows[row]
+            health_score = int(analysis['health_score'][row])
+
+            results.append({
+                'index': item['index'],
+                'status': 'ok',
+                'health_score': health_score,
+                'creditworthiness_score': health_score,
+                'risk_level': str(analysis['risk_level'][row]),
+                'metrics': metrics,
+                'benchmark_comparison': benchmarks[row],
+                'product_recommendations': ProductRecommender.recommend_products(
+                    health_score, metrics, financial_data, industry, language=language
+                ),
+                'tax_compliance': TaxCompliance.check_compliance(
+                    financial_data, industry, business_type, language=language
+                ),
+                'cash_flow_forecast': CashFlowForecaster.build_forecast(
+                    projection, row, month_labels, metrics, industry, 12
+                )
+            })
+        except Exception as e:
+            results.append({
+                'index': item['index'],
+                'status': 'error',
+                'error': getattr(e, 'detail', None) or str(e)
+            })
+
+    return results
+
+class BatchProcessor:
+    """Fans portfolio analysis out across a process pool in chunks"""
+
+    def __init__(self):
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=max(1, settings.BATCH_WORKERS))
+            logger.info(f"Batch process pool started with {settings.BATCH_WORKERS} workers")
+        return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor):
+        """Drop a broken pool (a worker died) so the next batch starts a fresh one"""
+        pool.shutdown(wait=False, cancel_futures=True)
+        if self._pool is pool:
+            self._pool = None
+            logger.warning("Batch process pool broken; it will be restarted on the next batch")
+
+    async def analyze(self, items: List[Dict[str, Any]], chunk_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Analyze many requests, returning per-item results or errors
+
+        Args:
+            items: AnalysisRequest dicts
+            chunk_size: Items per worker task (defaults to BATCH_CHUNK_SIZE)
+
+        Returns:
+            Result dicts ordered by request index
+        """
+        chunk_size = chunk_size or settings.BATCH_CHUNK_SIZE
+        tagged = [{**item, 'index': i} for i, item in enumerate(items)]
+        chunks = [tagged[i:i + chunk_size] for i in range(0, len(tagged), chunk_size)]
+
+        loop = asyncio.get_running_loop()
+        submitted = [self._submit(loop, chunk) for chunk in chunks]
+        outcomes = await asyncio.gather(*(future for _, future in submitted), return_exceptions=True)
+        for (pool, _), outcome in zip(submitted, outcomes):
+            if isinstance(outcome, BrokenProcessPool):
+                self._discard_pool(pool)
+
+        results = []
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Batch chunk failed: {outcome}")
+                results.extend(
+                    {'index': item['index'], 'status': 'error', 'error': f"Chunk failed: {outcome}"}
+                    for item in chunk
+                )
+            else:
+                results.extend(outcome)
+
+        return results
+
+    def _submit(self, loop: asyncio.AbstractEventLoop, chunk: List[Dict[str, Any]]) -> tuple:
+        """(pool, future) of one chunk, replacing the pool first if it is already broken"""
+        pool = self._get_pool()
+        peers = BatchProcessor._peers_for(chunk)
+        try:
+            return pool, loop.run_in_executor(pool, analyze_chunk, chunk, peers)
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            pool = self._get_pool()
+            return pool, loop.run_in_executor(pool, analyze_chunk, chunk, peers)
+
+    @staticmethod
+    def _peers_for(chunk: List[Dict[str, Any]]) -> BenchmarkSketches:
+        """Peer sketches a chunk needs; worker processes have no registry of their own"""
+        return benchmark_sketches.snapshot({item['business_profile']['industry'].value for item in chunk})
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+batch_processor = BatchProcessor()
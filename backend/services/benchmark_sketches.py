@@ -0,0 +1,300 @@
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+from collections import defaultdict
+import asyncio
+import logging
+import numpy as np
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.settings import settings
+from database.connection import AsyncSessionLocal
+from database.models import BenchmarkSketch
+
+logger = logging.getLogger(__name__)
+
+# Benchmarked metrics and where they sit in the calculated metrics dict
+KEY_METRICS = {
+    'current_ratio': ('liquidity', 'current_ratio'),
+    'quick_ratio': ('liquidity', 'quick_ratio'),
+    'net_profit_margin': ('profitability', 'net_profit_margin'),
+    'debt_to_equity': ('leverage', 'debt_to_equity'),
+    'asset_turnover': ('efficiency', 'asset_turnover'),
+    'return_on_equity': ('profitability', 'return_on_equity')
+}
+
+# Metrics where a lower value ranks better
+LOWER_IS_BETTER = frozenset({'debt_to_equity'})
+
+# Size key of the industry-wide sketch every analysis also counts towards
+ALL_SIZES = '*'
+
+# INSERT ... ON CONFLICT constructs of the supported database backends
+INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+# Bucket boundaries grow by GAMMA, so any value in a bucket is within
+# BENCHMARK_SKETCH_ACCURACY of the bucket's representative value.
+# Magnitudes below MIN_MAGNITUDE share the zero bucket (key 0); positive
+# values map to keys >= 1 and negative values to keys <= -1, so keys
+# sort in the same order as the values.
+GAMMA = (1 + settings.BENCHMARK_SKETCH_ACCURACY) / (1 - settings.BENCHMARK_SKETCH_ACCURACY)
+LOG_GAMMA = np.log(GAMMA)
+MIN_MAGNITUDE = 1e-6
+KEY_OFFSET = 1 - int(np.ceil(np.log(MIN_MAGNITUDE) / LOG_GAMMA))
+
+def bucket_keys(values: Iterable[float]) -> np.ndarray:
+    """Sortable bucket key of each value"""
+    values = np.asarray(values, dtype=float)
+    magnitude = np.abs(values)
+    nonzero = magnitude >= MIN_MAGNITUDE
+    index = np.ceil(np.log(np.where(nonzero, magnitude, 1.0)) / LOG_GAMMA).astype(np.int64) + KEY_OFFSET
+    return np.where(nonzero, np.sign(values).astype(np.int64) * index, 0)
+
+def bucket_values(keys: Iterable[int]) -> np.ndarray:
+    """Representative value of each bucket key"""
+    keys = np.asarray(keys, dtype=np.int64)
+    index = np.abs(keys) - KEY_OFFSET
+    return np.sign(keys) * 2 * GAMMA ** index / (GAMMA + 1)
+
+class QuantileSketch:
+    """
+    Mergeable log-bucket quantile sketch of one metric
+
+    Holds sorted bucket keys with their counts and prefix sums. Merging
+    adds counts bucket by bucket, so sketches built from separate batches
+    combine exactly. Ranking a value is a binary search over the keys.
+    Sketches are not modified once built; merge returns a new one.
+    """
+
+    __slots__ = ('keys', 'counts', 'cumulative')
+
+    def __init__(self, keys: Iterable[int] = (), counts: Iterable[int] = ()):
+        keys = np.asarray(keys, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.int64)
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.counts = counts[order]
+        self.cumulative = np.concatenate([[0], np.cumsum(self.counts)])
+
+    @property
+    def count(self) -> int:
+        return int(self.cumulative[-1])
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> "QuantileSketch":
+        """Sketch of raw metric values; NaN and infinite values are skipped"""
+        values = np.asarray(values, dtype=float)
+        keys, counts = np.unique(bucket_keys(values[np.isfinite(values)]), return_counts=True)
+        return cls(keys, counts)
+
+    @classmethod
+    def from_json(cls, buckets: Dict[str, int]) -> "QuantileSketch":
+        """Sketch from its stored bucket key -> count mapping"""
+        return cls([int(key) for key in buckets], list(buckets.values()))
+
+    def to_json(self) -> Dict[str, int]:
+        """Bucket key -> count mapping for storage"""
+        return {str(key): count for key, count in zip(self.keys.tolist(), self.counts.tolist())}
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Sketch of both sketches' samples"""
+        keys, inverse = np.unique(np.concatenate([self.keys, other.keys]), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate([self.counts, other.counts]), minlength=len(keys))
+        return QuantileSketch(keys, counts.astype(np.int64))
+
+    def rank(self, value: float) -> float:
+        """Percent of samples below the value, counting its own bucket as half below"""
+        return float(self.ranks([value])[0])
+
+    def ranks(self, values: Iterable[float]) -> np.ndarray:
+        """rank() of many values at once"""
+        keys = bucket_keys(values)
+        positions = np.searchsorted(self.keys, keys)
+        below = self.cumulative[positions]
+        inside = positions < len(self.keys)
+        same = np.zeros(len(keys), dtype=np.int64)
+        matched = inside.copy()
+        matched[inside] = self.keys[positions[inside]] == keys[inside]
+        same[matched] = self.counts[positions[matched]]
+        return 100 * (below + same / 2) / self.count
+
+    def quantile(self, percent: float) -> float:
+        """Approximate value at a percentile (0-100)"""
+        target = percent / 100 * self.count
+        position = min(int(np.searchsorted(self.cumulative, target, side='right')) - 1, len(self.keys) - 1)
+        return float(bucket_values([self.keys[max(position, 0)]])[0])
+
+SketchKey = Tuple[str, str, str]
+
+class BenchmarkSketches:
+    """
+    Peer distributions of the benchmarked metrics
+
+    One QuantileSketch per (industry, size, metric) plus an industry-wide
+    one per metric (size ALL_SIZES). Once a batch of analyses is saved,
+    the write-behind queue merges its sketches into the benchmark_sketches
+    table in a separate transaction and swaps the merged rows into the
+    in-process copy. That copy is loaded from the table at startup and
+    reloaded every BENCHMARK_SKETCH_RELOAD_INTERVAL seconds, so sketches
+    written by other worker processes are picked up too. The
+    analysis_results table itself is never rescanned.
+    """
+
+    def __init__(self):
+        self._sketches: Dict[SketchKey, QuantileSketch] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.loaded = False
+        self.updates = 0
+        self.reloads = 0
+
+    @staticmethod
+    def size_key(size: Optional[str]) -> Optional[str]:
+        """Normalized size, or None when not given"""
+        size = (size or '').strip().lower()
+        return size or None
+
+    @staticmethod
+    def key_metric_values(metrics: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+        """Benchmarked metric values from a calculated metrics dict"""
+        return {name: metrics[category][field] for name, (category, field) in KEY_METRICS.items()}
+
+    @staticmethod
+    def batch_sketches(records: List[Dict[str, Any]]) -> Dict[SketchKey, QuantileSketch]:
+        """
+        Sketches of the metrics in a batch of write-behind records
+
+        Each analysis counts towards its industry-wide sketch and, when the
+        business has a size, its (industry, size) sketch.
+        """
+        values = defaultdict(list)
+        for record in records:
+            industry = getattr(record['business']['industry'], 'value', record['business']['industry'])
+            size = BenchmarkSketches.size_key(record['business'].get('size'))
+            metrics = record['analysis'].get('metrics')
+            if not metrics:
+                continue
+            for metric, value in BenchmarkSketches.key_metric_values(metrics).items():
+                values[(industry, ALL_SIZES, metric)].append(value)
+                if size:
+                    values[(industry, size, metric)].append(value)
+        return {key: QuantileSketch.from_values(batch) for key, batch in values.items()}
+
+    @staticmethod
+    async def persist(db: AsyncSession, sketches: Dict[SketchKey, QuantileSketch]) -> Dict[SketchKey, QuantileSketch]:
+        """
+        Merge batch sketches into their stored rows (the caller commits)
+
+        Missing rows are created empty with INSERT ... ON CONFLICT DO
+        NOTHING, so workers flushing the same new key at once do not
+        collide on the primary key. The rows are then locked in key order
+        and merged.
+
+        Returns:
+            The merged sketch of every stored row that was updated
+        """
+        if not sketches:
+            return {}
+        keys = sorted(sketches)
+        insert = INSERTS[db.get_bind().dialect.name]
+        await db.execute(
+            insert(BenchmarkSketch)
+            .values([
+                {'industry': industry, 'size': size, 'metric': metric, 'count': 0, 'buckets': {}}
+                for industry, size, metric in keys
+            ])
+            .on_conflict_do_nothing(index_elements=['industry', 'size', 'metric'])
+        )
+        result = await db.execute(
+            select(BenchmarkSketch)
+            .where(tuple_(BenchmarkSketch.industry, BenchmarkSketch.size, BenchmarkSketch.metric).in_(keys))
+            .order_by(BenchmarkSketch.industry, BenchmarkSketch.size, BenchmarkSketch.metric)
+            .with_for_update()
+        )
+
+        merged = {}
+        for row in result.scalars():
+            key = (row.industry, row.size, row.metric)
+            merged[key] = QuantileSketch.from_json(row.buckets).merge(sketches[key])
+            row.count = merged[key].count
+            row.buckets = merged[key].to_json()
+        return merged
+
+    def apply(self, sketches: Dict[SketchKey, QuantileSketch]):
+        """Swap committed stored sketches into the in-process copy"""
+        # Replacing whole sketches means concurrent readers never see a partial merge
+        self._sketches.update(sketches)
+        self.updates += 1
+
+    async def load(self):
+        """Load every stored sketch into memory"""
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(select(BenchmarkSketch))
+                self._sketches = {
+                    (row.industry, row.size, row.metric): QuantileSketch.from_json(row.buckets)
+                    for row in result.scalars()
+                }
+            self.loaded = True
+            logger.info(f"Loaded {len(self._sketches)} benchmark sketches")
+        except Exception as e:
+            logger.warning(f"Benchmark sketches unavailable, using static thresholds: {e}")
+
+    def start(self):
+        """Start reloading the stored sketches every BENCHMARK_SKETCH_RELOAD_INTERVAL seconds"""
+        if settings.BENCHMARK_SKETCH_RELOAD_INTERVAL <= 0 or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.create_task(self._reload())
+
+    async def stop(self):
+        """Stop the periodic reload"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _reload(self):
+        while True:
+            await asyncio.sleep(settings.BENCHMARK_SKETCH_RELOAD_INTERVAL)
+            await self.load()
+            self.reloads += 1
+
+    def lookup(self, industry: str, size: Optional[str], metric: str) -> Optional[QuantileSketch]:
+        """
+        Peer sketch for a metric with at least BENCHMARK_MIN_SAMPLES samples
+
+        The (industry, size) sketch is preferred, then the industry-wide one.
+        Returns None when neither has enough samples.
+        """
+        size = self.size_key(size)
+        candidates = [(industry, size, metric)] if size else []
+        candidates.append((industry, ALL_SIZES, metric))
+        for key in candidates:
+            sketch = self._sketches.get(key)
+            if sketch is not None and sketch.count >= settings.BENCHMARK_MIN_SAMPLES:
+                return sketch
+        return None
+
+    def snapshot(self, industries: Iterable[str]) -> "BenchmarkSketches":
+        """Copy holding only the given industries' sketches, for worker processes"""
+        industries = set(industries)
+        copy = BenchmarkSketches()
+        copy._sketches = {key: sketch for key, sketch in self._sketches.items() if key[0] in industries}
+        copy.loaded = self.loaded
+        return copy
+
+    def stats(self) -> Dict[str, Any]:
+        """Sketch counts and the number of analyses they cover"""
+        # Every analysis adds one sample to each metric's industry-wide sketch
+        first_metric = next(iter(KEY_METRICS))
+        return {
+            'loaded': self.loaded,
+            'sketches': len(self._sketches),
+            'analyses': sum(
+                sketch.count for (_, size, metric), sketch in self._sketches.items()
+                if size == ALL_SIZES and metric == first_metric
+            ),
+            'updates': self.updates,
+            'reloads': self.reloads
+        }
+
+benchmark_sketches = BenchmarkSketches()
@@ -1,6 +1,28 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence, Union
+import secrets
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
+from services.vector_ops import round_half_even, ArrayLike
+from services.industry_profiles import get_profile
+
+# Percentile bands reported by the simulation
+PERCENTILES = (5, 50, 95)
+
+# Cash flow components as multiples of projected net income / revenue
+OPERATING_CASH_FACTOR = 1.2  # Add back non-cash expenses
+INVESTING_CASH_FACTOR = 0.05  # Assume 5% reinvestment
+FINANCING_CASH_FACTOR = 0.02  # Assume some debt servicing
+
+# Monthly series in a projection, in serialization order
+PROJECTION_FIELDS = (
+    'revenue',
+    'net_income',
+    'operating_cash_flow',
+    'investing_cash_flow',
+    'financing_cash_flow',
+    'net_cash_flow',
+    'cumulative_cash'
+)
 
 class CashFlowForecaster:
     """Financial forecasting and cash flow projection service"""
@@ -27,140 +49,344 @@ class CashFlowForecaster:
         """
         revenue = financial_data.get('revenue', 0)
         net_income = financial_data.get('net_income', 0)
-        current_assets = financial_data.get('current_assets', 0)
-        current_liabilities = financial_data.get('current_liabilities', 0)
         
         # Calculate monthly averages
         monthly_revenue = revenue / 12
         monthly_net_income = net_income / 12
         
-        # Generate forecast
-        forecast = {
-            'forecast_period': f"{months} months",
-            'monthly_projections': CashFlowForecaster._generate_monthly_projections(
-                monthly_revenue,
-                monthly_net_income,
-                industry,
-                months
-            ),
-            'summary': {},
-            'working_capital_recommendations': []
-        }
-        
-        # Calculate summary
-        total_projected_revenue = sum([m['revenue'] for m in forecast['monthly_projections']])
-        total_projected_income = sum([m['net_income'] for m in forecast['monthly_projections']])
-        
-        forecast['summary'] = {
-            'total_projected_revenue': round(total_projected_revenue, 2),
-            'total_projected_net_income': round(total_projected_income, 2),
-            'average_monthly_revenue': round(total_projected_revenue / months, 2),
-            'average_monthly_net_income': round(total_projected_income / months, 2),
-            'growth_rate': CashFlowForecaster._calculate_growth_rate(industry)
-        }
-        
-        # Working capital recommendations
-        forecast['working_capital_recommendations'] = CashFlowForecaster._generate_wc_recommendations(
+        start = datetime.now()
+        projection = CashFlowForecaster.project(monthly_revenue, monthly_net_income, industry, months, start.month)
+        return CashFlowForecaster.build_forecast(
+            projection,
+            0,
+            CashFlowForecaster.month_labels(months, start),
             metrics,
-            forecast['monthly_projections']
+            industry,
+            months
         )
-        
-        return forecast
     
     @staticmethod
-    def _generate_monthly_projections(
+    def project(
+        base_monthly_revenue: ArrayLike,
+        base_monthly_income: ArrayLike,
+        industries: Union[str, Sequence[str]],
+        months: int,
+        start_month: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Month-by-month projections for one or many businesses
+
+        Growth and seasonality form one factor matrix, every cash flow
+        component is a single array operation on it and cumulative cash is
+        a running sum, so the cost is linear in businesses x months.
+
+        Args:
+            base_monthly_revenue: Starting monthly revenue, scalar or one per business
+            base_monthly_income: Starting monthly net income, scalar or one per business
+            industries: One industry for all businesses, or one per business
+            months: Number of months to project
+            start_month: Calendar month of the first projected month (defaults to this month)
+
+        Returns:
+            PROJECTION_FIELDS -> (businesses, months) arrays rounded to 2 decimals
+        """
+        revenue_base = np.atleast_1d(np.asarray(base_monthly_revenue, dtype=float))
+        income_base = np.atleast_1d(np.asarray(base_monthly_income, dtype=float))
+        revenue_base, income_base = np.broadcast_arrays(revenue_base, income_base)
+        count = len(revenue_base)
+        if isinstance(industries, str):
+            industries = [industries] * count
+        if len(industries) != count:
+            raise ValueError(f"Expected {count} industries, got {len(industries)}")
+        start_month = start_month or datetime.now().month
+
+        # One lookup per distinct industry, then gathered per business
+        keys, rows = np.unique(np.asarray(industries, dtype=str), return_inverse=True)
+        profiles = [get_profile(key) for key in keys]
+        monthly_growth = np.array([profile.growth_rate for profile in profiles])[rows] / 12
+        seasonality = np.stack([profile.seasonality_for(start_month, months) for profile in profiles])[rows]
+
+        steps = np.arange(months, dtype=float)
+        growth = 1 + monthly_growth[:, None] * steps
+
+        # Same operation order as the per-month formula, so values are bit-identical
+        revenue = revenue_base[:, None] * growth * seasonality
+        net_income = income_base[:, None] * growth * seasonality
+        return CashFlowForecaster.project_series(revenue, net_income)
+
+    @staticmethod
+    def project_series(revenue: np.ndarray, net_income: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Cash flow projection from monthly revenue and net income
+
+        Args:
+            revenue: (businesses, months) projected revenue
+            net_income: (businesses, months) projected net income
+
+        Returns:
+            PROJECTION_FIELDS -> (businesses, months) arrays rounded to 2 decimals
+        """
+        operating_cash_flow = net_income * OPERATING_CASH_FACTOR
+        investing_cash_flow = -revenue * INVESTING_CASH_FACTOR
+        financing_cash_flow = revenue * FINANCING_CASH_FACTOR
+        net_cash_flow = operating_cash_flow + investing_cash_flow + financing_cash_flow
+
+        projection = {
+            'revenue': round_half_even(revenue, 2),
+            'net_income': round_half_even(net_income, 2),
+            'operating_cash_flow': round_half_even(operating_cash_flow, 2),
+            'investing_cash_flow': round_half_even(investing_cash_flow, 2),
+            'financing_cash_flow': round_half_even(financing_cash_flow, 2),
+            'net_cash_flow': round_half_even(net_cash_flow, 2)
+        }
+
+        # Cumulative cash: rounded flows of earlier months plus this month's unrounded flow
+        earlier = np.zeros_like(net_cash_flow)
+        earlier[:, 1:] = np.cumsum(projection['net_cash_flow'], axis=1)[:, :-1]
+        projection['cumulative_cash'] = round_half_even(earlier + net_cash_flow, 2)
+        return projection
+
+    @staticmethod
+    def simulate(
         base_monthly_revenue: float,
         base_monthly_income: float,
+        opening_cash: float,
         industry: str,
-        months: int
-    ) -> List[Dict[str, Any]]:
-        """Generate month-by-month projections"""
-        
-        # Industry growth rates and seasonality
-        growth_rates = {
-            'manufacturing': 0.08,  # 8% annual
-            'retail': 0.12,
-            'services': 0.10,
-            'technology': 0.15,
-            'agriculture': 0.06,
-            'ecommerce': 0.18,
-            'logistics': 0.10,
-            'healthcare': 0.09,
-            'hospitality': 0.11,
-            'construction': 0.07
+        months: int,
+        paths: int,
+        seed: Optional[int] = None,
+        start_month: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Simulate cash flow paths
+
+        Revenue follows a geometric random walk whose drift is the industry
+        growth rate, scaled by the seasonality pattern with per-month noise.
+        Net income moves with revenue plus a margin shock (a share of
+        revenue) drawn each month. Cash flow components use the same
+        factors as the deterministic projection.
+
+        Args:
+            base_monthly_revenue: Starting monthly revenue
+            base_monthly_income: Starting monthly net income
+            opening_cash: Cash balance at the start of the forecast
+            industry: Business industry
+            months: Number of months to simulate
+            paths: Number of simulated paths
+            seed: Random seed
+            start_month: Calendar month of the first simulated month (defaults to this month)
+
+        Returns:
+            (paths, months) arrays 'revenue', 'net_income', 'net_cash_flow'
+            and 'cash_balance' (opening cash plus cumulative flow)
+        """
+        profile = get_profile(industry)
+        params = profile.monte_carlo
+        rng = np.random.default_rng(seed)
+        shocks = rng.standard_normal((3, paths, months))
+
+        # Log growth per month, drift matched to the expected annual rate
+        sigma = params['growth_volatility'] / np.sqrt(12)
+        drift = np.log1p(profile.growth_rate) / 12 - 0.5 * sigma ** 2
+        log_growth = drift + sigma * shocks[0]
+        log_growth[:, 0] = 0.0  # The first month is the base month, as in project()
+        growth = np.exp(np.cumsum(log_growth, axis=1))
+
+        pattern = profile.seasonality_for(start_month or datetime.now().month, months)
+        seasonality = pattern * (1 + params['seasonality_noise'] * shocks[1])
+        factor = growth * np.maximum(seasonality, 0)
+
+        revenue = base_monthly_revenue * factor
+        net_income = base_monthly_income * factor + revenue * (params['margin_volatility'] * shocks[2])
+        net_cash_flow = (
+            net_income * OPERATING_CASH_FACTOR
+            - revenue * INVESTING_CASH_FACTOR
+            + revenue * FINANCING_CASH_FACTOR
+        )
+
+        return {
+            'revenue': revenue,
+            'net_income': net_income,
+            'net_cash_flow': net_cash_flow,
+            'cash_balance': opening_cash + np.cumsum(net_cash_flow, axis=1)
         }
-        
-        annual_growth = growth_rates.get(industry.lower(), 0.10)
-        monthly_growth = annual_growth / 12
-        
-        # Seasonality factors (simplified)
-        seasonality = CashFlowForecaster._get_seasonality_factors(industry, months)
-        
-        projections = []
-        current_date = datetime.now()
-        
-        for i in range(months):
-            month_date = current_date + timedelta(days=30 * i)
-            
-            # Apply growth and seasonality
-            revenue = base_monthly_revenue * (1 + monthly_growth * i) * seasonality[i]
-            net_income = base_monthly_income * (1 + monthly_growth * i) * seasonality[i]
-            
-            # Estimate cash flow components
-            operating_cash_flow = net_income * 1.2  # Add back non-cash expenses
-            investing_cash_flow = -revenue * 0.05  # Assume 5% reinvestment
-            financing_cash_flow = revenue * 0.02  # Assume some debt servicing
-            
-            net_cash_flow = operating_cash_flow + investing_cash_flow + financing_cash_flow
-            
-            projections.append({
-                'month': month_date.strftime('%b %Y'),
-                'revenue': round(revenue, 2),
-                'net_income': round(net_income, 2),
-                'operating_cash_flow': round(operating_cash_flow, 2),
-                'investing_cash_flow': round(investing_cash_flow, 2),
-                'financing_cash_flow': round(financing_cash_flow, 2),
-                'net_cash_flow': round(net_cash_flow, 2),
-                'cumulative_cash': round(sum([p.get('net_cash_flow', 0) for p in projections]) + net_cash_flow, 2)
-            })
-        
-        return projections
-    
+
     @staticmethod
-    def _get_seasonality_factors(industry: str, months: int) -> List[float]:
-        """Get seasonality adjustment factors"""
-        
-        # Simplified seasonality patterns
-        patterns = {
-            'retail': [0.9, 0.85, 0.95, 1.0, 1.05, 1.1, 1.15, 1.1, 1.05, 1.1, 1.2, 1.3],  # Peak in holidays
-            'agriculture': [0.8, 0.85, 0.9, 1.1, 1.2, 1.15, 1.1, 1.05, 1.0, 1.1, 1.15, 0.9],  # Harvest seasons
-            'hospitality': [0.85, 0.9, 0.95, 1.05, 1.1, 1.15, 1.2, 1.15, 1.05, 1.0, 0.95, 1.1],  # Tourism peaks
-            'default': [1.0] * 12  # No seasonality
+    def simulate_cash_flow(
+        financial_data: Dict[str, float],
+        metrics: Dict[str, Dict[str, float]],
+        industry: str,
+        months: int = 12,
+        paths: int = 10000,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate a Monte Carlo cash flow forecast
+
+        Args:
+            financial_data: Current financial data
+            metrics: Calculated metrics
+            industry: Business industry
+            months: Number of months to forecast
+            paths: Number of simulated paths
+            seed: Random seed; a random one is drawn (and returned) if omitted
+
+        Returns:
+            Dictionary with P5/P50/P95 bands per month, the probability of
+            negative cash and the expected cash runway
+        """
+        if seed is None:
+            seed = secrets.randbits(32)
+        opening_cash = financial_data.get('cash', 0)
+        start = datetime.now()
+        simulation = CashFlowForecaster.simulate(
+            financial_data.get('revenue', 0) / 12,
+            financial_data.get('net_income', 0) / 12,
+            opening_cash,
+            industry,
+            months,
+            paths,
+            seed,
+            start.month
+        )
+
+        bands = {
+            field: np.round(np.percentile(simulation[field], PERCENTILES, axis=0), 2)
+            for field in ('revenue', 'net_cash_flow', 'cash_balance')
         }
-        
-        pattern = patterns.get(industry.lower(), patterns['default'])
-        
-        # Repeat pattern for multiple years if needed
-        full_pattern = (pattern * ((months // 12) + 1))[:months]
-        
-        return full_pattern
+        negative = simulation['cash_balance'] < 0
+        negative_by_month = negative.mean(axis=0)
+        ever_negative = negative.any(axis=1)
+        # Months of non-negative cash before the first negative month; paths
+        # that never go negative count the full horizon
+        runway = np.where(ever_negative, negative.argmax(axis=1), months)
+        total_revenue = np.percentile(simulation['revenue'].sum(axis=1), PERCENTILES)
+
+        labels = CashFlowForecaster.month_labels(months, start)
+        monthly_projections = []
+        for i, label in enumerate(labels):
+            month = {'month': label}
+            for field, band in bands.items():
+                month[field] = {f"p{p}": float(band[k, i]) for k, p in enumerate(PERCENTILES)}
+            month['probability_negative_cash'] = round(float(negative_by_month[i]), 4)
+            monthly_projections.append(month)
+
+        probability_negative = float(ever_negative.mean())
+        median_path = [{'net_cash_flow': month['net_cash_flow']['p50']} for month in monthly_projections]
+        recommendations = CashFlowForecaster._generate_wc_recommendations(metrics, median_path)
+        if probability_negative >= 0.1:
+            recommendations.insert(0,
+                f"There is a {probability_negative:.0%} chance of cash turning negative within "
+                f"{months} months (expected runway {runway.mean():.1f} months). "
+                "Arrange a standby working capital facility before it is needed"
+            )
+
+        return {
+            'forecast_period': f"{months} months",
+            'mode': 'monte_carlo',
+            'paths': paths,
+            'seed': seed,
+            'monthly_projections': monthly_projections,
+            'summary': {
+                'opening_cash': round(opening_cash, 2),
+                'probability_negative_cash': round(probability_negative, 4),
+                'expected_runway_months': round(float(runway.mean()), 2),
+                'median_runway_months': float(np.median(runway)),
+                'total_projected_revenue': {
+                    f"p{p}": round(float(value), 2) for p, value in zip(PERCENTILES, total_revenue)
+                },
+                'growth_rate': CashFlowForecaster._calculate_growth_rate(industry)
+            },
+            'working_capital_recommendations': recommendations
+        }
+
+    @staticmethod
+    def month_labels(months: int, start: datetime = None) -> List[str]:
+        """Display labels for consecutive calendar months from the start month"""
+        start = start or datetime.now()
+        first = start.year * 12 + start.month - 1
+        return [
+            datetime(ordinal // 12, ordinal % 12 + 1, 1).strftime('%b %Y')
+            for ordinal in range(first, first + months)
+        ]
+
+    @staticmethod
+    def projection_rows(projection: Dict[str, np.ndarray], row: int, labels: List[str]) -> List[Dict[str, Any]]:
+        """Month dicts for one business of a projection"""
+        series = [projection[field][row].tolist() for field in PROJECTION_FIELDS]
+        return [
+            dict(zip(('month',) + PROJECTION_FIELDS, values))
+            for values in zip(labels, *series)
+        ]
+
+    @staticmethod
+    def build_forecast(
+        projection: Dict[str, np.ndarray],
+        row: int,
+        labels: List[str],
+        metrics: Dict[str, Dict[str, float]],
+        industry: str,
+        months: int,
+        growth_rate: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Forecast response for one business of a projection (growth_rate overrides the industry rate)"""
+        monthly_projections = CashFlowForecaster.projection_rows(projection, row, labels)
+        total_projected_revenue = sum(projection['revenue'][row].tolist())
+        total_projected_income = sum(projection['net_income'][row].tolist())
+
+        return {
+            'forecast_period': f"{months} months",
+            'monthly_projections': monthly_projections,
+            'summary': {
+                'total_projected_revenue': round(total_projected_revenue, 2),
+                'total_projected_net_income': round(total_projected_income, 2),
+                'average_monthly_revenue': round(total_projected_revenue / months, 2),
+                'average_monthly_net_income': round(total_projected_income / months, 2),
+                'growth_rate': growth_rate or CashFlowForecaster._calculate_growth_rate(industry)
+            },
+            'working_capital_recommendations': CashFlowForecaster._generate_wc_recommendations(
+                metrics,
+                monthly_projections
+            )
+        }
+
+    @staticmethod
+    def forecast_portfolio(
+        statements: List[Dict[str, float]],
+        metrics: List[Dict[str, Dict[str, float]]],
+        industries: Sequence[str],
+        months: int = 12
+    ) -> List[Dict[str, Any]]:
+        """
+        Forecasts for many businesses from a single projection call
+
+        Args:
+            statements: Financial data per business
+            metrics: Calculated metrics per business
+            industries: Industry per business
+            months: Number of months to forecast
+
+        Returns:
+            One forecast dict per business, as from forecast_cash_flow
+        """
+        start = datetime.now()
+        projection = CashFlowForecaster.project(
+            [s.get('revenue', 0) / 12 for s in statements],
+            [s.get('net_income', 0) / 12 for s in statements],
+            industries,
+            months,
+            start.month
+        )
+        labels = CashFlowForecaster.month_labels(months, start)
+        return [
+            CashFlowForecaster.build_forecast(projection, row, labels, metrics[row], industries[row], months)
+            for row in range(len(statements))
+        ]
     
     @staticmethod
     def _calculate_growth_rate(industry: str) -> str:
         """Get expected annual growth rate for industry"""
-        rates = {
-            'manufacturing': '8%',
-            'retail': '12%',
-            'services': '10%',
-            'technology': '15%',
-            'agriculture': '6%',
-            'ecommerce': '18%',
-            'logistics': '10%',
-            'healthcare': '9%',
-            'hospitality': '11%',
-            'construction': '7%'
-        }
-        return rates.get(industry.lower(), '10%')
+        return get_profile(industry).growth_label
     
     @staticmethod
     def _generate_wc_recommendations(
@@ -1,42 +1,83 @@
+import numpy as np
 import pandas as pd
 import pdfplumber
+import openpyxl
+import itertools
 import io
-from typing import Dict, Any, Optional
+import time
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, BinaryIO, List, Tuple
 from fastapi import UploadFile, HTTPException
+from config.settings import settings
+from services.ledger_aggregator import LedgerAggregator
+from services.header_resolver import header_resolver, COLUMN_MAPPINGS
 import logging
 
 logger = logging.getLogger(__name__)
 
+EXTRACTION_ERROR = (
+    "Could not extract financial data. Please ensure your file contains "
+    "columns like 'Revenue', 'Total Assets', 'Net Income', etc."
+)
+
+# Columns that label the reporting period of each row, in priority order
+PERIOD_COLUMNS = [
+    'period', 'date', 'period_end', 'as_of', 'fiscal_year', 'financial_year',
+    'year', 'quarter', 'month'
+]
+
+# Rows probed per sheet for a header, and columns probed for a label column
+EXCEL_HEADER_SCAN_ROWS = 30
+EXCEL_LABEL_COLUMNS = 3
+
+def extract_page_tables(pdf_bytes: bytes, page_numbers: List[int]) -> List[Tuple[int, list, float]]:
+    """
+    Extract tables from a run of PDF pages (runs in a worker process)
+    
+    Args:
+        pdf_bytes: Raw PDF content; each worker opens its own copy
+        page_numbers: Zero-based page indexes to extract
+        
+    Returns:
+        List of (page index, tables, elapsed ms) in page order
+    """
+    results = []
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        for page_number in page_numbers:
+            start = time.perf_counter()
+            page = pdf.pages[page_number]
+            tables = page.extract_tables()
+            page.close()
+            results.append((page_number, tables, (time.perf_counter() - start) * 1000))
+    return results
+
 class DocumentParser:
     """Multi-format document parser for financial statements"""
     
+    _pdf_pool: Optional[ProcessPoolExecutor] = None
+    
     @staticmethod
-    async def parse_file(file: UploadFile) -> Dict[str, Any]:
+    async def parse_file(file: UploadFile) -> List[Dict[str, Any]]:
         """
         Parse uploaded financial document
         
+        The upload is parsed straight from the buffer Starlette spooled it
+        into (memory below the spool threshold, a temp file above it), so
+        the content is never copied into an extra bytes object.
+        
         Args:
             file: Uploaded file (CSV, XLSX, or PDF)
             
         Returns:
-            Dictionary with parsed financial data
+            One financial statement dict per period, oldest first
         """
         filename = file.filename.lower()
         
         try:
-            content = await file.read()
-            
-            if filename.endswith('.csv'):
-                return DocumentParser._parse_csv(content)
-            elif filename.endswith(('.xlsx', '.xls')):
-                return DocumentParser._parse_excel(content)
-            elif filename.endswith('.pdf'):
-                return DocumentParser._parse_pdf(content)
-            else:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Unsupported file format. Please upload CSV, XLSX, or PDF"
-                )
+            source = file.file
+            source.seek(0)
+            return DocumentParser.parse_buffer(filename, source)
                 
         except HTTPException:
             raise
@@ -45,133 +86,559 @@ class DocumentParser:
             raise HTTPException(status_code=500, detail=f"Error parsing file: {str(e)}")
     
     @staticmethod
-    def _parse_csv(content: bytes) -> Dict[str, Any]:
-        """Parse CSV file"""
+    def parse_buffer(filename: str, source: BinaryIO) -> List[Dict[str, Any]]:
+        """
+        Parse a financial document from a seekable binary file object
+        
+        Args:
+            filename: Original file name, used to pick the parser
+            source: Binary file object positioned at the start of the content
+            
+        Returns:
+            One financial statement dict per period, oldest first
+        """
+        filename = filename.lower()
+        
+        if filename.endswith('.csv'):
+            return DocumentParser._parse_csv(source)
+        elif filename.endswith(('.xlsx', '.xls')):
+            return DocumentParser._parse_excel(source)
+        elif filename.endswith('.pdf'):
+            return DocumentParser._parse_pdf(source)
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail="Unsupported file format. Please upload CSV, XLSX, or PDF"
+            )
+    
+    @staticmethod
+    def get_upload_size(file: UploadFile) -> int:
+        """Size of an uploaded file in bytes, without reading its content"""
+        if file.size is not None:
+            return file.size
+        
+        position = file.file.tell()
+        file.file.seek(0, io.SEEK_END)
+        size = file.file.tell()
+        file.file.seek(position)
+        return size
+    
+    @staticmethod
+    def _parse_csv(source: BinaryIO) -> List[Dict[str, Any]]:
+        """Parse CSV file (ledger and trial balance exports are streamed in chunks)"""
         try:
-            df = pd.read_csv(io.BytesIO(content))
-            return DocumentParser._extract_financial_data(df)
+            layout = LedgerAggregator.detect_layout(source)
+            if layout is not None:
+                logger.info("Detected ledger / trial balance layout. Aggregating in chunks.")
+                statement = LedgerAggregator.aggregate(source, layout)
+                DocumentParser._validate_statement(statement)
+                return [statement]
+            
+            df = pd.read_csv(source)
+            return DocumentParser._extract_financial_periods(df)
         except Exception as e:
             raise Exception(f"CSV parsing error: {str(e)}")
     
     @staticmethod
-    def _parse_excel(content: bytes) -> Dict[str, Any]:
-        """Parse Excel file"""
+    def _parse_excel(source: BinaryIO) -> List[Dict[str, Any]]:
+        """
+        Parse Excel file
+        
+        .xlsx workbooks are streamed with openpyxl in read-only mode: every
+        sheet is probed for a financial header row (wide layout) or a label
+        column (key-value layout), and only the mapped columns or rows are
+        kept. Results from several sheets, e.g. a P&L tab and a balance sheet
+        tab, are merged per period. Legacy .xls files go through pandas.
+        """
         try:
-            df = pd.read_excel(io.BytesIO(content))
-            return DocumentParser._extract_financial_data(df)
+            source.seek(0)
+            is_xlsx = source.read(2) == b'PK'
+            source.seek(0)
+            if not is_xlsx:
+                df = pd.read_excel(source)
+                return DocumentParser._extract_financial_periods(df)
+            
+            workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+            try:
+                sheets = []
+                for worksheet in workbook.worksheets:
+                    df = DocumentParser._read_sheet(worksheet)
+                    if df is None:
+                        continue
+                    try:
+                        sheets.append(DocumentParser._extract_financial_periods(df))
+                        logger.info(f"Read financial data from sheet '{worksheet.title}'")
+                    except Exception as e:
+                        logger.info(f"Skipping sheet '{worksheet.title}': {str(e)}")
+            finally:
+                workbook.close()
+            
+            if not sheets:
+                raise Exception(EXTRACTION_ERROR)
+            return DocumentParser._merge_sheet_periods(sheets)
         except Exception as e:
             raise Exception(f"Excel parsing error: {str(e)}")
     
     @staticmethod
-    def _parse_pdf(content: bytes) -> Dict[str, Any]:
-        """Parse PDF file (extract tables)"""
+    def _read_sheet(worksheet) -> Optional[pd.DataFrame]:
+        """
+        Stream one read-only worksheet into a DataFrame of the mapped cells only
+        
+        Returns:
+            DataFrame in the wide or key-value layout _extract_financial_periods
+            understands, or None if the sheet holds no financial headers
+        """
+        rows = worksheet.iter_rows(values_only=True)
+        preview = []
+        for row in rows:
+            preview.append(row)
+            if len(preview) >= EXCEL_HEADER_SCAN_ROWS:
+                break
+        
+        # Wide layout: the first all-text row whose cells resolve to statement
+        # fields (rows with numbers are data, e.g. key-value line items)
+        for header_index, row in enumerate(preview):
+            if any(cell is not None and not isinstance(cell, str) for cell in row):
+                continue
+            headers = ['' if cell is None else str(cell) for cell in row]
+            normalized = [header.lower().strip().replace(' ', '_') for header in headers]
+            resolution = header_resolver.resolve(normalized)
+            if not resolution:
+                continue
+            
+            keep = sorted(
+                {normalized.index(col) for columns in resolution.values() for col in columns}
+                | {i for i, col in enumerate(normalized) if col in PERIOD_COLUMNS}
+            )
+            body = preview[header_index + 1:]
+            data = [
+                [row[i] if i < len(row) else None for i in keep]
+                for row in itertools.chain(body, rows)
+            ]
+            return pd.DataFrame(data, columns=[headers[i] for i in keep])
+        
+        # Key-value layout: a label column among the first few, keeping only
+        # the header row and the rows whose label resolves
+        for label_index in range(EXCEL_LABEL_COLUMNS):
+            labels = [row[label_index] if label_index < len(row) else None for row in preview]
+            if not header_resolver.resolve('' if label is None else str(label) for label in labels):
+                continue
+            
+            # Header: the first row spanning several cells whose label is not a field
+            header_index = next(
+                (
+                    i for i, row in enumerate(preview)
+                    if sum(cell is not None for cell in row[label_index:]) >= 2
+                    and (label_index >= len(row) or row[label_index] is None
+                         or header_resolver.match(row[label_index]) is None)
+                ),
+                None
+            )
+            if header_index is None:
+                continue
+            header = preview[header_index]
+            width = len(header)
+            data = []
+            for row in itertools.chain(preview[header_index + 1:], rows):
+                label = row[label_index] if label_index < len(row) else None
+                if label is not None and header_resolver.match(label) is not None:
+                    data.append(list(row[label_index:width]) + [None] * (width - len(row)))
+            if not data:
+                continue
+            columns = [
+                f"value_{i}" if cell is None else str(cell)
+                for i, cell in enumerate(header[label_index:width])
+            ]
+            columns[0] = 'label'
+            return pd.DataFrame(data, columns=columns)
+        
+        return None
+    
+    @staticmethod
+    def _merge_sheet_periods(sheets: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Merge per-sheet statements by period
+        
+        Periods are matched on the months they cover, so FY2024 on one sheet
+        and FY 2024 or 2023-24 on another are the same statement; labels
+        that cannot be read are matched ignoring case and separators. The
+        first sheet's label is kept. For each field the first non-zero value
+        across sheets wins. Sheets without period labels (a single unlabeled
+        statement) are merged into the latest period.
+        """
+        if len(sheets) == 1:
+            return sheets[0]
+        
+        unlabeled = [periods[0] for periods in sheets if len(periods) == 1 and periods[0]['period'] is None]
+        statements = [
+            period for periods in sheets
+            if not (len(periods) == 1 and periods[0]['period'] is None)
+            for period in periods
+        ]
+        spans = DocumentParser.period_spans(pd.Series([period['period'] for period in statements], dtype=object))
+        
+        merged: Dict[Any, Dict[str, Any]] = {}
+        for period, start, end in zip(statements, spans['start'], spans['end']):
+            if pd.notna(end):
+                key = (start, end)
+            elif period['period'] is None:
+                key = None
+            else:
+                key = re.sub(r'[\W_]+', ' ', str(period['period'])).strip().lower()
+            target = merged.setdefault(key, {'period': period['period']})
+            for field in COLUMN_MAPPINGS:
+                if not target.get(field):
+                    target[field] = period[field]
+        
+        result = list(merged.values())
+        sort_keys = DocumentParser._period_sort_keys(pd.Series([statement['period'] for statement in result], dtype=object))
+        if len(result) and not sort_keys.isna().any():
+            result = [result[i] for i in np.argsort(sort_keys.to_numpy(), kind='stable')]
+        if not result:
+            result = [{'period': None}]
+        
+        for statement in unlabeled:
+            latest = result[-1]
+            for field in COLUMN_MAPPINGS:
+                if not latest.get(field):
+                    latest[field] = statement[field]
+        
+        for statement in result:
+            for field in COLUMN_MAPPINGS:
+                statement.setdefault(field, 0.0)
+        return [{**{field: statement[field] for field in COLUMN_MAPPINGS}, 'period': statement['period']} for statement in result]
+    
+    @staticmethod
+    def _parse_pdf(source: BinaryIO) -> List[Dict[str, Any]]:
+        """
+        Parse PDF file (extract tables)
+        
+        Pages are extracted lazily and the scan stops at the first table
+        whose header (or first column, for key-value layouts) matches the
+        column mappings. The first PDF_SEQUENTIAL_PAGES pages are scanned
+        in-process; if no match is found there, the remaining pages up to
+        PDF_MAX_PAGES are fanned out to a process pool. If no table
+        matches, the first table found is used as before.
+        """
         try:
-            with pdfplumber.open(io.BytesIO(content)) as pdf:
-                # Extract tables from all pages
-                all_tables = []
-                for page in pdf.pages:
-                    tables = page.extract_tables()
-                    if tables:
-                        all_tables.extend(tables)
+            with pdfplumber.open(source) as pdf:
+                total_pages = len(pdf.pages)
+                page_count = min(total_pages, settings.PDF_MAX_PAGES)
+                if page_count < total_pages:
+                    logger.info(f"PDF has {total_pages} pages; scanning the first {page_count}")
                 
-                if not all_tables:
-                    raise Exception("No tables found in PDF")
+                sequential_count = min(page_count, settings.PDF_SEQUENTIAL_PAGES)
+                remaining = list(range(sequential_count, page_count))
+                if len(remaining) <= settings.PDF_PAGES_PER_TASK or settings.PDF_WORKERS <= 1:
+                    # Not worth a process hop; keep scanning in-process
+                    sequential_count = page_count
+                    remaining = []
                 
-                # Convert first table to DataFrame
-                df = pd.DataFrame(all_tables[0][1:], columns=all_tables[0][0])
-                return DocumentParser._extract_financial_data(df)
+                first_table = None
+                for page_number in range(sequential_count):
+                    start = time.perf_counter()
+                    page = pdf.pages[page_number]
+                    tables = page.extract_tables()
+                    page.close()
+                    DocumentParser._log_page(page_number, page_count, tables, (time.perf_counter() - start) * 1000)
+                    
+                    match, first_table = DocumentParser._select_table(tables, first_table)
+                    if match is not None:
+                        return DocumentParser._table_to_financial_data(match)
+            
+            if remaining:
+                source.seek(0)
+                match, first_table = DocumentParser._scan_pages_parallel(source.read(), remaining, page_count, first_table)
+                if match is not None:
+                    return DocumentParser._table_to_financial_data(match)
+            
+            if first_table is None:
+                raise Exception("No tables found in PDF")
+            
+            # No table matched the mappings; fall back to the first one
+            return DocumentParser._table_to_financial_data(first_table)
                 
         except Exception as e:
             raise Exception(f"PDF parsing error: {str(e)}")
     
     @staticmethod
-    def _extract_financial_data(df: pd.DataFrame) -> Dict[str, Any]:
+    def _scan_pages_parallel(pdf_bytes: bytes, page_numbers: List[int], page_count: int, first_table: Optional[list]) -> Tuple[Optional[list], Optional[list]]:
+        """
+        Extract pages in the process pool, consuming results in page order
+        
+        Returns:
+            (first matching table or None, first table seen or None)
         """
-        Extract financial data from DataFrame using intelligent column mapping
+        pool = DocumentParser._get_pdf_pool()
+        step = max(1, settings.PDF_PAGES_PER_TASK)
+        futures = [
+            pool.submit(extract_page_tables, pdf_bytes, page_numbers[i:i + step])
+            for i in range(0, len(page_numbers), step)
+        ]
+        
+        try:
+            for future in futures:
+                for page_number, tables, elapsed_ms in future.result():
+                    DocumentParser._log_page(page_number, page_count, tables, elapsed_ms)
+                    match, first_table = DocumentParser._select_table(tables, first_table)
+                    if match is not None:
+                        return match, first_table
+        finally:
+            # Later pages are no longer needed once a match is found
+            for future in futures:
+                future.cancel()
+        
+        return None, first_table
+    
+    @staticmethod
+    def _select_table(tables: List[list], first_table: Optional[list]) -> Tuple[Optional[list], Optional[list]]:
+        """Return the first table matching the mappings, tracking the first table seen"""
+        for table in tables:
+            if not table:
+                continue
+            if first_table is None:
+                first_table = table
+            if DocumentParser._table_matches(table):
+                return table, first_table
+        return None, first_table
+    
+    @staticmethod
+    def _table_matches(table: list) -> bool:
+        """Check whether a table's header row or first column names a mapped field"""
+        if header_resolver.resolve(cell or '' for cell in table[0]):
+            return True
+        return bool(header_resolver.resolve(row[0] or '' for row in table[1:] if row))
+    
+    @staticmethod
+    def _table_to_financial_data(table: list) -> List[Dict[str, Any]]:
+        """Convert an extracted table (header row first) to financial data"""
+        df = pd.DataFrame(table[1:], columns=table[0])
+        return DocumentParser._extract_financial_periods(df)
+    
+    @staticmethod
+    def _log_page(page_number: int, page_count: int, tables: List[list], elapsed_ms: float):
+        logger.info(f"PDF page {page_number + 1}/{page_count}: {len(tables)} tables in {elapsed_ms:.1f}ms")
+    
+    @staticmethod
+    def _get_pdf_pool() -> ProcessPoolExecutor:
+        if DocumentParser._pdf_pool is None:
+            DocumentParser._pdf_pool = ProcessPoolExecutor(max_workers=settings.PDF_WORKERS)
+            logger.info(f"PDF process pool started with {settings.PDF_WORKERS} workers")
+        return DocumentParser._pdf_pool
+    
+    @staticmethod
+    def shutdown():
+        """Stop the PDF worker pool"""
+        if DocumentParser._pdf_pool is not None:
+            DocumentParser._pdf_pool.shutdown(wait=False, cancel_futures=True)
+            DocumentParser._pdf_pool = None
+    
+    @staticmethod
+    def _extract_financial_periods(df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Extract one financial statement per period using intelligent column mapping
+        
+        Each mapped field is converted for all rows at once. Rows are periods
+        when the table has a period/date column (wide format) or several value
+        columns headed by periods (long format); otherwise only the first row
+        is used, as before.
         
         Args:
             df: Pandas DataFrame with financial data
             
         Returns:
-            Dictionary with standardized financial metrics
+            List of standardized financial statement dicts with a 'period'
+            label, sorted oldest to latest
         """
-
-        
-        # Column mapping dictionary
-        column_mappings = {
-            'revenue': ['revenue', 'total_revenue', 'sales', 'total_sales', 'income', 'turnover'],
-            'cogs': ['cogs', 'cost_of_goods_sold', 'cost_of_sales', 'direct_costs'],
-            'operating_expenses': ['operating_expenses', 'opex', 'operating_costs', 'expenses'],
-            'net_income': ['net_income', 'net_profit', 'profit', 'earnings', 'net_earnings'],
-            'total_assets': ['total_assets', 'assets'],
-            'current_assets': ['current_assets', 'liquid_assets'],
-            'total_liabilities': ['total_liabilities', 'liabilities'],
-            'current_liabilities': ['current_liabilities', 'short_term_liabilities'],
-            'inventory': ['inventory', 'stock'],
-            'receivables': ['receivables', 'accounts_receivable', 'debtors'],
-            'payables': ['payables', 'accounts_payable', 'creditors'],
-            'cash': ['cash', 'cash_and_equivalents', 'cash_balance']
-        }
-
         # Normalize column names in the original dataframe first
-        df.columns = df.columns.str.lower().str.strip().str.replace(' ', '_')
+        # (the original header text is kept for period labels)
+        headers = df.columns.astype(str).str.strip()
+        df.columns = headers.str.lower().str.replace(' ', '_')
+        unique = ~df.columns.duplicated()
+        df = df.loc[:, unique]
+        headers = headers[unique]
+        period_column = None
+        
+        # Resolved once per distinct header layout (see HeaderResolver)
+        resolution = header_resolver.resolve(df.columns)
 
         # Check for Transpose Scenario (Long Format: Metric in rows, Value in columns)
         # Heuristic: If typical headers are NOT in columns, but ARE in the first column 
-        all_keywords = [kw for key in column_mappings for kw in column_mappings[key]]
-        has_wide_keywords = any(kw in df.columns for kw in all_keywords)
-        
-        if not has_wide_keywords and df.shape[1] >= 2:
+        if not resolution and df.shape[1] >= 2:
             try:
                 # Check first column for keywords
                 first_col_values = df.iloc[:, 0].astype(str).str.lower().str.strip().str.replace(' ', '_')
-                matches = first_col_values.isin(all_keywords).sum()
                 
-                if matches > 0:
+                if header_resolver.resolve(first_col_values):
                     logger.info("Detected Long format (Key-Value rows). Transposing dataframe.")
-                    # Prepare for transpose: Take first two columns, normalize key column
-                    temp_df = df.iloc[:, :2].copy()
-                    temp_df.columns = ['key', 'value']
-                    temp_df['key'] = temp_df['key'].astype(str).str.lower().str.strip().str.replace(' ', '_')
+                    # One value column per period when every value header reads as a period,
+                    # otherwise only the first value column
+                    value_columns = df.columns[1:]
+                    if len(value_columns) < 2 or DocumentParser._period_sort_keys(pd.Series(value_columns)).isna().any():
+                        value_columns = value_columns[:1]
+                    
+                    temp_df = df.loc[:, value_columns].copy()
+                    temp_df.index = first_col_values
                     
-                    # Convert to wide format
                     # Drop duplicates to avoid index errors
-                    temp_df = temp_df.drop_duplicates(subset='key')
+                    temp_df = temp_df[~temp_df.index.duplicated()]
                     
-                    # Set index and transpose
-                    df_transposed = temp_df.set_index('key').T
-                    df_transposed.reset_index(drop=True, inplace=True)
-                    df = df_transposed
+                    # Convert to wide format: one row per value column
+                    df = temp_df.T
+                    if len(value_columns) > 1:
+                        df.insert(0, 'period', headers[1:])
+                        period_column = 'period'
+                    df.reset_index(drop=True, inplace=True)
+                    resolution = header_resolver.resolve(df.columns)
             except Exception as e:
                 logger.warning(f"Attempt to transpose failed: {str(e)}")
         
-        def find_value(field_name: str, mappings: list) -> float:
-            """Find value from DataFrame using column mappings"""
-            for col_name in mappings:
-                if col_name in df.columns:
-                    try:
-                        value = df[col_name].iloc[0] if len(df) > 0 else 0
-                        # Handle string values with currency symbols
-                        if isinstance(value, str):
-                            value = value.replace(',', '').replace('$', '').replace('₹', '').strip()
-                        return float(value)
-                    except (ValueError, TypeError, IndexError):
-                        continue
-            return 0.0
+        if period_column is None:
+            period_column = next((col for col in PERIOD_COLUMNS if col in df.columns), None)
+        if period_column is None:
+            df = df.iloc[:1]
+        
+        # Convert every mapped field for all rows at once; better matches win
+        fields = {}
+        for field in COLUMN_MAPPINGS:
+            values = pd.Series(np.nan, index=df.index)
+            for col_name in resolution.get(field, ()):
+                values = values.fillna(DocumentParser._to_numeric(df[col_name]))
+            fields[field] = values
+        table = pd.DataFrame(fields)
         
-        # Extract all financial metrics
-        financial_data = {
-            field: find_value(field, mappings)
-            for field, mappings in column_mappings.items()
-        }
+        # Drop rows with no financial figures at all (blank lines, notes)
+        table = table[table.notna().any(axis=1)].fillna(0.0)
+        
+        if period_column is not None:
+            labels = DocumentParser._period_labels(df.loc[table.index, period_column])
+            sort_keys = DocumentParser._period_sort_keys(labels)
+            table['period'] = labels.where(labels != '', None)
+            if not sort_keys.isna().any():
+                table = table.iloc[np.argsort(sort_keys.to_numpy(), kind='stable')]
+        else:
+            table['period'] = None
         
         # Validation
-        if financial_data['revenue'] == 0 and financial_data['total_assets'] == 0:
-            raise Exception(
-                "Could not extract financial data. Please ensure your file contains "
-                "columns like 'Revenue', 'Total Assets', 'Net Income', etc."
-            )
+        table = table[(table['revenue'] != 0) | (table['total_assets'] != 0)]
+        if table.empty:
+            raise Exception(EXTRACTION_ERROR)
+        
+        return table.to_dict('records')
+    
+    @staticmethod
+    def _validate_statement(statement: Dict[str, Any]):
+        """Reject statements with neither revenue nor assets"""
+        if statement['revenue'] == 0 and statement['total_assets'] == 0:
+            raise Exception(EXTRACTION_ERROR)
+    
+    @staticmethod
+    def _to_numeric(column: pd.Series) -> pd.Series:
+        """Convert a column to floats, stripping thousands separators and currency symbols"""
+        if pd.api.types.is_numeric_dtype(column):
+            return column.astype(float)
+        cleaned = column.astype(str).str.replace(r'[,$₹\s]', '', regex=True)
+        return pd.to_numeric(cleaned, errors='coerce')
+    
+    @staticmethod
+    def _period_labels(column: pd.Series) -> pd.Series:
+        """Render a period/date column as string labels"""
+        if pd.api.types.is_datetime64_any_dtype(column):
+            return column.dt.strftime('%Y-%m-%d').fillna('')
+        if pd.api.types.is_float_dtype(column) and (column.dropna() % 1 == 0).all():
+            # Years read as floats (2023.0) when the column has blanks
+            return column.map(lambda v: '' if pd.isna(v) else str(int(v)))
+        return column.map(lambda v: '' if pd.isna(v) else str(v).strip())
+    
+    @staticmethod
+    def period_spans(labels: pd.Series) -> pd.DataFrame:
+        """
+        Months covered by each period label
+        
+        Returns:
+            DataFrame with 'start' and 'end' (first and closing month, as
+            year * 12 + month), the number of 'months' covered (NaN where a
+            label cannot be read) and whether the label states its length
+            ('explicit': quarters, years and date ranges). A plain date
+            such as "Mar 2024" reads as its own month, whatever period the
+            statement really covers.
+        """
+        bounds = DocumentParser._period_bounds(labels)
+        return pd.DataFrame({
+            'start': bounds['start'],
+            'end': bounds['end'],
+            'months': bounds['end'] - bounds['start'] + 1,
+            'explicit': bounds['explicit']
+        })
+    
+    @staticmethod
+    def _period_sort_keys(labels: pd.Series) -> pd.Series:
+        """
+        Chronological sort keys for period labels, in months since year 0
+        (NaN where a label cannot be read)
+        
+        Understands dates, date ranges (2024-04-01/2025-03-31), years (2024,
+        2024-Annual), Indian fiscal years (FY2024, 2023-24) and quarters
+        (2024-Q1, Q1 2024, Q1 FY2024). Periods sort at their closing month.
+        """
+        return DocumentParser._period_bounds(labels)['key']
+    
+    @staticmethod
+    def _period_bounds(labels: pd.Series) -> pd.DataFrame:
+        """
+        Sort key, first month, closing month and whether the label states
+        its length, for each period label
+        
+        Months are year * 12 + month. Fiscal years run April to March:
+        FY2024 and 2023-24 both cover Apr 2023 - Mar 2024, and Q1 FY2024 is
+        Apr - Jun 2023. Plain years and quarters are calendar periods.
+        """
+        labels = labels.astype(str).str.strip().str.upper().str.replace('_', ' ')
+        keys = pd.Series(np.nan, index=labels.index)
+        starts = pd.Series(np.nan, index=labels.index)
+        explicit = pd.Series(False, index=labels.index)
+        
+        # Quarters: 2024-Q1, 2024Q1, Q1 2024, Q1-2024, Q1 FY2024
+        quarter = labels.str.extract(r'^(?:(\d{4})\W*Q([1-4])|Q([1-4])\W*(FY)?\W*(\d{4}))$')
+        year = quarter[0].fillna(quarter[4])
+        number = quarter[1].fillna(quarter[2])
+        found = year.notna()
+        fiscal_shift = np.where(quarter[3].notna(), 9, 0)[found.to_numpy()]
+        keys[found] = year[found].astype(int) * 12 + number[found].astype(int) * 3 - fiscal_shift
+        starts[found] = keys[found] - 2
+        explicit[found] = True
+        
+        # Years: 2024 and 2024-Annual are calendar years; FY2024 and 2023-24
+        # style ranges (second year one after the first) are fiscal years
+        # ending in March of their final year
+        fiscal = labels.str.extract(r'^(FY\W*)?(\d{4})(?:\W+(\d{2}|\d{4}))?(?:\W*ANNUAL)?$')
+        first_year = pd.to_numeric(fiscal[1])
+        ranged = fiscal[2].notna()
+        next_year = pd.to_numeric(fiscal[2]) % 100 == (first_year + 1) % 100
+        found = keys.isna() & first_year.notna() & (~ranged | next_year)
+        fiscal_year = fiscal[0].notna() | ranged
+        end_year = first_year + ranged.astype(int)
+        keys[found] = (end_year * 12 + np.where(fiscal_year, 3, 12))[found]
+        starts[found] = keys[found] - 11
+        explicit[found] = True
+        
+        # Date ranges: 2024-04-01/2025-03-31, as written by the ledger aggregator
+        ranges = labels.str.extract(r'^(\d{4}-\d{2}-\d{2})\s*/\s*(\d{4}-\d{2}-\d{2})$')
+        found = keys.isna() & ranges[0].notna()
+        if found.any():
+            first = pd.to_datetime(ranges.loc[found, 0], errors='coerce', format='%Y-%m-%d')
+            last = pd.to_datetime(ranges.loc[found, 1], errors='coerce', format='%Y-%m-%d')
+            keys[found] = last.dt.year * 12 + last.dt.month + last.dt.day / 32
+            starts[found] = first.dt.year * 12 + first.dt.month
+            explicit[found] = keys[found].notna()
+        
+        # Anything else that parses as a date
+        remaining = keys.isna()
+        if remaining.any():
+            dates = pd.to_datetime(labels[remaining], errors='coerce', format='mixed')
+            keys[remaining] = dates.dt.year * 12 + dates.dt.month + dates.dt.day / 32
+            starts[remaining] = dates.dt.year * 12 + dates.dt.month
         
-        return financial_data
+        return pd.DataFrame({'key': keys, 'start': starts, 'end': np.floor(keys), 'explicit': explicit})
 
 document_parser = DocumentParser()
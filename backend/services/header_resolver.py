@@ -0,0 +1,188 @@
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from collections import Counter
+import hashlib
+import re
+import logging
+from config.settings import settings
+from services.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Column mapping dictionary (aliases in priority order per field)
+COLUMN_MAPPINGS = {
+    'revenue': ['revenue', 'total_revenue', 'sales', 'total_sales', 'income', 'turnover'],
+    'cogs': ['cogs', 'cost_of_goods_sold', 'cost_of_sales', 'direct_costs'],
+    'operating_expenses': ['operating_expenses', 'opex', 'operating_costs', 'expenses'],
+    'net_income': ['net_income', 'net_profit', 'profit', 'earnings', 'net_earnings'],
+    'total_assets': ['total_assets', 'assets'],
+    'current_assets': ['current_assets', 'liquid_assets'],
+    'total_liabilities': ['total_liabilities', 'liabilities'],
+    'current_liabilities': ['current_liabilities', 'short_term_liabilities'],
+    'inventory': ['inventory', 'stock'],
+    'receivables': ['receivables', 'accounts_receivable', 'debtors'],
+    'payables': ['payables', 'accounts_payable', 'creditors'],
+    'cash': ['cash', 'cash_and_equivalents', 'cash_balance']
+}
+
+# Currency and unit tokens that do not change what a column holds
+UNIT_TOKENS = frozenset({
+    'inr', 'rs', 'usd', 'amount', 'amt', 'value', 'in', 'lakh', 'lakhs', 'crore', 'crores',
+    'cr', 'mn', 'million', 'thousand', 'thousands', '000', '000s'
+})
+
+# Leading tokens that negate an alias ("Non-current assets" is not current assets)
+NEGATING_TOKENS = frozenset({'non', 'other', 'less'})
+
+# Tokens that join an alias to something else ("Total Liabilities & Equity")
+CONJUNCTION_TOKENS = frozenset({'and', 'or', 'plus'})
+
+# Tokens that may follow a single-word alias without changing its meaning
+# ("Revenue from operations", "Profit after tax", "Sales net")
+QUALIFIER_TOKENS = frozenset({'from', 'after', 'net'})
+
+# Tokens marking a ratio, rate or comparative column derived from a field.
+# A header carrying one outside its alias never resolves by prefix or
+# similarity: "Net Profit Margin %", "Total Assets Turnover", "Net Income
+# Growth %", "Accounts Receivable Days", "Current Liabilities Ratio",
+# "Total Assets (previous year)" and "Cost of Goods Sold %" stay unmapped.
+# '%' normalizes to 'pct'.
+DERIVED_TOKENS = frozenset({
+    'margin', 'ratio', 'turnover', 'growth', 'days', 'pct', 'percent', 'percentage', 'previous', 'prior'
+})
+
+# Minimum trigram Dice similarity for a fuzzy match
+FUZZY_THRESHOLD = 0.8
+
+def normalize_header(name: Any) -> str:
+    """Normalize a header to lowercase underscore-joined tokens without units"""
+    text = str(name).lower().replace('&', ' and ').replace('%', ' pct ')
+    tokens = [token for token in re.split(r'[^0-9a-z]+', text) if token]
+    return '_'.join(token for token in tokens if token not in UNIT_TOKENS)
+
+def _trigrams(text: str) -> frozenset:
+    padded = f"_{text}_"
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+# Compiled once at import: exact alias index, per-alias trigrams and an
+# inverted trigram index used to shortlist fuzzy candidates
+ALIASES: List[Tuple[str, str, int]] = [
+    (normalize_header(alias), field, priority)
+    for field, aliases in COLUMN_MAPPINGS.items()
+    for priority, alias in enumerate(aliases)
+]
+ALIAS_INDEX: Dict[str, Tuple[str, int]] = {alias: (field, priority) for alias, field, priority in ALIASES}
+ALIAS_TRIGRAMS: List[frozenset] = [_trigrams(alias) for alias, _, _ in ALIASES]
+TRIGRAM_INDEX: Dict[str, List[int]] = {}
+for _alias_id, _grams in enumerate(ALIAS_TRIGRAMS):
+    for _gram in _grams:
+        TRIGRAM_INDEX.setdefault(_gram, []).append(_alias_id)
+
+class HeaderResolver:
+    """
+    Maps spreadsheet headers (or key-column labels) to statement fields
+
+    Exact matches come from a normalized alias index; anything else is
+    matched on trigram similarity, or on an alias forming the leading
+    tokens of the header ("Net Profit (after tax)" -> net_profit).
+    Neither applies to ratio or comparative columns (DERIVED_TOKENS).
+    Resolutions are cached by a hash of the full header signature, so
+    repeat uploads of the same export skip matching entirely.
+    """
+
+    def __init__(self):
+        self.cache = LRUCache(maxsize=settings.HEADER_CACHE_SIZE)
+
+    @staticmethod
+    def signature(headers: Iterable[Any]) -> str:
+        """Hash of the ordered header row"""
+        joined = '\x1f'.join(str(header) for header in headers)
+        return hashlib.sha1(joined.encode('utf-8')).hexdigest()
+
+    def resolve(self, headers: Iterable[Any]) -> Dict[str, List[Any]]:
+        """
+        Resolve headers to statement fields
+
+        Args:
+            headers: Column names (or first-column labels) as they appear
+
+        Returns:
+            Field -> matching headers, best first (exact matches in alias
+            priority order, then fuzzy matches by score)
+        """
+        headers = list(headers)
+        key = self.signature(headers)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return {field: list(columns) for field, columns in cached.items()}
+
+        ranked: Dict[str, List[Tuple[Tuple, Any]]] = {}
+        for position, header in enumerate(headers):
+            match = self.match(header)
+            if match is not None:
+                field, rank = match
+                ranked.setdefault(field, []).append(((rank, position), header))
+
+        resolution = {
+            field: tuple(header for _, header in sorted(matches, key=lambda item: item[0]))
+            for field, matches in ranked.items()
+        }
+        self.cache.set(key, resolution)
+        return {field: list(columns) for field, columns in resolution.items()}
+
+    @staticmethod
+    def match(header: Any) -> Optional[Tuple[str, Tuple]]:
+        """
+        Match one header
+
+        Returns:
+            (field, rank) where lower ranks are better, or None
+        """
+        normalized = normalize_header(header)
+        if not normalized:
+            return None
+
+        exact = ALIAS_INDEX.get(normalized)
+        if exact is not None:
+            field, priority = exact
+            return field, (0, priority)
+
+        tokens = normalized.split('_')
+        if tokens[0] in NEGATING_TOKENS:
+            return None
+
+        # Alias as the leading tokens, longest alias first. Single-word
+        # aliases only count before a qualifier ("Income Tax" is not income)
+        # and no alias is followed by a derived-metric token
+        for length in range(len(tokens) - 1, 0, -1):
+            prefix = ALIAS_INDEX.get('_'.join(tokens[:length]))
+            following = tokens[length]
+            if prefix is None or following in CONJUNCTION_TOKENS:
+                continue
+            if DERIVED_TOKENS.intersection(tokens[length:]):
+                continue
+            if length == 1 and following not in QUALIFIER_TOKENS:
+                continue
+            field, priority = prefix
+            return field, (1, -length, priority)
+
+        # Trigram Dice similarity against aliases sharing at least one trigram
+        grams = _trigrams(normalized)
+        shared = Counter(alias_id for gram in grams for alias_id in TRIGRAM_INDEX.get(gram, ()))
+        best_id, best_score = None, 0.0
+        for alias_id, count in shared.items():
+            score = 2 * count / (len(grams) + len(ALIAS_TRIGRAMS[alias_id]))
+            if score > best_score:
+                best_id, best_score = alias_id, score
+
+        if best_id is None or best_score < FUZZY_THRESHOLD:
+            return None
+        alias, field, priority = ALIASES[best_id]
+        if DERIVED_TOKENS.difference(alias.split('_')).intersection(tokens):
+            return None
+        return field, (2, -best_score, priority)
+
+    def stats(self) -> Dict[str, Any]:
+        """Signature cache counters"""
+        return self.cache.stats()
+
+header_resolver = HeaderResolver()
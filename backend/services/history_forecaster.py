@@ -0,0 +1,272 @@
+from typing import Dict, Any, Optional
+import calendar
+import logging
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.settings import settings
+from database.models import BusinessProfile, FinancialStatement, ForecastModelState
+from services.document_parser import DocumentParser
+from services.cash_flow_forecaster import CashFlowForecaster
+from services.financial_analyzer import FinancialAnalyzer
+from services.portfolio_analyzer import STATEMENT_FIELDS
+from services.portfolio_forecaster import PortfolioForecaster
+
+logger = logging.getLogger(__name__)
+
+# Intercept, linear trend and eleven month-of-year effects (January is the baseline)
+FEATURES = 13
+
+# Series fitted per business, in X'y column order
+TARGETS = ('revenue', 'net_income')
+
+STATE_COLUMNS = ('anchor', 'last_period_end', 'periods', 'observations', 'xtx', 'xty')
+
+class HistoryForecaster:
+    """
+    Per-business trend and seasonality model fitted from stored periods
+
+    Each period is spread evenly over the months it covers (3 for a
+    quarter, 12 for a year) and every month becomes one least-squares
+    row [1, t, month dummies] -> (revenue, net income). The model state
+    keeps only the running sums X'X and X'y, so adding a period is a
+    fixed-size rank update and forecasting is one 13x13 solve, however
+    long the history is. Month effects carry a small ridge penalty so
+    annual-only histories fall back to a plain trend.
+    """
+
+    @staticmethod
+    def features(ordinals: np.ndarray, anchor: int) -> np.ndarray:
+        """Design rows for month ordinals (year * 12 + month)"""
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        rows = np.zeros((len(ordinals), FEATURES))
+        rows[:, 0] = 1.0
+        rows[:, 1] = ordinals - anchor
+        month_index = (ordinals - 1) % 12  # 0 = January
+        seasonal = month_index > 0
+        rows[np.flatnonzero(seasonal), 1 + month_index[seasonal]] = 1.0
+        return rows
+
+    @staticmethod
+    def new_state(anchor: int) -> Dict[str, Any]:
+        """Empty model state anchored at a month ordinal"""
+        return {
+            'anchor': anchor,
+            'last_period_end': anchor,
+            'periods': [],
+            'observations': 0,
+            'xtx': np.zeros((FEATURES, FEATURES)).tolist(),
+            'xty': np.zeros((FEATURES, len(TARGETS))).tolist()
+        }
+
+    @staticmethod
+    def update(state: Optional[Dict[str, Any]], statement: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Fold one stored period into a model state
+
+        Args:
+            state: Current state (ForecastModelState column values), or None
+            statement: FinancialStatement column values including 'period'
+
+        Returns:
+            The updated state; the input state unchanged if the period is
+            missing, unreadable or covers any month already included (an
+            annual period and one of its quarters, say)
+        """
+        label = statement.get('period')
+        if not label:
+            return state
+        span = DocumentParser.period_spans(pd.Series([label])).iloc[0]
+        if pd.isna(span['end']):
+            return state
+
+        start, end, months = int(span['start']), int(span['end']), int(span['months'])
+        if state is None:
+            state = HistoryForecaster.new_state(start)
+        if any(start <= included_end and included_start <= end for included_start, included_end in state['periods']):
+            logger.info(f"Period {label} overlaps periods already in the model; skipped")
+            return state
+
+        ordinals = np.arange(start, end + 1)
+        rows = HistoryForecaster.features(ordinals, state['anchor'])
+        monthly = np.array([[statement.get(target) or 0 for target in TARGETS]]) / months
+        targets = np.repeat(monthly, months, axis=0)
+
+        return {
+            'anchor': state['anchor'],
+            'last_period_end': max(state['last_period_end'], end),
+            'periods': state['periods'] + [[start, end]],
+            'observations': state['observations'] + months,
+            'xtx': (np.asarray(state['xtx']) + rows.T @ rows).tolist(),
+            'xty': (np.asarray(state['xty']) + rows.T @ targets).tolist()
+        }
+
+    @staticmethod
+    def solve(state: Dict[str, Any]) -> np.ndarray:
+        """(FEATURES, targets) coefficients from the running sums"""
+        xtx = np.asarray(state['xtx'])
+        xty = np.asarray(state['xty'])
+        penalty = np.zeros(FEATURES)
+        penalty[1] = 1e-9 * max(xtx[1, 1], 1.0)  # Keeps a single-month history solvable
+        penalty[2:] = settings.HISTORY_SEASONAL_RIDGE
+        try:
+            return np.linalg.solve(xtx + np.diag(penalty), xty)
+        except np.linalg.LinAlgError:
+            return np.linalg.lstsq(xtx + np.diag(penalty), xty, rcond=None)[0]
+
+    @staticmethod
+    def month_label(ordinal: int) -> str:
+        """Display label for a month ordinal"""
+        year, month = divmod(ordinal - 1, 12)
+        return f"{calendar.month_abbr[month + 1]} {year}"
+
+    @staticmethod
+    def predict(state: Dict[str, Any], months: int) -> Dict[str, Any]:
+        """
+        Monthly revenue and net income after the last observed period
+
+        Returns:
+            Dictionary with 'labels', 'revenue' and 'net_income' (arrays of
+            `months` values) and the fitted 'annual_growth' of revenue
+        """
+        if len(state['periods']) < settings.HISTORY_MIN_PERIODS:
+            raise ValueError(
+                f"History forecasts need at least {settings.HISTORY_MIN_PERIODS} stored periods, "
+                f"found {len(state['periods'])}"
+            )
+
+        coefficients = HistoryForecaster.solve(state)
+        ordinals = np.arange(state['last_period_end'] + 1, state['last_period_end'] + 1 + months)
+        fitted = HistoryForecaster.features(ordinals, state['anchor']) @ coefficients
+
+        # A year of trend relative to the deseasonalized level at the forecast start
+        level = coefficients[0, 0] + coefficients[1, 0] * (ordinals[0] - state['anchor'])
+        annual_growth = coefficients[1, 0] * 12 / level if level > 0 else 0.0
+
+        return {
+            'labels': [HistoryForecaster.month_label(int(ordinal)) for ordinal in ordinals],
+            'revenue': np.maximum(fitted[:, 0], 0),
+            'net_income': fitted[:, 1],
+            'annual_growth': float(annual_growth)
+        }
+
+    @staticmethod
+    def forecast(
+        state: Dict[str, Any],
+        metrics: Dict[str, Dict[str, float]],
+        industry: str,
+        months: int = 12
+    ) -> Dict[str, Any]:
+        """
+        Cash flow forecast from a business's fitted history
+
+        Args:
+            state: ForecastModelState column values
+            metrics: Calculated metrics of the latest statement
+            industry: Business industry
+            months: Number of months to forecast
+
+        Returns:
+            Forecast dict as from CashFlowForecaster.forecast_cash_flow, with
+            the fitted growth rate and a 'model' summary
+        """
+        prediction = HistoryForecaster.predict(state, months)
+        projection = CashFlowForecaster.project_series(
+            prediction['revenue'][None, :],
+            prediction['net_income'][None, :]
+        )
+        forecast = CashFlowForecaster.build_forecast(
+            projection,
+            0,
+            prediction['labels'],
+            metrics,
+            industry,
+            months,
+            growth_rate=f"{prediction['annual_growth'] * 100:.0f}%"
+        )
+        forecast['mode'] = 'history'
+        forecast['model'] = {
+            'periods': len(state['periods']),
+            'observations': state['observations'],
+            'last_period': HistoryForecaster.month_label(state['last_period_end'])
+        }
+        return forecast
+
+    @staticmethod
+    async def add_period(db: AsyncSession, business_id: int, statement: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Store a new period for a business and fold it into its model state
+
+        Only the new period's rows are added to the stored sums; earlier
+        periods are never re-read.
+
+        Args:
+            db: Async database session
+            business_id: Existing business profile id
+            statement: FinancialStatement column values including 'period'
+
+        Returns:
+            Summary of the stored statement and state, or None if the
+            business does not exist
+        """
+        business = await db.get(BusinessProfile, business_id)
+        if business is None:
+            return None
+
+        row = await db.get(ForecastModelState, business_id, with_for_update=True)
+        current = None
+        if row is not None:
+            current = {column: getattr(row, column) for column in STATE_COLUMNS}
+
+        state = HistoryForecaster.update(current, statement)
+        if state is not current:
+            if row is None:
+                row = ForecastModelState(business_id=business_id)
+                db.add(row)
+            for column in STATE_COLUMNS:
+                setattr(row, column, state[column])
+
+        stored = FinancialStatement(business_id=business_id, **statement)
+        db.add(stored)
+        await db.commit()
+
+        return {
+            'business_id': business_id,
+            'statement_id': stored.id,
+            'included': state is not current,
+            'periods': len(state['periods']) if state else 0,
+            'observations': state['observations'] if state else 0
+        }
+
+    @staticmethod
+    async def forecast_business(db: AsyncSession, business_id: int, months: int = 12) -> Optional[Dict[str, Any]]:
+        """
+        History forecast for a stored business
+
+        Metrics come from the latest statement by period end (see
+        PortfolioForecaster.latest), so a backfilled older period does not
+        replace the current one.
+
+        Returns:
+            Forecast dict (see forecast), or None if the business has no
+            model state
+        """
+        row = await db.get(ForecastModelState, business_id)
+        if row is None:
+            return None
+        business = await db.get(BusinessProfile, business_id)
+        result = await db.execute(
+            select(FinancialStatement.business_id, FinancialStatement.id, FinancialStatement.period)
+            .where(FinancialStatement.business_id == business_id)
+        )
+        statements = pd.DataFrame(result.all(), columns=['business_id', 'id', 'period'])
+        latest = await db.get(FinancialStatement, int(PortfolioForecaster.latest(statements)['id'].iloc[0]))
+
+        metrics = FinancialAnalyzer.calculate_all_metrics(
+            {field: getattr(latest, field) or 0 for field in STATEMENT_FIELDS}
+        )
+        state = {column: getattr(row, column) for column in STATE_COLUMNS}
+        return HistoryForecaster.forecast(state, metrics, business.industry.value, months)
+
+history_forecaster = HistoryForecaster()
@@ -1,59 +1,56 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Mapping, Sequence, Union
+import numpy as np
 from database.models import Industry
+from services.industry_profiles import INDUSTRY_PROFILES, BENCHMARK_LEVELS, get_profile
+from services.benchmark_sketches import (
+    BenchmarkSketches,
+    benchmark_sketches,
+    KEY_METRICS,
+    LOWER_IS_BETTER
+)
+from services.vector_ops import round_half_even
+
+METRIC_NAMES = tuple(KEY_METRICS)
+
+# Performance level and percentile by number of static thresholds met
+PERFORMANCE_LEVELS = ('Poor', 'Below Average', 'Average', 'Good', 'Excellent')
+STATIC_PERCENTILES = np.array([10, 30, 50, 70, 90])
+
+# Percentile bands between levels, for peer ranks and the overall rank
+PERCENTILE_BANDS = np.array([20, 40, 60, 80])
+OVERALL_KEYS = ('poor', 'below_average', 'average', 'above_average', 'excellent')
+
+def compile_thresholds(benchmarks: Mapping[str, Mapping[str, float]]) -> np.ndarray:
+    """
+    Ascending (METRIC_NAMES, 4) threshold array for searchsorted
+
+    Rows run poor -> excellent for higher-is-better metrics and
+    excellent -> poor for LOWER_IS_BETTER ones; metrics without a
+    benchmark are NaN rows.
+    """
+    thresholds = np.full((len(METRIC_NAMES), len(BENCHMARK_LEVELS)), np.nan)
+    for i, metric in enumerate(METRIC_NAMES):
+        if metric not in benchmarks:
+            continue
+        levels = BENCHMARK_LEVELS if metric in LOWER_IS_BETTER else BENCHMARK_LEVELS[::-1]
+        row = np.array([benchmarks[metric][level] for level in levels])
+        if np.any(np.diff(row) < 0):
+            raise ValueError(f"Benchmark '{metric}' thresholds are not ordered from {levels[0]} to {levels[-1]}")
+        thresholds[i] = row
+    thresholds.setflags(write=False)
+    return thresholds
+
+# Compiled once per profile key; unknown industries use the default profile's
+THRESHOLDS = {key: compile_thresholds(profile.benchmarks) for key, profile in INDUSTRY_PROFILES.items()}
 
 class IndustryBenchmark:
     """Industry benchmarking service with standard metrics"""
     
-    # Industry benchmark data (typical ranges for healthy businesses)
+    # Industry benchmark data (typical ranges for healthy businesses), from the profile registry
     BENCHMARKS = {
-        Industry.MANUFACTURING: {
-            'current_ratio': {'excellent': 2.0, 'good': 1.5, 'average': 1.2, 'poor': 0.8},
-            'quick_ratio': {'excellent': 1.5, 'good': 1.0, 'average': 0.8, 'poor': 0.5},
-            'net_profit_margin': {'excellent': 15.0, 'good': 10.0, 'average': 5.0, 'poor': 2.0},
-            'debt_to_equity': {'excellent': 0.5, 'good': 1.0, 'average': 1.5, 'poor': 2.5},
-            'asset_turnover': {'excellent': 2.0, 'good': 1.5, 'average': 1.0, 'poor': 0.5},
-            'return_on_equity': {'excellent': 20.0, 'good': 15.0, 'average': 10.0, 'poor': 5.0}
-        },
-        Industry.RETAIL: {
-            'current_ratio': {'excellent': 2.5, 'good': 2.0, 'average': 1.5, 'poor': 1.0},
-            'quick_ratio': {'excellent': 1.0, 'good': 0.8, 'average': 0.5, 'poor': 0.3},
-            'net_profit_margin': {'excellent': 10.0, 'good': 6.0, 'average': 3.0, 'poor': 1.0},
-            'debt_to_equity': {'excellent': 0.3, 'good': 0.7, 'average': 1.2, 'poor': 2.0},
-            'asset_turnover': {'excellent': 3.0, 'good': 2.5, 'average': 2.0, 'poor': 1.0},
-            'return_on_equity': {'excellent': 25.0, 'good': 18.0, 'average': 12.0, 'poor': 6.0}
-        },
-        Industry.SERVICES: {
-            'current_ratio': {'excellent': 2.0, 'good': 1.5, 'average': 1.2, 'poor': 0.9},
-            'quick_ratio': {'excellent': 1.8, 'good': 1.3, 'average': 1.0, 'poor': 0.7},
-            'net_profit_margin': {'excellent': 20.0, 'good': 15.0, 'average': 10.0, 'poor': 5.0},
-            'debt_to_equity': {'excellent': 0.4, 'good': 0.8, 'average': 1.3, 'poor': 2.0},
-            'asset_turnover': {'excellent': 2.5, 'good': 2.0, 'average': 1.5, 'poor': 0.8},
-            'return_on_equity': {'excellent': 30.0, 'good': 22.0, 'average': 15.0, 'poor': 8.0}
-        },
-        Industry.TECHNOLOGY: {
-            'current_ratio': {'excellent': 3.0, 'good': 2.5, 'average': 2.0, 'poor': 1.5},
-            'quick_ratio': {'excellent': 2.5, 'good': 2.0, 'average': 1.5, 'poor': 1.0},
-            'net_profit_margin': {'excellent': 25.0, 'good': 18.0, 'average': 12.0, 'poor': 5.0},
-            'debt_to_equity': {'excellent': 0.2, 'good': 0.5, 'average': 0.9, 'poor': 1.5},
-            'asset_turnover': {'excellent': 1.8, 'good': 1.4, 'average': 1.0, 'poor': 0.6},
-            'return_on_equity': {'excellent': 35.0, 'good': 25.0, 'average': 18.0, 'poor': 10.0}
-        },
-        Industry.AGRICULTURE: {
-            'current_ratio': {'excellent': 1.8, 'good': 1.4, 'average': 1.1, 'poor': 0.8},
-            'quick_ratio': {'excellent': 1.2, 'good': 0.9, 'average': 0.6, 'poor': 0.4},
-            'net_profit_margin': {'excellent': 12.0, 'good': 8.0, 'average': 5.0, 'poor': 2.0},
-            'debt_to_equity': {'excellent': 0.6, 'good': 1.2, 'average': 1.8, 'poor': 2.5},
-            'asset_turnover': {'excellent': 1.5, 'good': 1.2, 'average': 0.9, 'poor': 0.5},
-            'return_on_equity': {'excellent': 18.0, 'good': 12.0, 'average': 8.0, 'poor': 4.0}
-        },
-        Industry.ECOMMERCE: {
-            'current_ratio': {'excellent': 2.2, 'good': 1.8, 'average': 1.4, 'poor': 1.0},
-            'quick_ratio': {'excellent': 1.5, 'good': 1.2, 'average': 0.9, 'poor': 0.6},
-            'net_profit_margin': {'excellent': 15.0, 'good': 10.0, 'average': 6.0, 'poor': 2.0},
-            'debt_to_equity': {'excellent': 0.4, 'good': 0.9, 'average': 1.4, 'poor': 2.0},
-            'asset_turnover': {'excellent': 2.8, 'good': 2.2, 'average': 1.6, 'poor': 1.0},
-            'return_on_equity': {'excellent': 28.0, 'good': 20.0, 'average': 14.0, 'poor': 7.0}
-        }
+        Industry(key): profile.benchmarks
+        for key, profile in INDUSTRY_PROFILES.items()
+        if key in Industry._value2member_map_
     }
     
     TEMPLATES = {
@@ -80,120 +77,159 @@ class IndustryBenchmark:
         }
     }
     
+    # Overall performance templates per language, ordered like OVERALL_KEYS
+    OVERALL_TEMPLATES = {
+        language: [templates[key] for key in OVERALL_KEYS]
+        for language, templates in TEMPLATES.items()
+    }
+    
     @staticmethod
     def get_benchmark_comparison(
         metrics: Dict[str, Dict[str, float]],
         industry: str,
-        language: str = 'en'
+        language: str = 'en',
+        size: Optional[str] = None,
+        peers: Optional[BenchmarkSketches] = None
     ) -> Dict[str, Any]:
         """
         Compare business metrics against industry benchmarks
         
+        Metrics are ranked against the stored analyses of peers in the same
+        industry (and size, when given and well populated) once there are
+        at least BENCHMARK_MIN_SAMPLES of them; otherwise against the
+        static industry thresholds.
+        
         Args:
             metrics: Calculated financial metrics
             industry: Business industry
             language: Translation language
+            size: Business size, for size-specific peers
+            peers: Peer sketches (defaults to the process-wide registry)
             
         Returns:
             Dictionary with benchmark comparison data
         """
-        # Default to services if industry not found
-        industry_enum = Industry.SERVICES
-        try:
-            industry_enum = Industry(industry.lower())
-        except ValueError:
-            pass
+        return IndustryBenchmark.compare_many([metrics], [industry], language, [size], peers)[0]
+    
+    @staticmethod
+    def compare_many(
+        metrics: Sequence[Dict[str, Dict[str, float]]],
+        industries: Sequence[str],
+        language: Union[str, Sequence[str]] = 'en',
+        sizes: Optional[Sequence[Optional[str]]] = None,
+        peers: Optional[BenchmarkSketches] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Benchmark comparisons for many businesses at once
         
-        benchmarks = IndustryBenchmark.BENCHMARKS.get(
-            industry_enum,
-            IndustryBenchmark.BENCHMARKS[Industry.SERVICES]
-        )
+        Metric values form one (businesses, metrics) array. Businesses are
+        grouped by industry and size, and each metric column of a group is
+        classified in one call: np.searchsorted against the compiled static
+        thresholds, or QuantileSketch.ranks against peers. Results match
+        get_benchmark_comparison item by item.
         
-        comparison = {
-            'industry': industry,
-            'metrics_comparison': {},
-            'overall_performance': '',
-            'percentile_rank': 0
-        }
+        Args:
+            metrics: Calculated financial metrics per business
+            industries: Industry per business
+            language: Translation language, for all or per business
+            sizes: Business size per business
+            peers: Peer sketches (defaults to the process-wide registry)
+            
+        Returns:
+            One comparison dict per business, in input order
+        """
+        peers = benchmark_sketches if peers is None else peers
+        count = len(metrics)
+        if len(industries) != count:
+            raise ValueError(f"Expected {count} industries, got {len(industries)}")
+        sizes = [None] * count if sizes is None else sizes
+        if len(sizes) != count:
+            raise ValueError(f"Expected {count} sizes, got {len(sizes)}")
+        languages = [language] * count if isinstance(language, str) else language
         
-        # Compare key metrics
-        key_metrics = {
-            'current_ratio': metrics['liquidity']['current_ratio'],
-            'quick_ratio': metrics['liquidity']['quick_ratio'],
-            'net_profit_margin': metrics['profitability']['net_profit_margin'],
-            'debt_to_equity': metrics['leverage']['debt_to_equity'],
-            'asset_turnover': metrics['efficiency']['asset_turnover'],
-            'return_on_equity': metrics['profitability']['return_on_equity']
-        }
+        raw = [[m[category][field] for category, field in KEY_METRICS.values()] for m in metrics]
+        values = np.array(raw, dtype=float).reshape(count, len(METRIC_NAMES))
         
-        total_score = 0
-        for metric_name, metric_value in key_metrics.items():
-            if metric_name in benchmarks:
-                benchmark = benchmarks[metric_name]
-                performance = IndustryBenchmark._assess_performance(
-                    metric_value,
-                    benchmark,
-                    metric_name
-                )
-                comparison['metrics_comparison'][metric_name] = {
-                    'value': metric_value,
-                    'industry_average': benchmark['average'],
-                    'industry_excellent': benchmark['excellent'],
-                    'performance': performance['level'],
-                    'percentile': performance['percentile']
-                }
-                total_score += performance['percentile']
+        percentiles = np.zeros(values.shape, dtype=np.int64)
+        levels = np.zeros(values.shape, dtype=np.int64)
+        covered = np.zeros(values.shape, dtype=bool)
+        # Per (group, metric): industry average, industry excellent, source, sample size
+        references = {}
         
-        # Calculate overall percentile
-        comparison['percentile_rank'] = round(total_score / len(key_metrics))
+        groups = {}
+        for row, (industry, size) in enumerate(zip(industries, sizes)):
+            groups.setdefault((industry, BenchmarkSketches.size_key(size)), []).append(row)
         
-        # Determine overall performance
-        templates = IndustryBenchmark.TEMPLATES.get(language, IndustryBenchmark.TEMPLATES['en'])
+        for (industry, size), rows in groups.items():
+            rows = np.asarray(rows)
+            profile = get_profile(industry)
+            thresholds = THRESHOLDS[profile.key]
+            for j, metric in enumerate(METRIC_NAMES):
+                column = values[rows, j]
+                lower_is_better = metric in LOWER_IS_BETTER
+                sketch = peers.lookup(industry, size, metric)
+                if sketch is not None:
+                    ranks = sketch.ranks(column)
+                    percentile = np.rint(100 - ranks if lower_is_better else ranks).astype(np.int64)
+                    percentiles[rows, j] = percentile
+                    levels[rows, j] = np.searchsorted(PERCENTILE_BANDS, percentile, side='right')
+                    references[(industry, size, j)] = (
+                        round(sketch.quantile(50), 2),
+                        round(sketch.quantile(20 if lower_is_better else 80), 2),
+                        'peers',
+                        sketch.count
+                    )
+                elif not np.isnan(thresholds[j, 0]):
+                    if lower_is_better:
+                        # Thresholds met: those at or above the value
+                        met = len(BENCHMARK_LEVELS) - np.searchsorted(thresholds[j], column, side='left')
+                    else:
+                        # Thresholds met: those at or below the value
+                        met = np.searchsorted(thresholds[j], column, side='right')
+                    met = np.where(np.isnan(column), 0, met)
+                    percentiles[rows, j] = STATIC_PERCENTILES[met]
+                    levels[rows, j] = met
+                    benchmark = profile.benchmarks[metric]
+                    references[(industry, size, j)] = (benchmark['average'], benchmark['excellent'], 'static', 0)
+                else:
+                    continue
+                covered[rows, j] = True
         
-        if comparison['percentile_rank'] >= 80:
-            comparison['overall_performance'] = templates['excellent']
-        elif comparison['percentile_rank'] >= 60:
-            comparison['overall_performance'] = templates['above_average']
-        elif comparison['percentile_rank'] >= 40:
-            comparison['overall_performance'] = templates['average']
-        elif comparison['percentile_rank'] >= 20:
-            comparison['overall_performance'] = templates['below_average']
-        else:
-            comparison['overall_performance'] = templates['poor']
+        # Overall percentile over all key metrics, then its performance band
+        totals = np.where(covered, percentiles, 0).sum(axis=1)
+        overall = round_half_even(totals / len(METRIC_NAMES)).astype(np.int64)
+        bands = np.searchsorted(PERCENTILE_BANDS, overall, side='right')
         
-        return comparison
-    
-    @staticmethod
-    def _assess_performance(
-        value: float,
-        benchmark: Dict[str, float],
-        metric_name: str
-    ) -> Dict[str, Any]:
-        """Assess performance level for a metric"""
+        percentile_rows = percentiles.tolist()
+        level_rows = levels.tolist()
+        covered_rows = covered.tolist()
+        comparisons = []
+        for row in range(count):
+            industry, size = industries[row], BenchmarkSketches.size_key(sizes[row])
+            metrics_comparison = {}
+            for j, metric in enumerate(METRIC_NAMES):
+                if not covered_rows[row][j]:
+                    continue
+                average, excellent, source, sample_size = references[(industry, size, j)]
+                metrics_comparison[metric] = {
+                    'value': raw[row][j],
+                    'industry_average': average,
+                    'industry_excellent': excellent,
+                    'performance': PERFORMANCE_LEVELS[level_rows[row][j]],
+                    'percentile': percentile_rows[row][j],
+                    'source': source,
+                    'sample_size': sample_size
+                }
+            templates = IndustryBenchmark.OVERALL_TEMPLATES.get(
+                languages[row], IndustryBenchmark.OVERALL_TEMPLATES['en']
+            )
+            comparisons.append({
+                'industry': industry,
+                'metrics_comparison': metrics_comparison,
+                'overall_performance': templates[bands[row]],
+                'percentile_rank': int(overall[row])
+            })
         
-        # For debt_to_equity, lower is better
-        if metric_name == 'debt_to_equity':
-            if value <= benchmark['excellent']:
-                return {'level': 'Excellent', 'percentile': 90}
-            elif value <= benchmark['good']:
-                return {'level': 'Good', 'percentile': 70}
-            elif value <= benchmark['average']:
-                return {'level': 'Average', 'percentile': 50}
-            elif value <= benchmark['poor']:
-                return {'level': 'Below Average', 'percentile': 30}
-            else:
-                return {'level': 'Poor', 'percentile': 10}
-        else:
-            # For other metrics, higher is better
-            if value >= benchmark['excellent']:
-                return {'level': 'Excellent', 'percentile': 90}
-            elif value >= benchmark['good']:
-                return {'level': 'Good', 'percentile': 70}
-            elif value >= benchmark['average']:
-                return {'level': 'Average', 'percentile': 50}
-            elif value >= benchmark['poor']:
-                return {'level': 'Below Average', 'percentile': 30}
-            else:
-                return {'level': 'Poor', 'percentile': 10}
+        return comparisons
 
 industry_benchmark = IndustryBenchmark()
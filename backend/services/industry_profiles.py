@@ -0,0 +1,120 @@
+from typing import Any, Mapping
+from types import MappingProxyType
+import json
+import logging
+import numpy as np
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Longest forecast horizon with precomputed seasonality
+SEASONALITY_HORIZON = 36
+
+DEFAULT_PROFILE = 'default'
+
+BENCHMARK_LEVELS = ('excellent', 'good', 'average', 'poor')
+MONTE_CARLO_KEYS = ('growth_volatility', 'seasonality_noise', 'margin_volatility')
+
+class IndustryProfile:
+    """
+    Immutable per-industry parameters
+
+    Seasonality is stored by calendar month (January first) and
+    precomputed as a read-only (12, SEASONALITY_HORIZON) array whose row
+    m holds the factors of a forecast starting in month m + 1.
+    """
+
+    __slots__ = (
+        'key',
+        'growth_rate',
+        'growth_label',
+        'monthly_pattern',
+        'seasonality',
+        'gst_rate',
+        'benchmarks',
+        'monte_carlo'
+    )
+
+    def __init__(self, key: str, data: Mapping[str, Any]):
+        pattern = np.asarray(data['seasonality'], dtype=float)
+        if pattern.shape != (12,):
+            raise ValueError(f"Industry profile '{key}' needs 12 monthly seasonality factors")
+
+        benchmarks = {}
+        for metric, thresholds in data['benchmarks'].items():
+            missing = [level for level in BENCHMARK_LEVELS if level not in thresholds]
+            if missing:
+                raise ValueError(f"Industry profile '{key}' benchmark '{metric}' lacks {', '.join(missing)}")
+            benchmarks[metric] = MappingProxyType({level: float(thresholds[level]) for level in BENCHMARK_LEVELS})
+
+        monte_carlo = {name: float(data['monte_carlo'][name]) for name in MONTE_CARLO_KEYS}
+
+        steps = np.arange(SEASONALITY_HORIZON)
+        seasonality = pattern[(np.arange(12)[:, None] + steps) % 12]
+        seasonality.setflags(write=False)
+        pattern.setflags(write=False)
+
+        growth_rate = float(data['growth_rate'])
+        for name, value in (
+            ('key', key),
+            ('growth_rate', growth_rate),
+            ('growth_label', f"{growth_rate * 100:.0f}%"),
+            ('monthly_pattern', pattern),
+            ('seasonality', seasonality),
+            ('gst_rate', data['gst_rate']),
+            ('benchmarks', MappingProxyType(benchmarks)),
+            ('monte_carlo', MappingProxyType(monte_carlo))
+        ):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("IndustryProfile is immutable")
+
+    def __repr__(self) -> str:
+        return f"IndustryProfile({self.key!r})"
+
+    def seasonality_for(self, start_month: int, months: int) -> np.ndarray:
+        """
+        Seasonality factors for a forecast
+
+        Args:
+            start_month: Calendar month of the first forecast month (1-12)
+            months: Number of months, up to SEASONALITY_HORIZON
+
+        Returns:
+            Read-only array of `months` factors
+        """
+        if months > SEASONALITY_HORIZON:
+            raise ValueError(f"Seasonality is precomputed for up to {SEASONALITY_HORIZON} months")
+        return self.seasonality[start_month - 1, :months]
+
+def load_profiles(path: str) -> Mapping[str, IndustryProfile]:
+    """
+    Build the profile registry from a JSON file
+
+    Args:
+        path: JSON object of industry key -> profile fields; must include
+            a 'default' profile used for unknown industries
+
+    Returns:
+        Read-only mapping of lowercase industry key -> IndustryProfile
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    profiles = {key.lower(): IndustryProfile(key.lower(), fields) for key, fields in data.items()}
+    if DEFAULT_PROFILE not in profiles:
+        raise ValueError(f"{path} has no '{DEFAULT_PROFILE}' industry profile")
+
+    logger.info(f"Loaded {len(profiles)} industry profiles from {path}")
+    return MappingProxyType(profiles)
+
+# Built once at import; services look profiles up by industry key
+INDUSTRY_PROFILES: Mapping[str, IndustryProfile] = load_profiles(settings.INDUSTRY_PROFILES_PATH)
+
+def get_profile(industry: str) -> IndustryProfile:
+    """Profile for an industry, falling back to the default profile"""
+    profile = INDUSTRY_PROFILES.get(industry)
+    if profile is None:
+        profile = INDUSTRY_PROFILES.get(industry.lower(), INDUSTRY_PROFILES[DEFAULT_PROFILE])
+    return profile
@@ -0,0 +1,320 @@
+from typing import Dict, Any, List, Optional, BinaryIO, Tuple
+import csv
+import re
+import numpy as np
+import pandas as pd
+import logging
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Header names for the columns of a general ledger or trial balance export
+ACCOUNT_NAME_COLUMNS = ['account_name', 'account', 'ledger', 'ledger_name', 'account_head', 'particulars', 'description']
+ACCOUNT_CODE_COLUMNS = ['account_code', 'account_no', 'account_number', 'gl_code', 'gl_account', 'code']
+DEBIT_COLUMNS = ['debit', 'dr', 'debit_amount', 'closing_debit']
+CREDIT_COLUMNS = ['credit', 'cr', 'credit_amount', 'closing_credit']
+AMOUNT_COLUMNS = ['amount', 'balance', 'closing_balance', 'net', 'net_amount']
+SIDE_COLUMNS = ['dr_cr', 'drcr', 'side', 'type']
+DATE_COLUMNS = ['date', 'posting_date', 'transaction_date', 'entry_date']
+
+# Rows searched for the header (exports often start with a title block)
+HEADER_SCAN_ROWS = 20
+HEADER_SCAN_BYTES = 64 * 1024
+
+# Ledger categories. Each maps to the statement fields it adds to and its
+# normal balance side: debit-normal balances are debit - credit,
+# credit-normal balances are credit - debit.
+CATEGORIES = {
+    'cash': (('cash', 'current_assets', 'total_assets'), 'debit'),
+    'receivables': (('receivables', 'current_assets', 'total_assets'), 'debit'),
+    'inventory': (('inventory', 'current_assets', 'total_assets'), 'debit'),
+    'other_current_asset': (('current_assets', 'total_assets'), 'debit'),
+    'fixed_asset': (('total_assets',), 'debit'),
+    'payables': (('payables', 'current_liabilities', 'total_liabilities'), 'credit'),
+    'other_current_liability': (('current_liabilities', 'total_liabilities'), 'credit'),
+    'long_term_liability': (('total_liabilities',), 'credit'),
+    'equity': ((), 'credit'),
+    'revenue': (('revenue',), 'credit'),
+    'cogs': (('cogs',), 'debit'),
+    'operating_expense': (('operating_expenses',), 'debit'),
+    'other_income': ((), 'credit'),
+    'other_expense': ((), 'debit'),
+}
+
+# Account-name keyword rules, most specific first
+NAME_RULES: List[Tuple[str, str]] = [
+    (r'accumulated depreciation|provision for depreciation', 'fixed_asset'),
+    (r'cost of (goods|sales|revenue)|cogs|purchases?\b|direct (cost|material|labou?r|expense)|freight in', 'cogs'),
+    (r'receivable|debtors', 'receivables'),
+    (r'payable|creditors', 'payables'),
+    (r'interest income|other income|dividend income|gain on', 'other_income'),
+    (r'interest|income tax|tax expense|loss on|finance cost', 'other_expense'),
+    (r'bank charges', 'operating_expense'),
+    (r'overdraft|short[ _-]?term (loan|borrowing)|accrued expense|outstanding|gst output|output tax|duties and taxes|tds', 'other_current_liability'),
+    (r'loan|borrowing|debenture|mortgage|bond', 'long_term_liability'),
+    (r'petty cash|cash|bank', 'cash'),
+    (r'inventor|stock|raw material|finished goods|work in progress', 'inventory'),
+    (r'prepaid|advance to|deposit|accrued income|gst input|input tax', 'other_current_asset'),
+    (r'capital|equity|retained earnings|reserve|surplus|drawings|dividend', 'equity'),
+    (r'sales|revenue|turnover|fees earned|service income|income from operations', 'revenue'),
+    (r'salar|wage|rent|utilit|electric|depreciation|amortization|marketing|advertis|insurance|'
+     r'repair|maintenance|office|travel|telephone|internet|software|professional|legal|audit|'
+     r'postage|printing|expense', 'operating_expense'),
+    (r'equipment|machinery|building|property|plant|furniture|fixture|vehicle|land|computer|'
+     r'intangible|goodwill|investment', 'fixed_asset'),
+]
+
+# Chart-of-accounts code ranges by leading digits (first match wins)
+CODE_RULES: List[Tuple[str, str]] = [
+    ('10', 'cash'),
+    ('11', 'receivables'),
+    ('12', 'inventory'),
+    ('13', 'other_current_asset'),
+    ('14', 'other_current_asset'),
+    ('1', 'fixed_asset'),
+    ('20', 'payables'),
+    ('21', 'other_current_liability'),
+    ('22', 'other_current_liability'),
+    ('23', 'other_current_liability'),
+    ('24', 'other_current_liability'),
+    ('2', 'long_term_liability'),
+    ('3', 'equity'),
+    ('4', 'revenue'),
+    ('5', 'cogs'),
+    ('6', 'operating_expense'),
+    ('7', 'operating_expense'),
+    ('8', 'other_income'),
+    ('9', 'other_expense'),
+]
+
+# Categories a code range is broad enough for the account name to refine
+_CODE_REFINABLE = {
+    'fixed_asset': {'cash', 'receivables', 'inventory', 'other_current_asset', 'fixed_asset'},
+    'other_current_asset': {'cash', 'receivables', 'inventory', 'other_current_asset'},
+    'long_term_liability': {'payables', 'other_current_liability', 'long_term_liability'},
+    'other_current_liability': {'payables', 'other_current_liability'},
+    'other_income': {'other_income', 'other_expense'},
+    'other_expense': {'other_income', 'other_expense'},
+}
+
+_NAME_PATTERNS = [(re.compile(pattern), category) for pattern, category in NAME_RULES]
+
+def _normalize(name: Any) -> str:
+    return str(name).lower().strip().replace(' ', '_')
+
+def _first_present(columns: List[str], candidates: List[str]) -> Optional[str]:
+    return next((col for col in candidates if col in columns), None)
+
+class LedgerAggregator:
+    """
+    Streaming aggregation of general-ledger and trial-balance CSV exports
+
+    The file is read in LEDGER_CHUNK_SIZE-row chunks. Each chunk is summed
+    per account, every account is classified once (by chart-of-accounts
+    code range, refined by name keywords) and the balances are added to
+    running statement totals, so memory is bounded by the chunk size and
+    the number of distinct accounts, not by the file size.
+    """
+
+    @staticmethod
+    def detect_layout(source: BinaryIO) -> Optional[Dict[str, Any]]:
+        """
+        Look for a ledger header in the first rows of a CSV
+
+        A ledger header has an account name or code column plus debit and
+        credit columns, or an amount/balance column together with an account
+        code, Dr/Cr or date column. A bare name + amount pair is left to the
+        key-value summary parser.
+
+        Args:
+            source: Seekable binary file object; restored to the start
+
+        Returns:
+            Layout dict (header row and column names) or None if the file
+            is not a ledger
+        """
+        source.seek(0)
+        try:
+            head = source.read(HEADER_SCAN_BYTES).decode('utf-8-sig', errors='replace')
+        finally:
+            source.seek(0)
+
+        lines = head.splitlines()[:HEADER_SCAN_ROWS]
+        for row_number, row in enumerate(csv.reader(lines)):
+            columns = [_normalize(value) for value in row if value.strip()]
+            layout = {
+                'header_row': row_number,
+                'name': _first_present(columns, ACCOUNT_NAME_COLUMNS),
+                'code': _first_present(columns, ACCOUNT_CODE_COLUMNS),
+                'debit': _first_present(columns, DEBIT_COLUMNS),
+                'credit': _first_present(columns, CREDIT_COLUMNS),
+                'amount': _first_present(columns, AMOUNT_COLUMNS),
+                'side': _first_present(columns, SIDE_COLUMNS),
+                'date': _first_present(columns, DATE_COLUMNS)
+            }
+            has_account = layout['name'] or layout['code']
+            has_amounts = (layout['debit'] and layout['credit']) or (
+                layout['amount'] and (layout['code'] or layout['side'] or layout['date'])
+            )
+            if has_account and has_amounts:
+                return layout
+        return None
+
+    @staticmethod
+    def classify_account(name: Optional[str], code: Optional[str]) -> Optional[str]:
+        """
+        Map one account to a ledger category
+
+        The code range decides the category when there is one; the name
+        keywords may refine it within the same part of the balance sheet
+        (e.g. 1xxx "Bank - HDFC" is cash). Without a usable code the name
+        alone decides.
+        """
+        by_name = None
+        if name:
+            lowered = name.lower()
+            by_name = next((category for pattern, category in _NAME_PATTERNS if pattern.search(lowered)), None)
+
+        by_code = None
+        digits = re.sub(r'\D', '', code or '')
+        if len(digits) >= 3:
+            by_code = next((category for prefix, category in CODE_RULES if digits.startswith(prefix)), None)
+
+        if by_code is None:
+            return by_name
+        if by_name in _CODE_REFINABLE.get(by_code, ()):
+            return by_name
+        return by_code
+
+    @staticmethod
+    def aggregate(source: BinaryIO, layout: Dict[str, Any], chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Stream a ledger CSV into a single financial statement
+
+        Args:
+            source: Seekable binary file object
+            layout: Result of detect_layout()
+            chunk_size: Rows per chunk (defaults to LEDGER_CHUNK_SIZE)
+
+        Returns:
+            Financial statement dict (with a period label when the ledger
+            has a date column)
+        """
+        chunk_size = chunk_size or settings.LEDGER_CHUNK_SIZE
+        name_col, code_col = layout['name'], layout['code']
+        account_cols = [col for col in (code_col, name_col) if col]
+
+        # Debit-minus-credit net per category
+        net: Dict[str, float] = {}
+        saw_credit = False
+        categories: Dict[Tuple, Optional[str]] = {}
+        unmapped = 0.0
+        rows = 0
+        first_date = last_date = None
+
+        source.seek(0)
+        reader = pd.read_csv(
+            source,
+            skiprows=layout['header_row'],
+            chunksize=chunk_size,
+            dtype=str,
+            on_bad_lines='skip'
+        )
+
+        for chunk in reader:
+            chunk.columns = [_normalize(col) for col in chunk.columns]
+            rows += len(chunk)
+
+            debit, credit = LedgerAggregator._debit_credit(chunk, layout)
+            saw_credit = saw_credit or bool(credit.any())
+            accounts = chunk[account_cols].fillna('')
+
+            # Sum per account first; accounts repeat heavily in a ledger
+            summed = pd.DataFrame({'debit': debit, 'credit': credit}).groupby(
+                [accounts[col] for col in account_cols], sort=False
+            ).sum()
+
+            for key, account_debit, account_credit in zip(summed.index, summed['debit'], summed['credit']):
+                key = key if isinstance(key, tuple) else (key,)
+                category = categories.get(key)
+                if key not in categories:
+                    parts = dict(zip(account_cols, key))
+                    category = LedgerAggregator.classify_account(parts.get(name_col), parts.get(code_col))
+                    categories[key] = category
+
+                if category is None:
+                    unmapped += abs(account_debit - account_credit)
+                    continue
+
+                net[category] = net.get(category, 0.0) + float(account_debit - account_credit)
+
+            if layout['date']:
+                dates = pd.to_datetime(chunk[layout['date']], errors='coerce', format='mixed', dayfirst=False).dropna()
+                if not dates.empty:
+                    first_date = min(first_date, dates.min()) if first_date is not None else dates.min()
+                    last_date = max(last_date, dates.max()) if last_date is not None else dates.max()
+
+        # A single unsigned amount column holds balances on each account's
+        # normal side; otherwise credit-normal balances are credit - debit
+        unsigned = not (layout['debit'] and layout['credit']) and not layout['side'] and not saw_credit
+        balances = {
+            category: value if unsigned or CATEGORIES[category][1] == 'debit' else -value
+            for category, value in net.items()
+        }
+        statement = LedgerAggregator._build_statement(balances)
+        statement['period'] = (
+            f"{first_date:%Y-%m-%d}/{last_date:%Y-%m-%d}" if first_date is not None else None
+        )
+
+        unmapped_accounts = sum(1 for category in categories.values() if category is None)
+        logger.info(
+            f"Aggregated ledger of {rows} rows into {len(categories)} accounts "
+            f"({unmapped_accounts} unmapped, {unmapped:,.2f} unmapped balance)"
+        )
+        return statement
+
+    @staticmethod
+    def _debit_credit(chunk: pd.DataFrame, layout: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Debit and credit amounts for each row of a chunk"""
+        def numeric(col: str) -> np.ndarray:
+            cleaned = chunk[col].str.replace(r'[,$₹\s]', '', regex=True)
+            # Accounting negatives: (1,200.00)
+            cleaned = cleaned.str.replace(r'^\((.*)\)$', r'-\1', regex=True)
+            return pd.to_numeric(cleaned, errors='coerce').fillna(0.0).to_numpy()
+
+        if layout['debit'] and layout['credit']:
+            return numeric(layout['debit']), numeric(layout['credit'])
+
+        amount = numeric(layout['amount'])
+        if layout['side']:
+            is_credit = chunk[layout['side']].fillna('').str.strip().str.lower().str.startswith('c').to_numpy()
+            amount = np.where(is_credit, -np.abs(amount), np.abs(amount))
+        # Signed amounts: positive debits, negative credits
+        return np.clip(amount, 0, None), np.clip(-amount, 0, None)
+
+    @staticmethod
+    def _build_statement(balances: Dict[str, float]) -> Dict[str, Any]:
+        """Fold category balances into FinancialStatement fields"""
+        statement = {
+            'revenue': 0.0, 'cogs': 0.0, 'operating_expenses': 0.0, 'net_income': 0.0,
+            'total_assets': 0.0, 'current_assets': 0.0, 'total_liabilities': 0.0,
+            'current_liabilities': 0.0, 'inventory': 0.0, 'receivables': 0.0,
+            'payables': 0.0, 'cash': 0.0
+        }
+        for category, balance in balances.items():
+            for field in CATEGORIES[category][0]:
+                statement[field] += balance
+
+        statement['net_income'] = (
+            statement['revenue'] + balances.get('other_income', 0.0)
+            - statement['cogs'] - statement['operating_expenses'] - balances.get('other_expense', 0.0)
+        )
+
+        # Contra balances can leave a small negative; the schema requires >= 0
+        for field, value in statement.items():
+            if field != 'net_income':
+                statement[field] = round(max(value, 0.0), 2)
+        statement['net_income'] = round(statement['net_income'], 2)
+        return statement
+
+ledger_aggregator = LedgerAggregator()
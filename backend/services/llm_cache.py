@@ -0,0 +1,184 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+import enum
+import hashlib
+import json
+import logging
+from config.settings import settings
+from database.connection import SessionLocal, AsyncSessionLocal
+from database.models import LLMCacheEntry
+from services.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+class LLMCache:
+    """
+    Two-tier cache for LLM-generated insights and recommendations
+
+    Tier 1 is an in-process LRU with TTL. Tier 2 (LLM_CACHE_PERSISTENT) is
+    the llm_cache_entries table on the configured database, so cached
+    completions survive restarts and are shared between workers.
+    """
+
+    # Decimal places financial inputs are rounded to before hashing, so
+    # re-uploads that differ only by float noise share a key
+    KEY_PRECISION = 2
+
+    def __init__(self):
+        self.enabled = settings.LLM_CACHE_ENABLED
+        self.persistent = settings.LLM_CACHE_PERSISTENT
+        self.memory = LRUCache(maxsize=settings.LLM_CACHE_SIZE, ttl=settings.LLM_CACHE_TTL)
+        self.persistent_hits = 0
+        self.persistent_errors = 0
+        self.writes = 0
+
+    @staticmethod
+    def _canonicalize(value: Any) -> Any:
+        """Normalize a payload so equivalent inputs serialize identically"""
+        if isinstance(value, dict):
+            return {str(k): LLMCache._canonicalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [LLMCache._canonicalize(v) for v in value]
+        if isinstance(value, enum.Enum):
+            return value.value
+        if isinstance(value, bool) or value is None or isinstance(value, str):
+            return value
+        if isinstance(value, (int, float)):
+            # 1, 1.0 and 1.004 hash alike; -0.0 collapses to 0.0
+            return round(float(value), LLMCache.KEY_PRECISION) + 0.0
+        return str(value)
+
+    @staticmethod
+    def make_key(kind: str, **inputs: Any) -> str:
+        """
+        Build a canonical cache key
+
+        Args:
+            kind: Completion type, e.g. 'insights' or 'recommendations'
+            inputs: Everything that determines the completion (data, language,
+                model, prompt version, ...)
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        payload = LLMCache._canonicalize({'kind': kind, **inputs})
+        encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """Look a key up in memory, then in the persistent tier"""
+        if not self.enabled:
+            return None
+
+        value = self.memory.get(key)
+        if value is not None or not self.persistent:
+            return value
+
+        value = self._get_persistent(key)
+        if value is not None:
+            self.persistent_hits += 1
+            self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, kind: str, value: List[str]):
+        """Store a completion in every enabled tier"""
+        if not self.enabled:
+            return
+
+        self.memory.set(key, value)
+        self.writes += 1
+        if self.persistent:
+            self._set_persistent(key, kind, value)
+
+    async def get_async(self, key: str) -> Optional[List[str]]:
+        """Like get(), but the persistent tier is queried through the async engine"""
+        if not self.enabled:
+            return None
+
+        value = self.memory.get(key)
+        if value is not None or not self.persistent:
+            return value
+
+        value = await self._get_persistent_async(key)
+        if value is not None:
+            self.persistent_hits += 1
+            self.memory.set(key, value)
+        return value
+
+    async def set_async(self, key: str, kind: str, value: List[str]):
+        """Like set(), but the persistent tier is written through the async engine"""
+        if not self.enabled:
+            return
+
+        self.memory.set(key, value)
+        self.writes += 1
+        if self.persistent:
+            await self._set_persistent_async(key, kind, value)
+
+    def _get_persistent(self, key: str) -> Optional[List[str]]:
+        try:
+            with SessionLocal() as db:
+                entry = db.get(LLMCacheEntry, key)
+                if entry is None:
+                    return None
+                if entry.expires_at is not None and entry.expires_at < datetime.utcnow():
+                    db.delete(entry)
+                    db.commit()
+                    return None
+                return entry.value
+        except Exception as e:
+            self.persistent_errors += 1
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+
+    def _set_persistent(self, key: str, kind: str, value: List[str]):
+        expires_at = datetime.utcnow() + timedelta(seconds=settings.LLM_CACHE_TTL) if settings.LLM_CACHE_TTL else None
+        try:
+            with SessionLocal() as db:
+                db.merge(LLMCacheEntry(cache_key=key, kind=kind, value=value, expires_at=expires_at))
+                db.commit()
+        except Exception as e:
+            self.persistent_errors += 1
+            logger.warning(f"LLM cache write failed: {e}")
+
+    async def _get_persistent_async(self, key: str) -> Optional[List[str]]:
+        try:
+            async with AsyncSessionLocal() as db:
+                entry = await db.get(LLMCacheEntry, key)
+                if entry is None:
+                    return None
+                if entry.expires_at is not None and entry.expires_at < datetime.utcnow():
+                    await db.delete(entry)
+                    await db.commit()
+                    return None
+                return entry.value
+        except Exception as e:
+            self.persistent_errors += 1
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+
+    async def _set_persistent_async(self, key: str, kind: str, value: List[str]):
+        expires_at = datetime.utcnow() + timedelta(seconds=settings.LLM_CACHE_TTL) if settings.LLM_CACHE_TTL else None
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.merge(LLMCacheEntry(cache_key=key, kind=kind, value=value, expires_at=expires_at))
+                await db.commit()
+        except Exception as e:
+            self.persistent_errors += 1
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for both tiers"""
+        memory = self.memory.stats()
+        return {
+            'enabled': self.enabled,
+            'persistent': self.persistent,
+            'memory': memory,
+            'persistent_hits': self.persistent_hits,
+            'persistent_errors': self.persistent_errors,
+            'writes': self.writes,
+            # A persistent hit follows a memory miss, so misses are net of it
+            'misses': memory['misses'] - self.persistent_hits
+        }
+
+llm_cache = LLMCache()
@@ -1,6 +1,8 @@
 from typing import Dict, Any, List, Optional
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from config.settings import settings
+from services.llm_cache import llm_cache
+import asyncio
 import logging
 import json
 
@@ -88,18 +90,99 @@ class OpenAIService:
         }
     }
     
+    # Bump whenever prompts change so cached completions are not reused
+    PROMPT_VERSION = "1"
+    
+    INSIGHTS_SYSTEM_PROMPT = "You are a financial analyst providing insights for SME businesses."
+    RECOMMENDATIONS_SYSTEM_PROMPT = "You are a financial advisor providing actionable recommendations for businesses."
+    
     def __init__(self):
         self.client = None
+        self.async_client = None
         self.enabled = settings.OPENAI_ENABLED
+        self._semaphore = None
+        self._semaphore_loop = None
         
         if self.enabled:
             try:
-                self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+                client_options = {
+                    'api_key': settings.OPENAI_API_KEY,
+                    'base_url': settings.OPENAI_BASE_URL,
+                    'timeout': settings.OPENAI_TIMEOUT,
+                    'max_retries': settings.OPENAI_MAX_RETRIES
+                }
+                self.client = OpenAI(**client_options)
+                # One long-lived async client so HTTP connections are reused across requests
+                self.async_client = AsyncOpenAI(**client_options)
                 logger.info("OpenAI service initialized successfully")
             except Exception as e:
                 logger.warning(f"OpenAI initialization failed: {e}. Falling back to rule-based insights.")
                 self.enabled = False
     
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limiter for in-flight completions, bound to the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
+            self._semaphore_loop = loop
+        return self._semaphore
+    
+    async def aclose(self):
+        """Close pooled connections of the async client"""
+        if self.async_client is not None:
+            await self.async_client.close()
+    
+    def _insights_cache_key(
+        self,
+        financial_data: Dict[str, float],
+        metrics: Dict[str, Dict[str, float]],
+        industry: str,
+        business_type: str,
+        language: str
+    ) -> str:
+        """Cache key covering every input of an insights completion"""
+        return llm_cache.make_key(
+            'insights',
+            financial_data=financial_data,
+            metrics=metrics,
+            industry=industry,
+            business_type=business_type,
+            language=language,
+            model=settings.OPENAI_MODEL,
+            prompt_version=self.PROMPT_VERSION
+        )
+    
+    def _recommendations_cache_key(
+        self,
+        insights: List[str],
+        metrics: Dict[str, Dict[str, float]],
+        risk_level: str,
+        industry: str,
+        language: str
+    ) -> str:
+        """Cache key covering every input of a recommendations completion"""
+        return llm_cache.make_key(
+            'recommendations',
+            insights=insights,
+            metrics=metrics,
+            risk_level=risk_level,
+            industry=industry,
+            language=language,
+            model=settings.OPENAI_MODEL,
+            prompt_version=self.PROMPT_VERSION
+        )
+    
+    @staticmethod
+    def _parse_list_response(content: str) -> List[str]:
+        """Parse a JSON array completion, falling back to the raw text"""
+        content = content.strip()
+        try:
+            parsed = json.loads(content)
+        except json.JSONDecodeError:
+            # If response isn't valid JSON, return as single item
+            return [content]
+        return parsed if isinstance(parsed, list) else [content]
+    
     def generate_insights(
         self,
         financial_data: Dict[str, float],
@@ -110,25 +193,55 @@ class OpenAIService:
     ) -> List[str]:
         """Generate AI-powered financial insights"""
         if self.enabled and self.client:
+            cache_key = self._insights_cache_key(financial_data, metrics, industry, business_type, language)
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
             try:
-                return self._generate_ai_insights(financial_data, metrics, industry, business_type)
+                insights = self._generate_ai_insights(financial_data, metrics, industry, business_type)
             except Exception as e:
                 logger.error(f"OpenAI API error: {e}. Falling back to rule-based insights.")
                 return self._generate_rule_based_insights(financial_data, metrics, industry, language)
+            llm_cache.set(cache_key, 'insights', insights)
+            return insights
         else:
             return self._generate_rule_based_insights(financial_data, metrics, industry, language)
     
-    def _generate_ai_insights(
+    async def generate_insights_async(
         self,
         financial_data: Dict[str, float],
         metrics: Dict[str, Dict[str, float]],
         industry: str,
-        business_type: str
+        business_type: str,
+        language: str = 'en'
     ) -> List[str]:
-        """Generate insights using OpenAI GPT-5.2"""
+        """Generate AI-powered financial insights without blocking the event loop"""
+        if self.enabled and self.async_client:
+            cache_key = self._insights_cache_key(financial_data, metrics, industry, business_type, language)
+            cached = await llm_cache.get_async(cache_key)
+            if cached is not None:
+                return list(cached)
+            try:
+                insights = await self._generate_ai_insights_async(financial_data, metrics, industry, business_type)
+            except Exception as e:
+                logger.error(f"OpenAI API error: {e!r}. Falling back to rule-based insights.")
+                return self._generate_rule_based_insights(financial_data, metrics, industry, language)
+            await llm_cache.set_async(cache_key, 'insights', insights)
+            return insights
+        else:
+            return self._generate_rule_based_insights(financial_data, metrics, industry, language)
+    
+    @staticmethod
+    def _build_insights_prompt(
+        financial_data: Dict[str, float],
+        metrics: Dict[str, Dict[str, float]],
+        industry: str,
+        business_type: str
+    ) -> str:
+        """Build the user prompt for insight generation"""
         # Note: True multilingual support here would require passing language to the prompt
         
-        prompt = f"""You are a financial analyst specializing in SME financial health assessment.
+        return f"""You are a financial analyst specializing in SME financial health assessment.
 
 Business Profile:
 - Industry: {industry}
@@ -150,30 +263,91 @@ Task: Provide 4-6 concise, actionable insights about this business's financial h
 Format: Return ONLY a JSON array of strings, each insight being one sentence. Example:
 ["Insight 1 here", "Insight 2 here", "Insight 3 here"]
 """
+    
+    def _generate_ai_insights(
+        self,
+        financial_data: Dict[str, float],
+        metrics: Dict[str, Dict[str, float]],
+        industry: str,
+        business_type: str
+    ) -> List[str]:
+        """Generate insights using OpenAI GPT-5.2"""
+        prompt = self._build_insights_prompt(financial_data, metrics, industry, business_type)
         
         try:
             response = self.client.chat.completions.create(
                 model=settings.OPENAI_MODEL,
                 messages=[
-                    {"role": "system", "content": "You are a financial analyst providing insights for SME businesses."},
+                    {"role": "system", "content": self.INSIGHTS_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
                 max_tokens=500
             )
             
-            content = response.choices[0].message.content.strip()
-            # Parse JSON response
-            insights = json.loads(content)
-            return insights if isinstance(insights, list) else [content]
+            return self._parse_list_response(response.choices[0].message.content)
             
-        except json.JSONDecodeError:
-            # If response isn't valid JSON, return as single insight
-            return [response.choices[0].message.content.strip()]
         except Exception as e:
             logger.error(f"Error generating AI insights: {e}")
             raise
     
+    async def _generate_ai_insights_async(
+        self,
+        financial_data: Dict[str, float],
+        metrics: Dict[str, Dict[str, float]],
+        industry: str,
+        business_type: str
+    ) -> List[str]:
+        """Generate insights using the async OpenAI client"""
+        prompt = self._build_insights_prompt(financial_data, metrics, industry, business_type)
+        
+        try:
+            content = await self._create_completion_async(self.INSIGHTS_SYSTEM_PROMPT, prompt)
+            return self._parse_list_response(content)
+        except Exception as e:
+            logger.error(f"Error generating AI insights: {e!r}")
+            raise
+    
+    async def _create_completion_async(self, system_prompt: str, prompt: str) -> str:
+        """
+        Run one chat completion under the concurrency limit and timeout
+        
+        Args:
+            system_prompt: System message
+            prompt: User message
+            
+        Returns:
+            Completion text
+            
+        Raises:
+            asyncio.TimeoutError: If the call exceeds OPENAI_TIMEOUT seconds
+        """
+        async with self._get_semaphore():
+            response = await asyncio.wait_for(
+                self.async_client.chat.completions.create(
+                    model=settings.OPENAI_MODEL,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=500
+                ),
+                timeout=settings.OPENAI_TIMEOUT
+            )
+        
+        return response.choices[0].message.content
+    
+    def generate_rule_based_insights(
+        self,
+        financial_data: Dict[str, float],
+        metrics: Dict[str, Dict[str, float]],
+        industry: str,
+        language: str = 'en'
+    ) -> List[str]:
+        """Instant rule-based insights, independent of the OpenAI setting"""
+        return self._generate_rule_based_insights(financial_data, metrics, industry, language)
+    
     def _generate_rule_based_insights(
         self,
         financial_data: Dict[str, float],
@@ -238,24 +412,53 @@ Format: Return ONLY a JSON array of strings, each insight being one sentence. Ex
     ) -> List[str]:
         """Generate actionable recommendations"""
         if self.enabled and self.client:
+            cache_key = self._recommendations_cache_key(insights, metrics, risk_level, industry, language)
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
             try:
-                return self._generate_ai_recommendations(insights, metrics, risk_level, industry)
+                recommendations = self._generate_ai_recommendations(insights, metrics, risk_level, industry)
             except Exception as e:
                 logger.error(f"OpenAI API error: {e}. Falling back to rule-based recommendations.")
                 return self._generate_rule_based_recommendations(metrics, risk_level, language)
+            llm_cache.set(cache_key, 'recommendations', recommendations)
+            return recommendations
         else:
             return self._generate_rule_based_recommendations(metrics, risk_level, language)
     
-    def _generate_ai_recommendations(
+    async def generate_recommendations_async(
         self,
         insights: List[str],
         metrics: Dict[str, Dict[str, float]],
         risk_level: str,
-        industry: str
+        industry: str,
+        language: str = 'en'
     ) -> List[str]:
-        """Generate recommendations using OpenAI GPT-5.2"""
-        
-        prompt = f"""Based on the following financial insights for a {industry} business with {risk_level} risk level:
+        """Generate actionable recommendations without blocking the event loop"""
+        if self.enabled and self.async_client:
+            cache_key = self._recommendations_cache_key(insights, metrics, risk_level, industry, language)
+            cached = await llm_cache.get_async(cache_key)
+            if cached is not None:
+                return list(cached)
+            try:
+                recommendations = await self._generate_ai_recommendations_async(insights, metrics, risk_level, industry)
+            except Exception as e:
+                logger.error(f"OpenAI API error: {e!r}. Falling back to rule-based recommendations.")
+                return self._generate_rule_based_recommendations(metrics, risk_level, language)
+            await llm_cache.set_async(cache_key, 'recommendations', recommendations)
+            return recommendations
+        else:
+            return self._generate_rule_based_recommendations(metrics, risk_level, language)
+    
+    @staticmethod
+    def _build_recommendations_prompt(
+        insights: List[str],
+        metrics: Dict[str, Dict[str, float]],
+        risk_level: str,
+        industry: str
+    ) -> str:
+        """Build the user prompt for recommendation generation"""
+        return f"""Based on the following financial insights for a {industry} business with {risk_level} risk level:
 
 Insights:
 {json.dumps(insights, indent=2)}
@@ -272,28 +475,60 @@ Task: Provide 4-6 specific, actionable recommendations to improve financial heal
 Format: Return ONLY a JSON array of strings. Example:
 ["Recommendation 1", "Recommendation 2", "Recommendation 3"]
 """
+    
+    def _generate_ai_recommendations(
+        self,
+        insights: List[str],
+        metrics: Dict[str, Dict[str, float]],
+        risk_level: str,
+        industry: str
+    ) -> List[str]:
+        """Generate recommendations using OpenAI GPT-5.2"""
+        prompt = self._build_recommendations_prompt(insights, metrics, risk_level, industry)
         
         try:
             response = self.client.chat.completions.create(
                 model=settings.OPENAI_MODEL,
                 messages=[
-                    {"role": "system", "content": "You are a financial advisor providing actionable recommendations for businesses."},
+                    {"role": "system", "content": self.RECOMMENDATIONS_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
                 max_tokens=500
             )
             
-            content = response.choices[0].message.content.strip()
-            recommendations = json.loads(content)
-            return recommendations if isinstance(recommendations, list) else [content]
+            return self._parse_list_response(response.choices[0].message.content)
             
-        except json.JSONDecodeError:
-            return [response.choices[0].message.content.strip()]
         except Exception as e:
             logger.error(f"Error generating AI recommendations: {e}")
             raise
     
+    async def _generate_ai_recommendations_async(
+        self,
+        insights: List[str],
+        metrics: Dict[str, Dict[str, float]],
+        risk_level: str,
+        industry: str
+    ) -> List[str]:
+        """Generate recommendations using the async OpenAI client"""
+        prompt = self._build_recommendations_prompt(insights, metrics, risk_level, industry)
+        
+        try:
+            content = await self._create_completion_async(self.RECOMMENDATIONS_SYSTEM_PROMPT, prompt)
+            return self._parse_list_response(content)
+        except Exception as e:
+            logger.error(f"Error generating AI recommendations: {e!r}")
+            raise
+    
+    def generate_rule_based_recommendations(
+        self,
+        metrics: Dict[str, Dict[str, float]],
+        risk_level: str,
+        language: str = 'en'
+    ) -> List[str]:
+        """Instant rule-based recommendations, independent of the OpenAI setting"""
+        return self._generate_rule_based_recommendations(metrics, risk_level, language)
+    
     def _generate_rule_based_recommendations(
         self,
         metrics: Dict[str, Dict[str, float]],
@@ -0,0 +1,163 @@
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import asyncio
+import logging
+import time
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+STAGE_KINDS = ('io', 'cpu', 'process', 'inline')
+
+class Stage:
+    """
+    One node of an analysis pipeline
+
+    The stage function is called with the results of its dependencies as
+    keyword arguments named after those stages.
+
+    Kinds:
+        io: function returns an awaitable, which is awaited on the event loop
+        cpu: function runs in the pipeline thread pool
+        process: function runs in the pipeline process pool (must be picklable)
+        inline: function runs directly on the event loop (for trivial work)
+    """
+
+    def __init__(self, name: str, func: Callable[..., Any], depends_on: Iterable[str] = (), kind: str = 'cpu'):
+        if kind not in STAGE_KINDS:
+            raise ValueError(f"Unknown stage kind '{kind}'. Expected one of: {', '.join(STAGE_KINDS)}")
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.kind = kind
+
+class PipelineExecutor:
+    """Runs a dependency graph of stages, starting each as soon as its inputs are ready"""
+
+    def __init__(self):
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=settings.PIPELINE_THREAD_WORKERS,
+                thread_name_prefix="pipeline"
+            )
+        return self._thread_pool
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=settings.PIPELINE_PROCESS_WORKERS)
+        return self._process_pool
+
+    @staticmethod
+    def _topological_order(stages: List[Stage]) -> List[Stage]:
+        """Validate the graph and return stages in dependency order"""
+        by_name = {}
+        for stage in stages:
+            if stage.name in by_name:
+                raise ValueError(f"Duplicate stage name '{stage.name}'")
+            by_name[stage.name] = stage
+
+        ordered = []
+        state = {}  # name -> 'visiting' | 'done'
+
+        def visit(stage: Stage):
+            if state.get(stage.name) == 'done':
+                return
+            if state.get(stage.name) == 'visiting':
+                raise ValueError(f"Cycle detected at stage '{stage.name}'")
+            state[stage.name] = 'visiting'
+            for dep in stage.depends_on:
+                if dep not in by_name:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+                visit(by_name[dep])
+            state[stage.name] = 'done'
+            ordered.append(stage)
+
+        for stage in stages:
+            visit(stage)
+
+        return ordered
+
+    async def _run_stage(
+        self,
+        stage: Stage,
+        tasks: Dict[str, asyncio.Task],
+        timings: Dict[str, float]
+    ) -> Any:
+        """Wait for dependencies, then execute one stage according to its kind"""
+        dep_results = await asyncio.gather(*(tasks[dep] for dep in stage.depends_on))
+        kwargs = dict(zip(stage.depends_on, dep_results))
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            if stage.kind == 'io':
+                return await stage.func(**kwargs)
+            elif stage.kind == 'cpu':
+                return await loop.run_in_executor(self._get_thread_pool(), lambda: stage.func(**kwargs))
+            elif stage.kind == 'process':
+                return await loop.run_in_executor(self._get_process_pool(), _call_with_kwargs, stage.func, kwargs)
+            else:
+                return stage.func(**kwargs)
+        finally:
+            timings[stage.name] = round((time.perf_counter() - start) * 1000, 2)
+
+    async def run(self, stages: List[Stage]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        Execute a stage graph concurrently
+
+        Independent stages overlap, so wall time tracks the critical path
+        rather than the sum of all stages.
+
+        Args:
+            stages: Stages to run; dependencies must be part of the same list
+
+        Returns:
+            Tuple of (results by stage name, timings in ms by stage name plus 'total')
+
+        Raises:
+            The first exception raised by any stage; remaining stages are cancelled
+        """
+        ordered = self._topological_order(stages)
+        timings: Dict[str, float] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        start = time.perf_counter()
+        for stage in ordered:
+            tasks[stage.name] = asyncio.ensure_future(self._run_stage(stage, tasks, timings))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except Exception:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        finally:
+            timings['total'] = round((time.perf_counter() - start) * 1000, 2)
+
+        results = {name: task.result() for name, task in tasks.items()}
+        logger.info("Pipeline timings (ms): " + ", ".join(f"{name}={ms}" for name, ms in timings.items()))
+
+        return results, timings
+
+    def shutdown(self):
+        """Stop the worker pools"""
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+            self._thread_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+
+def _call_with_kwargs(func: Callable[..., Any], kwargs: Dict[str, Any]) -> Any:
+    """Picklable trampoline for process-pool stages"""
+    return func(**kwargs)
+
+def format_server_timing(timings: Dict[str, float]) -> str:
+    """Render stage timings as a Server-Timing header value"""
+    return ", ".join(f"{name};dur={ms}" for name, ms in timings.items())
+
+pipeline_executor = PipelineExecutor()
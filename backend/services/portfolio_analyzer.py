@@ -0,0 +1,296 @@
+from typing import Dict, Any, List, Mapping
+import numpy as np
+import logging
+from services.vector_ops import round_half_even, safe_divide
+
+logger = logging.getLogger(__name__)
+
+# Columns of a statement table, in FinancialStatement field order
+STATEMENT_FIELDS = (
+    'revenue',
+    'cogs',
+    'operating_expenses',
+    'net_income',
+    'total_assets',
+    'current_assets',
+    'total_liabilities',
+    'current_liabilities',
+    'inventory',
+    'receivables',
+    'payables',
+    'cash'
+)
+
+# Fields without a schema default must be present in every table
+REQUIRED_FIELDS = ('revenue', 'net_income', 'total_assets', 'total_liabilities')
+
+RISK_LEVELS = np.array(["Low", "Moderate", "High", "Critical"], dtype=object)
+
+class PortfolioAnalyzer:
+    """
+    Vectorized counterpart of FinancialAnalyzer for whole portfolios
+
+    Every method takes columnar data (one NumPy array per field) and returns
+    arrays that are element-for-element identical to running the scalar
+    FinancialAnalyzer on each statement, including its division-by-zero
+    guards and rounding.
+    """
+
+    @staticmethod
+    def to_columns(table: Mapping[str, Any]) -> Dict[str, np.ndarray]:
+        """
+        Convert a statement table into float arrays keyed by field
+
+        Args:
+            table: Mapping or DataFrame with one column per FinancialStatement field
+
+        Returns:
+            Dictionary of equal-length float arrays for all 12 fields
+        """
+        missing = [field for field in REQUIRED_FIELDS if field not in table]
+        if missing:
+            raise ValueError(f"Statement table is missing required columns: {', '.join(missing)}")
+
+        columns = {}
+        length = None
+        for field in STATEMENT_FIELDS:
+            if field in table:
+                column = np.asarray(table[field], dtype=float).ravel()
+            else:
+                column = None
+            columns[field] = column
+            if column is not None:
+                if length is None:
+                    length = len(column)
+                elif len(column) != length:
+                    raise ValueError(f"Column '{field}' has {len(column)} rows, expected {length}")
+
+        # Optional fields default to 0 like the FinancialStatement schema
+        for field, column in columns.items():
+            if column is None:
+                columns[field] = np.zeros(length, dtype=float)
+
+        return columns
+
+    @staticmethod
+    def from_statements(statements: List[Dict[str, float]]) -> Dict[str, np.ndarray]:
+        """Build a columnar table from a list of statement dicts"""
+        return {
+            field: np.fromiter((s.get(field, 0) for s in statements), dtype=float, count=len(statements))
+            for field in STATEMENT_FIELDS
+        }
+
+    @staticmethod
+    def calculate_all_metrics(table: Mapping[str, Any]) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Calculate comprehensive financial metrics for every row
+
+        Args:
+            table: Columnar statement data (see to_columns)
+
+        Returns:
+            Metrics in the same layout as FinancialAnalyzer.calculate_all_metrics,
+            with an array in place of each value
+        """
+        data = PortfolioAnalyzer.to_columns(table)
+
+        return {
+            'liquidity': PortfolioAnalyzer._calculate_liquidity_ratios(data),
+            'profitability': PortfolioAnalyzer._calculate_profitability_ratios(data),
+            'leverage': PortfolioAnalyzer._calculate_leverage_ratios(data),
+            'efficiency': PortfolioAnalyzer._calculate_efficiency_ratios(data),
+            'working_capital': PortfolioAnalyzer._calculate_working_capital_metrics(data)
+        }
+
+    @staticmethod
+    def _calculate_liquidity_ratios(data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Calculate liquidity ratios"""
+        current_assets = data['current_assets']
+        current_liabilities = data['current_liabilities']
+
+        return {
+            'current_ratio': round_half_even(safe_divide(current_assets, current_liabilities), 2),
+            'quick_ratio': round_half_even(safe_divide(current_assets - data['inventory'], current_liabilities), 2),
+            'cash_ratio': round_half_even(safe_divide(data['cash'], current_liabilities), 2)
+        }
+
+    @staticmethod
+    def _calculate_profitability_ratios(data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Calculate profitability ratios"""
+        revenue = data['revenue']
+        net_income = data['net_income']
+        total_assets = data['total_assets']
+        equity = total_assets - data['total_liabilities']
+
+        gross_profit = revenue - data['cogs']
+        operating_income = gross_profit - data['operating_expenses']
+
+        return {
+            'gross_profit_margin': round_half_even(safe_divide(gross_profit, revenue) * 100, 2),
+            'operating_profit_margin': round_half_even(safe_divide(operating_income, revenue) * 100, 2),
+            'net_profit_margin': round_half_even(safe_divide(net_income, revenue) * 100, 2),
+            'return_on_assets': round_half_even(safe_divide(net_income, total_assets) * 100, 2),
+            'return_on_equity': round_half_even(safe_divide(net_income, equity) * 100, 2)
+        }
+
+    @staticmethod
+    def _calculate_leverage_ratios(data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Calculate leverage/solvency ratios"""
+        total_assets = data['total_assets']
+        total_liabilities = data['total_liabilities']
+        equity = total_assets - total_liabilities
+
+        # Same 8% interest assumption as the scalar path
+        interest_expense = total_liabilities * 0.08
+        ebit = data['net_income'] + interest_expense
+
+        return {
+            'debt_to_equity': round_half_even(safe_divide(total_liabilities, equity), 2),
+            'debt_to_assets': round_half_even(safe_divide(total_liabilities, total_assets), 2),
+            'equity_ratio': round_half_even(safe_divide(equity, total_assets), 2),
+            'interest_coverage': round_half_even(safe_divide(ebit, interest_expense), 2)
+        }
+
+    @staticmethod
+    def _calculate_efficiency_ratios(data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Calculate efficiency/activity ratios"""
+        revenue = data['revenue']
+        inventory = data['inventory']
+        receivables = data['receivables']
+        cogs = data['cogs']
+
+        return {
+            'asset_turnover': round_half_even(safe_divide(revenue, data['total_assets']), 2),
+            'inventory_turnover': round_half_even(safe_divide(cogs, inventory), 2),
+            'receivables_turnover': round_half_even(safe_divide(revenue, receivables), 2),
+            'days_sales_outstanding': round_half_even(safe_divide(receivables, revenue) * 365, 1),
+            'days_inventory_outstanding': round_half_even(safe_divide(inventory, cogs) * 365, 1)
+        }
+
+    @staticmethod
+    def _calculate_working_capital_metrics(data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Calculate working capital metrics"""
+        revenue = data['revenue']
+        cogs = data['cogs']
+
+        working_capital = data['current_assets'] - data['current_liabilities']
+
+        # Cash Conversion Cycle
+        dso = safe_divide(data['receivables'], revenue) * 365
+        dio = safe_divide(data['inventory'], cogs) * 365
+        dpo = safe_divide(data['payables'], cogs) * 365
+        ccc = dso + dio - dpo
+
+        return {
+            'working_capital': round_half_even(working_capital, 2),
+            'working_capital_ratio': round_half_even(safe_divide(working_capital, revenue), 2),
+            'cash_conversion_cycle': round_half_even(ccc, 1)
+        }
+
+    @staticmethod
+    def calculate_health_score(metrics: Dict[str, Dict[str, np.ndarray]]) -> np.ndarray:
+        """
+        Calculate financial health scores (0-100) for every row
+
+        Args:
+            metrics: Output of calculate_all_metrics
+
+        Returns:
+            Integer array of health scores
+        """
+        current_ratio = metrics['liquidity']['current_ratio']
+        npm = metrics['profitability']['net_profit_margin']
+        debt_to_equity = metrics['leverage']['debt_to_equity']
+        equity_ratio = metrics['leverage']['equity_ratio']
+        asset_turnover = metrics['efficiency']['asset_turnover']
+        wc = metrics['working_capital']['working_capital']
+
+        score = np.full(current_ratio.shape, 70, dtype=np.int64)
+
+        # Liquidity scoring (20 points max)
+        score += np.select(
+            [current_ratio >= 2.0, current_ratio >= 1.5, current_ratio >= 1.0, current_ratio >= 0.5],
+            [20, 15, 10, 5],
+            default=-10
+        )
+
+        # Profitability scoring (30 points max)
+        score += np.select(
+            [npm >= 15, npm >= 10, npm >= 5, npm >= 0],
+            [30, 20, 10, 5],
+            default=-20
+        )
+
+        # Leverage scoring (20 points max)
+        score += np.select(
+            [equity_ratio <= 0, debt_to_equity <= 0.5, debt_to_equity <= 1.0, debt_to_equity <= 2.0],
+            [-30, 20, 15, 5],
+            default=-10
+        )
+
+        # Efficiency scoring (15 points max)
+        score += np.select(
+            [asset_turnover >= 2.0, asset_turnover >= 1.0, asset_turnover >= 0.5],
+            [15, 10, 5],
+            default=0
+        )
+
+        # Working capital scoring (15 points max)
+        score += np.select(
+            [wc > 0, wc > -100000],
+            [15, 5],
+            default=-10
+        )
+
+        return np.clip(score, 0, 100)
+
+    @staticmethod
+    def determine_risk_level(scores: np.ndarray, metrics: Dict[str, Dict[str, np.ndarray]]) -> np.ndarray:
+        """
+        Determine risk levels for every row
+
+        Args:
+            scores: Health scores from calculate_health_score
+            metrics: Output of calculate_all_metrics
+
+        Returns:
+            Object array of "Low", "Moderate", "High" or "Critical"
+        """
+        level = np.select([scores >= 80, scores >= 60, scores >= 40], [0, 1, 2], default=3)
+
+        # A fatal flaw caps an otherwise 'Low' risk at 'Moderate'
+        fatal_flaw = (
+            (metrics['leverage']['equity_ratio'] <= 0)
+            | (metrics['liquidity']['current_ratio'] < 0.3)
+            | (metrics['profitability']['net_profit_margin'] < -50)
+        )
+        level = np.where(fatal_flaw & (level == 0), 1, level)
+
+        return RISK_LEVELS[level]
+
+    @staticmethod
+    def analyze(table: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Run metrics, health score and risk level over a statement table
+
+        Returns:
+            Dictionary with 'metrics', 'health_score' and 'risk_level' arrays
+        """
+        metrics = PortfolioAnalyzer.calculate_all_metrics(table)
+        scores = PortfolioAnalyzer.calculate_health_score(metrics)
+
+        return {
+            'metrics': metrics,
+            'health_score': scores,
+            'risk_level': PortfolioAnalyzer.determine_risk_level(scores, metrics)
+        }
+
+    @staticmethod
+    def metrics_row(metrics: Dict[str, Dict[str, np.ndarray]], index: int) -> Dict[str, Dict[str, float]]:
+        """Extract one row as a plain metrics dict, as returned by FinancialAnalyzer"""
+        return {
+            category: {name: float(values[index]) for name, values in category_metrics.items()}
+            for category, category_metrics in metrics.items()
+        }
+
+portfolio_analyzer = PortfolioAnalyzer()
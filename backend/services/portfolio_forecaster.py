@@ -0,0 +1,266 @@
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+import asyncio
+import logging
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.settings import settings
+from database.models import BusinessProfile, FinancialStatement
+from services.cache import LRUCache
+from services.cash_flow_forecaster import CashFlowForecaster, PERCENTILES
+from services.document_parser import DocumentParser
+from services.vector_ops import round_half_even
+
+logger = logging.getLogger(__name__)
+
+GROUP_BY = ('industry', 'size')
+
+# Label for businesses without a size
+UNKNOWN_GROUP = 'unknown'
+
+# Projected series summed per month across a group
+TOTAL_FIELDS = ('revenue', 'net_income', 'net_cash_flow', 'cash_balance')
+
+# Projected series reported as percentiles across the businesses of a group
+PERCENTILE_FIELDS = ('net_cash_flow', 'cash_balance')
+
+class PortfolioForecaster:
+    """
+    Forecast rollups across every stored business
+
+    The latest statement of each business (by period end) is loaded in one
+    query and the whole portfolio runs through the vectorized projection kernel in
+    chunks of PORTFOLIO_FORECAST_CHUNK businesses. Cash balance is the
+    statement's cash plus the projected cumulative cash flow; a business
+    is exposed in a month when that balance is negative. Rollups are
+    cached under the newest statement id and statement count, so they are
+    recomputed only after new statements arrive.
+    """
+
+    def __init__(self):
+        self.cache = LRUCache(maxsize=settings.PORTFOLIO_FORECAST_CACHE_SIZE)
+
+    @staticmethod
+    async def statements_version(db: AsyncSession) -> tuple:
+        """(newest statement id, statement count); changes whenever statements are added"""
+        result = await db.execute(select(func.max(FinancialStatement.id), func.count(FinancialStatement.id)))
+        return tuple(result.one())
+
+    @staticmethod
+    def latest(statements: pd.DataFrame) -> pd.DataFrame:
+        """
+        Latest statement of each business
+
+        The latest statement is the one whose period closes last, so a
+        backfilled older period does not replace a newer one; statements
+        without a readable period rank before dated ones and ties go to
+        the most recently stored.
+
+        Args:
+            statements: Frame with 'business_id', 'id' and 'period' columns
+
+        Quarters, years and date ranges give the period's length. A plain
+        date ("Mar 2024", as key-value uploads head annual columns) does
+        not, so its length is the gap since the business's previous dated
+        statement (one to twelve months), or a year without one.
+
+        Returns:
+            One row per business, with the period's closing month ('end')
+            and length ('months') added
+        """
+        # Parse each distinct period label once
+        labels = statements['period'].fillna('').astype(str)
+        distinct = pd.Series(labels.unique())
+        spans = DocumentParser.period_spans(distinct).set_index(distinct)
+        ordered = statements.assign(
+            end=labels.map(spans['end']),
+            months=labels.map(spans['months']),
+            explicit=labels.map(spans['explicit']).astype(bool)
+        ).sort_values(['business_id', 'end', 'id'], na_position='first')
+
+        gap = ordered['end'] - ordered.groupby('business_id')['end'].shift()
+        inferred = gap.where((gap >= 1) & (gap <= 12), 12)
+        ordered['months'] = ordered['months'].where(ordered['explicit'], inferred)
+        return ordered.drop_duplicates('business_id', keep='last')
+
+    @staticmethod
+    async def load_latest(db: AsyncSession) -> Dict[str, np.ndarray]:
+        """
+        Latest statement (see latest) of every business as column arrays
+
+        Returns:
+            'revenue', 'net_income', 'cash', 'months' (length of the
+            statement's period), 'industry' and 'size'
+            arrays, one entry per business
+        """
+        result = await db.execute(
+            select(
+                FinancialStatement.business_id,
+                FinancialStatement.id,
+                FinancialStatement.period,
+                FinancialStatement.revenue,
+                FinancialStatement.net_income,
+                FinancialStatement.cash,
+                BusinessProfile.industry,
+                BusinessProfile.size
+            )
+            .join(BusinessProfile, BusinessProfile.id == FinancialStatement.business_id)
+        )
+        latest = PortfolioForecaster.latest(pd.DataFrame(
+            result.all(),
+            columns=['business_id', 'id', 'period', 'revenue', 'net_income', 'cash', 'industry', 'size']
+        ))
+        return {
+            'revenue': latest['revenue'].to_numpy(dtype=float),
+            'net_income': latest['net_income'].to_numpy(dtype=float),
+            'cash': np.nan_to_num(latest['cash'].to_numpy(dtype=float)),
+            'months': latest['months'].to_numpy(dtype=float),
+            'industry': np.array([industry.value for industry in latest['industry']], dtype=object),
+            'size': np.array([size if pd.notna(size) and size else UNKNOWN_GROUP for size in latest['size']], dtype=object)
+        }
+
+    @staticmethod
+    def project(table: Dict[str, np.ndarray], months: int, start_month: int) -> Dict[str, np.ndarray]:
+        """
+        Projected TOTAL_FIELDS for every business
+
+        Each statement's revenue and net income are spread over the months
+        its period covers to give the starting monthly run-rate.
+
+        Returns:
+            TOTAL_FIELDS -> (businesses, months) arrays
+        """
+        count = len(table['revenue'])
+        projected = {field: np.empty((count, months)) for field in TOTAL_FIELDS}
+        chunk = settings.PORTFOLIO_FORECAST_CHUNK
+        for start in range(0, count, chunk):
+            rows = slice(start, start + chunk)
+            projection = CashFlowForecaster.project(
+                table['revenue'][rows] / table['months'][rows],
+                table['net_income'][rows] / table['months'][rows],
+                table['industry'][rows].tolist(),
+                months,
+                start_month
+            )
+            projected['revenue'][rows] = projection['revenue']
+            projected['net_income'][rows] = projection['net_income']
+            projected['net_cash_flow'][rows] = projection['net_cash_flow']
+            projected['cash_balance'][rows] = table['cash'][rows, None] + projection['cumulative_cash']
+        return projected
+
+    @staticmethod
+    def rollup(projected: Dict[str, np.ndarray], labels: List[str]) -> Dict[str, Any]:
+        """Monthly totals, percentiles and negative-cash exposure for one group of businesses"""
+        balance = projected['cash_balance']
+        negative = balance < 0
+        totals = {field: round_half_even(projected[field].sum(axis=0), 2) for field in TOTAL_FIELDS}
+        percentiles = {
+            field: round_half_even(np.percentile(projected[field], PERCENTILES, axis=0), 2)
+            for field in PERCENTILE_FIELDS
+        }
+        exposure = round_half_even(np.where(negative, -balance, 0).sum(axis=0), 2)
+        negative_businesses = negative.sum(axis=0)
+
+        monthly = []
+        for i, label in enumerate(labels):
+            month = {'month': label}
+            month.update({field: float(totals[field][i]) for field in TOTAL_FIELDS})
+            for field in PERCENTILE_FIELDS:
+                month.update({f"{field}_p{p}": float(percentiles[field][j, i]) for j, p in enumerate(PERCENTILES)})
+            month['negative_cash_businesses'] = int(negative_businesses[i])
+            month['negative_cash_exposure'] = float(exposure[i])
+            monthly.append(month)
+
+        return {
+            'businesses': len(balance),
+            'summary': {
+                'total_projected_revenue': round(float(totals['revenue'].sum()), 2),
+                'total_projected_net_cash_flow': round(float(totals['net_cash_flow'].sum()), 2),
+                'ending_cash_balance': float(totals['cash_balance'][-1]),
+                'businesses_with_negative_cash': int(negative.any(axis=1).sum()),
+                'negative_cash_months': int(negative.sum()),
+                'peak_negative_cash_exposure': float(exposure.max())
+            },
+            'monthly_rollup': monthly
+        }
+
+    @staticmethod
+    def forecast(table: Dict[str, np.ndarray], group_by: str, months: int, start: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Portfolio and per-group rollups of a statement table
+
+        Args:
+            table: Column arrays as from load_latest
+            group_by: 'industry' or 'size'
+            months: Number of months to project
+            start: First projected month (defaults to now)
+
+        Returns:
+            Dictionary with the month labels, the whole-portfolio rollup and
+            one rollup per group
+        """
+        if group_by not in GROUP_BY:
+            raise ValueError(f"group_by must be one of {', '.join(GROUP_BY)}")
+
+        start = start or datetime.now()
+        labels = CashFlowForecaster.month_labels(months, start)
+        count = len(table['revenue'])
+        result = {
+            'group_by': group_by,
+            'forecast_period': f"{months} months",
+            'businesses': count,
+            'months': labels
+        }
+        if count == 0:
+            result.update({'portfolio': None, 'groups': {}})
+            return result
+
+        projected = PortfolioForecaster.project(table, months, start.month)
+        result['portfolio'] = PortfolioForecaster.rollup(projected, labels)
+
+        keys, rows = np.unique(table[group_by].astype(str), return_inverse=True)
+        result['groups'] = {
+            key: PortfolioForecaster.rollup(
+                {field: values[rows == i] for field, values in projected.items()},
+                labels
+            )
+            for i, key in enumerate(keys.tolist())
+        }
+        return result
+
+    async def portfolio_forecast(self, db: AsyncSession, group_by: str, months: int = 12) -> Dict[str, Any]:
+        """
+        Cached portfolio rollups over the latest statement of every business
+
+        Args:
+            db: Async database session
+            group_by: 'industry' or 'size'
+            months: Number of months to project
+
+        Returns:
+            Rollups as from forecast, plus the statement version they reflect
+        """
+        if group_by not in GROUP_BY:
+            raise ValueError(f"group_by must be one of {', '.join(GROUP_BY)}")
+
+        start = datetime.now()
+        version = await self.statements_version(db)
+        key = (group_by, months, start.date().isoformat(), version)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        table = await self.load_latest(db)
+        result = await asyncio.to_thread(self.forecast, table, group_by, months, start)
+        result['as_of_statement_id'] = version[0]
+        self.cache.set(key, result)
+        logger.info(f"Portfolio forecast rolled up {result['businesses']} businesses by {group_by}")
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Rollup cache counters"""
+        return self.cache.stats()
+
+portfolio_forecaster = PortfolioForecaster()
@@ -0,0 +1,189 @@
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+import logging
+from config.settings import settings
+from services.portfolio_analyzer import PortfolioAnalyzer, STATEMENT_FIELDS
+from services.cash_flow_forecaster import CashFlowForecaster
+from services.vector_ops import round_half_even
+
+logger = logging.getLogger(__name__)
+
+SHOCK_MODES = ('relative', 'absolute', 'days')
+
+# Working capital items a "days" shock can move, and the flow each is
+# measured in days of (DSO on revenue, DIO and DPO on COGS)
+DAYS_BASIS = {
+    'receivables': 'revenue',
+    'inventory': 'cogs',
+    'payables': 'cogs'
+}
+
+# Balance sheet and P&L totals that follow their components when
+# propagation is on: total -> [(component, sign)]
+PROPAGATION = {
+    'net_income': [('revenue', 1), ('cogs', -1), ('operating_expenses', -1)],
+    'current_assets': [('receivables', 1), ('inventory', 1), ('cash', 1)],
+    'total_assets': [('receivables', 1), ('inventory', 1), ('cash', 1)],
+    'current_liabilities': [('payables', 1)],
+    'total_liabilities': [('payables', 1)]
+}
+
+# Every field except net income is non-negative in FinancialStatement
+NON_NEGATIVE_FIELDS = tuple(field for field in STATEMENT_FIELDS if field != 'net_income')
+
+FORECAST_COLUMNS = (
+    'total_projected_revenue',
+    'total_projected_net_income',
+    'ending_cumulative_cash',
+    'negative_cash_months'
+)
+
+class ScenarioEngine:
+    """
+    What-if analysis over a grid of statement shocks
+
+    The cartesian product of every shock's values becomes one statement
+    table, which runs through the vectorized metrics, health score, risk
+    level and forecast projection in a single pass.
+    """
+
+    @staticmethod
+    def build_grid(
+        base: Dict[str, float],
+        shocks: List[Dict[str, Any]],
+        propagate: bool = True
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """
+        Expand shocks into a statement table
+
+        Relative shocks multiply a field by (1 + value), absolute shocks add
+        the value and days shocks add `value` days of revenue (receivables)
+        or COGS (inventory, payables). Shocks apply in request order, days
+        shocks last so they use the shocked revenue and COGS. With
+        propagation, net income follows revenue, COGS and operating
+        expenses, current and total assets follow receivables, inventory
+        and cash, and current and total liabilities follow payables. Fields
+        are then clipped at zero where the schema requires it.
+
+        Args:
+            base: Base financial statement
+            shocks: Dicts with 'field', 'mode' and 'values'
+            propagate: Carry component changes into the totals
+
+        Returns:
+            (statement columns, (combinations, shocks) matrix of shock values)
+        """
+        if not shocks:
+            raise ValueError("At least one shock is required")
+        for shock in shocks:
+            if shock['field'] not in STATEMENT_FIELDS:
+                raise ValueError(f"Unknown statement field '{shock['field']}'")
+            if shock['mode'] not in SHOCK_MODES:
+                raise ValueError(f"Unknown shock mode '{shock['mode']}'")
+            if shock['mode'] == 'days' and shock['field'] not in DAYS_BASIS:
+                raise ValueError(f"Days shocks apply to {', '.join(DAYS_BASIS)}, not '{shock['field']}'")
+            if not shock['values']:
+                raise ValueError(f"Shock on '{shock['field']}' has no values")
+
+        combinations = int(np.prod([len(shock['values']) for shock in shocks]))
+        if combinations > settings.SCENARIO_MAX_COMBINATIONS:
+            raise ValueError(
+                f"{combinations} scenario combinations exceed the limit of {settings.SCENARIO_MAX_COMBINATIONS}"
+            )
+
+        axes = np.meshgrid(*[np.asarray(shock['values'], dtype=float) for shock in shocks], indexing='ij')
+        grid = np.column_stack([axis.ravel() for axis in axes])
+
+        base_columns = PortfolioAnalyzer.from_statements([base])
+        columns = {field: np.repeat(base_columns[field], combinations) for field in STATEMENT_FIELDS}
+
+        ordered = [i for i, shock in enumerate(shocks) if shock['mode'] != 'days']
+        ordered += [i for i, shock in enumerate(shocks) if shock['mode'] == 'days']
+        for i in ordered:
+            field, mode, values = shocks[i]['field'], shocks[i]['mode'], grid[:, i]
+            if mode == 'relative':
+                columns[field] = columns[field] * (1 + values)
+            elif mode == 'absolute':
+                columns[field] = columns[field] + values
+            else:
+                columns[field] = columns[field] + columns[DAYS_BASIS[field]] / 365 * values
+
+        if propagate:
+            shocked = {shock['field'] for shock in shocks}
+            for total, components in PROPAGATION.items():
+                for component, sign in components:
+                    if component in shocked:
+                        columns[total] = columns[total] + sign * (columns[component] - base_columns[component])
+
+        for field in NON_NEGATIVE_FIELDS:
+            np.maximum(columns[field], 0, out=columns[field])
+
+        return columns, grid
+
+    @staticmethod
+    def evaluate(
+        base: Dict[str, float],
+        shocks: List[Dict[str, Any]],
+        industry: str,
+        months: int = 12,
+        metrics: Optional[List[str]] = None,
+        propagate: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Evaluate every scenario in a shock grid
+
+        Args:
+            base: Base financial statement
+            shocks: Dicts with 'field', 'mode' and 'values'
+            industry: Business industry, for the forecast projection
+            months: Forecast horizon for the summary columns
+            metrics: Metric names to include (defaults to all)
+            propagate: Carry component changes into the totals
+
+        Returns:
+            Dictionary with the column names, the results for the unshocked
+            statement and one row per combination (shock values first)
+        """
+        columns, grid = ScenarioEngine.build_grid(base, shocks, propagate)
+
+        # Evaluate the base statement as row 0 alongside the grid
+        base_columns = PortfolioAnalyzer.from_statements([base])
+        table = {field: np.concatenate([base_columns[field], columns[field]]) for field in STATEMENT_FIELDS}
+
+        analysis = PortfolioAnalyzer.analyze(table)
+        flat_metrics = {
+            name: values
+            for category in analysis['metrics'].values()
+            for name, values in category.items()
+        }
+        selected = metrics or list(flat_metrics)
+        unknown = [name for name in selected if name not in flat_metrics]
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(unknown)}")
+
+        projection = CashFlowForecaster.project(table['revenue'] / 12, table['net_income'] / 12, industry, months)
+        forecast = {
+            'total_projected_revenue': round_half_even(np.cumsum(projection['revenue'], axis=1)[:, -1], 2),
+            'total_projected_net_income': round_half_even(np.cumsum(projection['net_income'], axis=1)[:, -1], 2),
+            'ending_cumulative_cash': projection['cumulative_cash'][:, -1],
+            'negative_cash_months': (projection['net_cash_flow'] < 0).sum(axis=1)
+        }
+
+        shock_columns = [f"{shock['field']}_{shock['mode']}" for shock in shocks]
+        result_columns = ['health_score', 'risk_level'] + list(selected) + list(FORECAST_COLUMNS)
+        series = (
+            [analysis['health_score'].tolist(), analysis['risk_level'].tolist()]
+            + [flat_metrics[name].tolist() for name in selected]
+            + [forecast[name].tolist() for name in FORECAST_COLUMNS]
+        )
+        rows = [list(row) for row in zip(*series)]
+        shock_values = grid.tolist()
+
+        return {
+            'combinations': len(shock_values),
+            'columns': shock_columns + result_columns,
+            'base': dict(zip(result_columns, rows[0])),
+            'rows': [values + row for values, row in zip(shock_values, rows[1:])]
+        }
+
+scenario_engine = ScenarioEngine()
@@ -1,6 +1,7 @@
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
 import calendar
+from services.industry_profiles import get_profile
 
 class TaxCompliance:
     """Tax compliance checking and GST integration service"""
@@ -114,19 +115,7 @@ class TaxCompliance:
     @staticmethod
     def _get_gst_rate(industry: str) -> float:
         """Get applicable GST rate for industry"""
-        industry_rates = {
-            'manufacturing': 18,
-            'retail': 12,
-            'services': 18,
-            'technology': 18,
-            'agriculture': 5,
-            'ecommerce': 18,
-            'logistics': 18,
-            'healthcare': 12,
-            'hospitality': 18,
-            'construction': 18
-        }
-        return industry_rates.get(industry.lower(), 18)
+        return get_profile(industry).gst_rate
     
     @staticmethod
     def _estimate_income_tax(net_income: float, business_type: str) -> Dict[str, Any]:
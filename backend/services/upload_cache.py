@@ -0,0 +1,152 @@
+from typing import Dict, Any, List, Optional, BinaryIO
+from datetime import date
+import copy
+import hashlib
+import json
+import logging
+import os
+from config.settings import settings
+from services.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Bump when parser output changes so stale disk entries are not reused
+PARSER_VERSION = "1"
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+class UploadCache:
+    """
+    Content-addressed cache for uploaded documents
+
+    Parsed statements are keyed on the SHA-256 of the upload bytes (plus
+    the file type and parser version) and kept in an in-process LRU, with
+    an optional JSON-file tier under UPLOAD_CACHE_DIR that survives
+    restarts. The deterministic analysis stages (products, tax, forecast)
+    are cached in memory under the same digest together with the request
+    options they depend on and the current date. Peer benchmarks are not
+    cached, since they move as analyses are saved.
+    """
+
+    def __init__(self):
+        self.enabled = settings.UPLOAD_CACHE_ENABLED
+        self.disk_dir = settings.UPLOAD_CACHE_DIR
+        self.parsed = LRUCache(maxsize=settings.UPLOAD_CACHE_SIZE, ttl=settings.UPLOAD_CACHE_TTL)
+        self.stages = LRUCache(maxsize=settings.UPLOAD_CACHE_SIZE, ttl=settings.UPLOAD_CACHE_TTL)
+        self.disk_hits = 0
+        self.disk_errors = 0
+
+        if self.enabled and self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    @staticmethod
+    def digest(source: BinaryIO) -> str:
+        """SHA-256 of a seekable file object's content; the position is restored to the start"""
+        sha = hashlib.sha256()
+        source.seek(0)
+        for block in iter(lambda: source.read(HASH_CHUNK_SIZE), b''):
+            sha.update(block)
+        source.seek(0)
+        return sha.hexdigest()
+
+    @staticmethod
+    def parsed_key(digest: str, filename: str) -> str:
+        """Key for parsed statements; the extension picks the parser"""
+        extension = os.path.splitext(filename.lower())[1].lstrip('.')
+        return f"{digest}.{extension}.v{PARSER_VERSION}"
+
+    @staticmethod
+    def stage_key(digest: str, industry: str, business_type: str, language: str) -> tuple:
+        """Key for deterministic stage outputs (forecast and tax depend on today's date)"""
+        return (digest, industry, business_type, language, date.today().isoformat())
+
+    def get_parsed(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Parsed statements for an upload, from memory then disk"""
+        if not self.enabled:
+            return None
+
+        periods = self.parsed.get(key)
+        if periods is None and self.disk_dir:
+            periods = self._read_disk(key)
+            if periods is not None:
+                self.disk_hits += 1
+                self.parsed.set(key, periods)
+        return copy.deepcopy(periods) if periods is not None else None
+
+    def set_parsed(self, key: str, periods: List[Dict[str, Any]]):
+        """Store parsed statements in every enabled tier"""
+        if not self.enabled:
+            return
+
+        self.parsed.set(key, copy.deepcopy(periods))
+        if self.disk_dir:
+            self._write_disk(key, periods)
+
+    def get_stages(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """Cached deterministic stage outputs"""
+        if not self.enabled:
+            return None
+        results = self.stages.get(key)
+        return copy.deepcopy(results) if results is not None else None
+
+    def set_stages(self, key: tuple, results: Dict[str, Any]):
+        """Store deterministic stage outputs"""
+        if self.enabled:
+            self.stages.set(key, copy.deepcopy(results))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                periods = json.load(f)
+            # Refresh mtime so disk eviction is least-recently-used
+            os.utime(path)
+            return periods
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.disk_errors += 1
+            logger.warning(f"Upload cache read failed: {e}")
+            return None
+
+    def _write_disk(self, key: str, periods: List[Dict[str, Any]]):
+        path = self._path(key)
+        try:
+            # Write then rename so readers never see a partial file
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(periods, f)
+            os.replace(temp_path, path)
+            self._evict_disk()
+        except Exception as e:
+            self.disk_errors += 1
+            logger.warning(f"Upload cache write failed: {e}")
+
+    def _evict_disk(self):
+        """Remove the least recently used files beyond UPLOAD_CACHE_DISK_MAX_FILES"""
+        entries = [entry for entry in os.scandir(self.disk_dir) if entry.name.endswith('.json')]
+        excess = len(entries) - settings.UPLOAD_CACHE_DISK_MAX_FILES
+        if excess <= 0:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:excess]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for parsed documents and stage outputs"""
+        return {
+            'enabled': self.enabled,
+            'disk': bool(self.disk_dir),
+            'parsed': self.parsed.stats(),
+            'stages': self.stages.stats(),
+            'disk_hits': self.disk_hits,
+            'disk_errors': self.disk_errors
+        }
+
+upload_cache = UploadCache()
@@ -0,0 +1,258 @@
+from typing import Dict, Any, List, Optional, BinaryIO, Callable, Awaitable
+from datetime import datetime, timedelta
+import asyncio
+import logging
+import os
+import shutil
+import uuid
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.settings import settings
+from database.connection import AsyncSessionLocal
+from database.models import UploadJob, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# Called with the job (id, filename, file_path, params) and a progress
+# callback; returns the JSON-serializable result
+JobHandler = Callable[[Dict[str, Any], Callable[[str, int], Awaitable[None]]], Awaitable[Dict[str, Any]]]
+
+class UploadJobQueue:
+    """
+    Persistent background queue for asynchronous uploads
+
+    Submitting stores the upload under UPLOAD_JOB_DIR, records an
+    upload_jobs row and returns its id at once. UPLOAD_JOB_WORKERS asyncio
+    workers take job ids off an in-process queue and run the handler,
+    recording stage, progress and the result (or error) on the row.
+
+    Several processes may share the table (uvicorn --workers, rolling
+    deploys). A job is claimed with a conditional PENDING -> RUNNING update,
+    so only one process runs it, and the running job's updated_at is
+    refreshed every third of UPLOAD_JOB_LEASE. On start, pending jobs and
+    running jobs whose lease has expired (their process died) are queued
+    again, so accepted uploads survive a restart. Recovered jobs read their
+    file from UPLOAD_JOB_DIR, which must therefore be shared storage when
+    workers run on more than one host.
+    """
+
+    def __init__(self):
+        self.workers = settings.UPLOAD_JOB_WORKERS
+        self.job_dir = settings.UPLOAD_JOB_DIR
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._handler: Optional[JobHandler] = None
+
+        # Metrics
+        self.submitted = 0
+        self.recovered = 0
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    async def start(self, handler: JobHandler):
+        """Start the workers on the running event loop and requeue unfinished jobs"""
+        if self.running:
+            return
+        os.makedirs(self.job_dir, exist_ok=True)
+        self._handler = handler
+        self._queue = asyncio.Queue()
+
+        try:
+            await self._recover()
+        except Exception as e:
+            logger.error(f"Could not requeue unfinished upload jobs: {e}")
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(max(1, self.workers))]
+        logger.info(f"Upload job workers started ({len(self._tasks)} workers)")
+
+    async def stop(self):
+        """Stop the workers; interrupted jobs are picked up again on the next start"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Upload job workers stopped")
+
+    async def submit(self, source: BinaryIO, filename: str, params: Dict[str, Any]) -> str:
+        """
+        Store an upload and queue it for processing
+
+        Args:
+            source: Seekable binary file object with the upload content
+            filename: Original file name
+            params: Analysis options (business_name, business_type, industry, language)
+
+        Returns:
+            The new job id
+        """
+        if not self.running:
+            raise RuntimeError("Upload job workers are not running")
+
+        job_id = str(uuid.uuid4())
+        extension = os.path.splitext(filename)[1].lower()
+        file_path = os.path.join(self.job_dir, f"{job_id}{extension}")
+        await asyncio.to_thread(self._store, source, file_path)
+
+        async with AsyncSessionLocal() as db:
+            db.add(UploadJob(
+                id=job_id,
+                status=JobStatus.PENDING,
+                progress=0,
+                stage='queued',
+                filename=filename,
+                file_path=file_path,
+                params=params
+            ))
+            await db.commit()
+
+        self._queue.put_nowait(job_id)
+        self.submitted += 1
+        return job_id
+
+    @staticmethod
+    async def get(db: AsyncSession, job_id: str) -> Optional[UploadJob]:
+        """Load a job row"""
+        return await db.get(UploadJob, job_id)
+
+    @staticmethod
+    def _store(source: BinaryIO, file_path: str):
+        source.seek(0)
+        with open(file_path, 'wb') as f:
+            shutil.copyfileobj(source, f)
+
+    async def _recover(self):
+        """Queue pending jobs and running jobs whose process stopped renewing their lease"""
+        expired = datetime.utcnow() - timedelta(seconds=settings.UPLOAD_JOB_LEASE)
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(UploadJob)
+                .where(UploadJob.status == JobStatus.RUNNING, UploadJob.updated_at < expired)
+                .values(status=JobStatus.PENDING, stage='queued', progress=0, updated_at=datetime.utcnow())
+            )
+            await db.commit()
+            result = await db.execute(
+                select(UploadJob.id)
+                .where(UploadJob.status == JobStatus.PENDING)
+                .order_by(UploadJob.created_at)
+            )
+            job_ids = list(result.scalars())
+            if not job_ids:
+                return
+
+        for job_id in job_ids:
+            self._queue.put_nowait(job_id)
+        self.recovered += len(job_ids)
+        logger.info(f"Requeued {len(job_ids)} unfinished upload jobs")
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._process(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Upload job {job_id} bookkeeping failed: {e}")
+
+    async def _process(self, job_id: str):
+        """Claim one job, run it and record its outcome"""
+        async with AsyncSessionLocal() as db:
+            # Only the process whose update flips the job out of PENDING runs it
+            claimed = await db.execute(
+                update(UploadJob)
+                .where(UploadJob.id == job_id, UploadJob.status == JobStatus.PENDING)
+                .values(status=JobStatus.RUNNING, stage='parsing', progress=5, updated_at=datetime.utcnow())
+            )
+            await db.commit()
+            if claimed.rowcount != 1:
+                return
+            job = await db.get(UploadJob, job_id)
+            payload = {
+                'id': job.id,
+                'filename': job.filename,
+                'file_path': job.file_path,
+                'params': job.params
+            }
+
+        async def report(stage: str, progress: int):
+            await self._update(job_id, stage=stage, progress=progress)
+
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            if not os.path.exists(payload['file_path']):
+                raise FileNotFoundError(
+                    f"Upload file {payload['file_path']} not found; UPLOAD_JOB_DIR must be shared by every worker host"
+                )
+            result = await self._handler(payload, report)
+        except asyncio.CancelledError:
+            # Shutting down; hand the job back so the next start requeues it
+            # (if this fails, it is recovered once its lease expires)
+            try:
+                await self._update(job_id, status=JobStatus.PENDING, stage='queued', progress=0)
+            except Exception as e:
+                logger.warning(f"Upload job {job_id} could not be released: {e}")
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Upload job {job_id} failed: {e}")
+            await self._update(
+                job_id, status=JobStatus.FAILED, stage='done', error=str(e),
+                file_path=None, completed_at=datetime.utcnow()
+            )
+            self._remove_file(payload['file_path'])
+            return
+        finally:
+            heartbeat.cancel()
+
+        self.completed += 1
+        await self._update(
+            job_id, status=JobStatus.COMPLETED, stage='done', progress=100, result=result,
+            file_path=None, completed_at=datetime.utcnow()
+        )
+        self._remove_file(payload['file_path'])
+
+    @staticmethod
+    async def _heartbeat(job_id: str):
+        """Renew a running job's lease until cancelled"""
+        while True:
+            await asyncio.sleep(settings.UPLOAD_JOB_LEASE / 3)
+            try:
+                await UploadJobQueue._update(job_id)
+            except Exception as e:
+                logger.warning(f"Upload job {job_id} lease renewal failed: {e}")
+
+    @staticmethod
+    async def _update(job_id: str, **values):
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(UploadJob)
+                .where(UploadJob.id == job_id)
+                .values(updated_at=datetime.utcnow(), **values)
+            )
+            await db.commit()
+
+    @staticmethod
+    def _remove_file(file_path: Optional[str]):
+        if file_path:
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and job counters"""
+        return {
+            'running': self.running,
+            'workers': len(self._tasks),
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'submitted': self.submitted,
+            'recovered': self.recovered,
+            'completed': self.completed,
+            'failed': self.failed
+        }
+
+upload_jobs = UploadJobQueue()
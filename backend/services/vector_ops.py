@@ -0,0 +1,49 @@
+from typing import Union
+import numpy as np
+
+ArrayLike = Union[np.ndarray, list, tuple, float, int]
+
+def round_half_even(values: ArrayLike, ndigits: int = 0) -> np.ndarray:
+    """
+    Round an array exactly like Python's built-in round()
+
+    np.round scales by 10**ndigits before rounding, which can land on the
+    other side of a .5 boundary than Python's correctly-rounded round().
+    Only the elements sitting within a few ulps of a half are re-rounded
+    with round(), so the vectorized result is bit-for-bit identical.
+
+    Args:
+        values: Values to round
+        ndigits: Number of decimal places
+
+    Returns:
+        Float array of rounded values
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, ndigits)
+
+    scaled = values * (10.0 ** ndigits)
+    frac = np.abs(scaled - np.trunc(scaled))
+    ambiguous = (np.abs(frac - 0.5) <= 4 * np.spacing(np.abs(scaled))) & np.isfinite(values)
+
+    for i in np.flatnonzero(ambiguous):
+        rounded.flat[i] = round(float(values.flat[i]), ndigits)
+
+    return rounded
+
+def safe_divide(numerator: ArrayLike, denominator: ArrayLike, guard: ArrayLike = None) -> np.ndarray:
+    """
+    Element-wise division that yields 0 wherever the guard is False
+
+    Mirrors the scalar `a / b if b > 0 else 0` pattern used across the
+    services. The guard defaults to `denominator > 0`.
+    """
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    if guard is None:
+        guard = denominator > 0
+
+    numerator, denominator, guard = np.broadcast_arrays(numerator, denominator, guard)
+    out = np.zeros(numerator.shape, dtype=float)
+    np.divide(numerator, denominator, out=out, where=guard)
+    return out
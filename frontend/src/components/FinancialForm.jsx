@@ -4,6 +4,46 @@ import { motion } from 'framer-motion';
 import { UploadCloud, FileText, Calculator } from 'lucide-react';
 import { useTranslation } from '../context/TranslationContext';
 
+const API_BASE_URL = 'https://finhealthai.onrender.com';
+
+// POST to /analyze/stream and dispatch each Server-Sent Event as it arrives
+const streamAnalysis = async (analysisRequest, onEvent) => {
+    const response = await fetch(`${API_BASE_URL}/analyze/stream`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream' },
+        body: JSON.stringify(analysisRequest)
+    });
+
+    if (!response.ok) {
+        const body = await response.json().catch(() => ({}));
+        throw new Error(body.detail || `Request failed with status ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const message = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            let data = '';
+            message.split('\n').forEach((line) => {
+                if (line.startsWith('event:')) event = line.slice(6).trim();
+                else if (line.startsWith('data:')) data += line.slice(5).trim();
+            });
+            if (data) onEvent(event, JSON.parse(data));
+        }
+    }
+};
+
 const FinancialForm = ({ onAnalyze, businessProfile, language }) => {
     const { t } = useTranslation();
     const [activeTab, setActiveTab] = useState('manual'); // 'manual' or 'upload'
@@ -52,11 +92,23 @@ const FinancialForm = ({ onAnalyze, businessProfile, language }) => {
                 language: language || "en"
             };
 
-            const response = await axios.post('https://finhealthai.onrender.com/analyze', analysisRequest);
-            onAnalyze(response.data);
+            // Stream the analysis: the rule-based assessment renders immediately,
+            // AI insights and recommendations replace it as they arrive
+            let latest = null;
+            await streamAnalysis(analysisRequest, (event, data) => {
+                if (event === 'assessment' || event === 'complete') {
+                    latest = data;
+                } else if (event === 'insights' || event === 'recommendations') {
+                    latest = { ...latest, ...data };
+                } else if (event === 'error') {
+                    throw new Error(data.detail);
+                }
+                onAnalyze(latest);
+                setLoading(false);
+            });
         } catch (error) {
             console.error("Error analyzing data:", error);
-            const errorMsg = error.response?.data?.detail || "Failed to connect to analysis engine.";
+            const errorMsg = error.response?.data?.detail || error.message || "Failed to connect to analysis engine.";
             alert(`Analysis failed: ${errorMsg}`);
         } finally {
             setLoading(false);
@@ -81,7 +133,7 @@ const FinancialForm = ({ onAnalyze, businessProfile, language }) => {
             });
 
             const response = await axios.post(
-                `https://finhealthai.onrender.com/upload?${params.toString()}`,
+                `${API_BASE_URL}/upload?${params.toString()}`,
                 uploadData,
                 { headers: { 'Content-Type': 'multipart/form-data' } }
             );